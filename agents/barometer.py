@@ -1,12 +1,69 @@
 import logging
 import yaml
 import json
-from typing import Dict, Any, List
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Iterator, List, Optional
 from db.manager import DatabaseManager
-from utils.llm_client import LLMClient
+from utils.llm_client import LLMClient, PromptSegment, BatchRequest
+from utils.lexical_scorer import LexicalScorer, DIMENSIONS
+from utils.vector_index import VectorIndex
 
 logger = logging.getLogger(__name__)
 
+CHARS_PER_TOKEN = 4
+
+SCORING_CRITERIA = """
+        Scoring Criteria:
+        - 90-100: Perfect match. Role aligns with core narrative, requires candidate's specific unique mix of skills (e.g. Ops + AI).
+        - 75-89: Strong match. Most requirements met, good narrative alignment.
+        - 60-74: Moderate match. Some gaps, or role is generic.
+        - <60: Poor match. Role is irrelevant or requires skills the candidate explicitly lacks.
+"""
+
+SYSTEM_PROMPT = f"""
+        You are The Barometer, a career strategist agent. 
+        Your goal is to analyze a job description against a candidate's strategic narrative and technical competencies.
+        
+        You must assign a Fit Score from 0 to 100 based on alignment.
+        {SCORING_CRITERIA}
+        Output JSON format:
+        {{
+            "score": float,
+            "reasoning": "string explanation",
+            "matched_narrative": "Name of the best fitting narrative from the list",
+            "gaps": ["list of missing skills/requirements"],
+            "strengths": ["list of strong matches"]
+        }}
+        """
+
+BATCH_SYSTEM_PROMPT = f"""
+        You are The Barometer, a career strategist agent.
+        Your goal is to analyze several job descriptions against a candidate's strategic narrative and technical competencies.
+        
+        Score every listing independently; do not compare listings with each other.
+        You must assign each a Fit Score from 0 to 100 based on alignment.
+        {SCORING_CRITERIA}
+        Output JSON format, with exactly one entry per job_id given:
+        {{
+            "results": [
+                {{
+                    "job_id": "the job_id exactly as given",
+                    "score": float,
+                    "reasoning": "string explanation",
+                    "matched_narrative": "Name of the best fitting narrative from the list",
+                    "gaps": ["list of missing skills/requirements"],
+                    "strengths": ["list of strong matches"]
+                }}
+            ]
+        }}
+        """
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
 class Barometer:
     """
     The Barometer: Analyzes job listings against the user's Strategic Narrative
@@ -23,6 +80,54 @@ class Barometer:
         self.weights = config.get('barometer', {})
         self.min_fit_score = self.weights.get('min_fit_score', 0) # Default 0 means no elimination
         
+        # Local lexical pre-score: listings far below min_fit_score never reach the LLM
+        prescore_config = self.weights.get('prescore', {}) or {}
+        self.prescorer: Optional[LexicalScorer] = None
+        if prescore_config.get('enabled', True):
+            self.prescorer = LexicalScorer(
+                self.narrative, self.weights,
+                saturation=prescore_config.get('saturation', 3.0),
+                avg_doc_length=prescore_config.get('avg_doc_length', 600)
+            )
+            if not self.prescorer.has_vocabulary:
+                self.prescorer = None
+        self.reject_margin = prescore_config.get('reject_margin', 30)
+        self.accept_margin = prescore_config.get('accept_margin') # None: strong matches still get LLM reasoning
+        self.prescore_fit_sample = prescore_config.get('fit_sample', 500) # Listings IDF is fitted on each cycle
+        self.stats = Counter()
+        
+        self._stats_lock = threading.Lock()
+        
+        # Each cycle drains the queue, most narrative-similar first, within these budgets
+        self.max_workers = self.weights.get('max_workers', 4)
+        self.page_size = self.weights.get('page_size', 100)
+        self.max_jobs_per_cycle = self.weights.get('max_jobs_per_cycle') # None: no limit
+        self.max_seconds_per_cycle = self.weights.get('max_seconds_per_cycle') # None: no limit
+        self.max_age_days = self.weights.get('max_age_days') # None: the whole queue, however old
+        self.vector_index = VectorIndex.from_config(config)
+        self.narrative_vectors = self.vector_index.vectorizer.transform(self._narrative_documents())
+        
+        # Several listings per LLM request, sharing one copy of the narrative
+        batch_config = self.weights.get('batch_scoring', {}) or {}
+        self.batch_scoring = batch_config.get('enabled', False)
+        self.batch_prompt_tokens = batch_config.get('max_prompt_tokens', 40000)
+        self.batch_output_tokens = batch_config.get('max_output_tokens', 4000)
+        self.output_tokens_per_job = batch_config.get('output_tokens_per_job', 250)
+        self.max_listings_per_request = batch_config.get('max_listings_per_request', 8)
+        self.description_chars = batch_config.get('description_chars', 10000)
+        
+        # Cheap-first cascade: the first tier's score stands unless it lands within `band` of min_fit_score
+        cascade_config = self.weights.get('cascade', {}) or {}
+        self.cascade = cascade_config.get('enabled', False)
+        self.cascade_first_tier = cascade_config.get('first_tier', 'small')
+        self.cascade_final_tier = cascade_config.get('final_tier', 'large')
+        self.cascade_band = cascade_config.get('band', 10)
+        
+        # Offline mode: each cycle submits its requests as one provider batch and collects the previous ones
+        offline_config = self.weights.get('offline_batch', {}) or {}
+        self.offline_batch = offline_config.get('enabled', False)
+        self.offline_max_requests = offline_config.get('max_requests', 10000)
+        
     def _load_narrative(self) -> Dict:
         """Load the strategic narrative from YAML."""
         try:
@@ -32,78 +137,437 @@ class Barometer:
             logger.error("strategic_narrative.yaml not found!")
             return {}
 
-    def analyze(self, job: Dict) -> float:
+    def _narrative_documents(self) -> List[str]:
+        """One text per narrative, each carrying the shared technical competencies."""
+        competencies = json.dumps((self.narrative or {}).get('technical_competencies', {}))
+        documents = []
+        for story in (self.narrative or {}).get('narratives', []) or []:
+            parts = [story.get('name', ''), story.get('core_message', '')]
+            parts += story.get('themes', []) + story.get('differentiation', [])
+            documents.append(" ".join(str(p) for p in parts) + " " + competencies)
+        return documents
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def rank_queue(self, job_ids: List[str]) -> List[str]:
+        """
+        Order job ids by best cosine similarity to any narrative. Listings saved
+        before the index existed are vectorized (once) on the way.
+        """
+        if not job_ids or not len(self.narrative_vectors):
+            return job_ids
+        missing = [job_id for job_id in job_ids if job_id not in self.vector_index]
+        for start in range(0, len(missing), self.page_size):
+            page = self.db.get_listings(missing[start:start + self.page_size])
+            self.vector_index.add_many((job['job_id'], job.get('description') or "") for job in page)
+        similarity = self.vector_index.similarities(job_ids, self.narrative_vectors)
+        # Stable sort keeps newest-first among equally similar listings
+        return sorted(job_ids, key=lambda job_id: -similarity.get(job_id, 0.0))
+
+    def analyze(self, job: Dict, tier: Optional[str] = None) -> float:
         """
         Analyze a single job listing and return a fit score.
+        An explicit `tier` asks that tier directly, bypassing the cascade.
         """
         logger.info(f"Analyzing fit for: {job['company']} - {job['role']}")
         
-        system_prompt = """
-        You are The Barometer, a career strategist agent. 
-        Your goal is to analyze a job description against a candidate's strategic narrative and technical competencies.
+        system_prompt = SYSTEM_PROMPT
+        user_prompt = self._analysis_prompt(job)
         
-        You must assign a Fit Score from 0 to 100 based on alignment.
+        try:
+            if tier is not None or not self.cascade:
+                analysis = self.llm.generate_structured(system_prompt, user_prompt, {}, call_site="barometer", tier=tier)
+                return self._record(job, analysis)
+            
+            analysis = self.llm.generate_structured(system_prompt, user_prompt, {}, call_site="barometer",
+                                                    tier=self.cascade_first_tier)
+            if self._uncertain(analysis):
+                self._count('cascade_escalated')
+                analysis = self.llm.generate_structured(system_prompt, user_prompt, {}, call_site="barometer",
+                                                        tier=self.cascade_final_tier)
+            else:
+                self._count('cascade_settled')
+            return self._record(job, analysis)
+            
+        except Exception as e:
+            logger.error(f"Barometer analysis failed for {job['job_id']}: {e}")
+            return 0.0
+
+    def _analysis_prompt(self, job: Dict) -> List[PromptSegment]:
+        # The narrative is identical on every call: send it first as a cacheable prefix
+        return [PromptSegment(self._narrative_block(), cacheable=True), PromptSegment(f"""
+        JOB LISTING:
+        Company: {job['company']}
+        Role: {job['role']}
+        Description: {job['description'][:10000]} 
         
-        Scoring Criteria:
-        - 90-100: Perfect match. Role aligns with core narrative, requires candidate's specific unique mix of skills (e.g. Ops + AI).
-        - 75-89: Strong match. Most requirements met, good narrative alignment.
-        - 60-74: Moderate match. Some gaps, or role is generic.
-        - <60: Poor match. Role is irrelevant or requires skills the candidate explicitly lacks.
+        Analyze the fit.
+        """)]
+
+    def _uncertain(self, analysis: Dict) -> bool:
+        """True when a first-tier score is missing or too close to min_fit_score to trust."""
+        try:
+            score = float(analysis.get('score'))
+        except (TypeError, ValueError):
+            return True
+        return abs(score - self.min_fit_score) <= self.cascade_band
+
+    def _record(self, job: Dict, analysis: Dict) -> float:
+        score = float(analysis.get('score', 0))
         
-        Output JSON format:
-        {
-            "score": float,
-            "reasoning": "string explanation",
-            "matched_narrative": "Name of the best fitting narrative from the list",
-            "gaps": ["list of missing skills/requirements"],
-            "strengths": ["list of strong matches"]
-        }
-        """
+        # Save analysis to notes
+        notes = f"Narrative: {analysis.get('matched_narrative')}\n"
+        notes += f"Reasoning: {analysis.get('reasoning')}\n"
+        notes += f"Strengths: {', '.join(analysis.get('strengths', []))}\n"
+        notes += f"Gaps: {', '.join(analysis.get('gaps', []))}"
+        
+        # Update DB
+        self.db.update_fit_score(job['job_id'], score, notes)
         
-        user_prompt = f"""
+        return score
+
+    def _narrative_block(self) -> str:
+        return f"""
         CANDIDATE NARRATIVE:
         {json.dumps(self.narrative, indent=2)}
-        
-        JOB LISTING:
+        """
+
+    def _batch_prefix(self) -> str:
+        return self._narrative_block() + """
+        JOB LISTINGS:
+        """
+
+    def _batch_entry(self, job: Dict) -> str:
+        return f"""
+        ---
+        job_id: {job['job_id']}
         Company: {job['company']}
         Role: {job['role']}
-        Description: {job['description'][:10000]} 
+        Description: {(job.get('description') or '')[:self.description_chars]}
+        """
+
+    def pack_batches(self, jobs: List[Dict]) -> List[List[Dict]]:
+        """
+        Split jobs, in order, into requests whose estimated prompt and output
+        tokens fit the configured budgets. K therefore shrinks for long
+        descriptions and grows for short ones, up to max_listings_per_request.
+        """
+        fixed = estimate_tokens(BATCH_SYSTEM_PROMPT + self._batch_prefix())
+        batches: List[List[Dict]] = []
+        current: List[Dict] = []
+        prompt_tokens = fixed
+        for job in jobs:
+            cost = estimate_tokens(self._batch_entry(job))
+            over_prompt = prompt_tokens + cost > self.batch_prompt_tokens
+            over_output = (len(current) + 1) * self.output_tokens_per_job > self.batch_output_tokens
+            if current and (over_prompt or over_output or len(current) >= self.max_listings_per_request):
+                batches.append(current)
+                current, prompt_tokens = [], fixed
+            current.append(job)
+            prompt_tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _valid_records(self, jobs: List[Dict], response: Dict) -> Dict[str, Dict]:
+        """Records keyed by job_id, keeping only jobs that got exactly one well-formed result."""
+        expected = {job['job_id'] for job in jobs}
+        records = response.get('results') if isinstance(response, dict) else None
+        if not isinstance(records, list):
+            return {}
         
-        Analyze the fit.
+        counts = Counter(str(r.get('job_id')) for r in records if isinstance(r, dict))
+        valid = {}
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            job_id = str(record.get('job_id'))
+            if job_id not in expected or counts[job_id] != 1:
+                continue
+            try:
+                score = float(record.get('score'))
+            except (TypeError, ValueError):
+                continue
+            if 0 <= score <= 100:
+                valid[job_id] = record
+        return valid
+
+    def analyze_batch(self, jobs: List[Dict]) -> Dict[str, float]:
+        """
+        Score several listings in one request. Any job whose record is missing,
+        duplicated or malformed is re-scored on its own with analyze().
         """
+        if len(jobs) == 1:
+            return {jobs[0]['job_id']: self.analyze(jobs[0])}
         
+        logger.info(f"Analyzing fit for {len(jobs)} listings in one request")
+        escalated_ids = set()
+        if not self.cascade:
+            records = self._request_batch(jobs)
+        else:
+            records = self._request_batch(jobs, self.cascade_first_tier)
+            uncertain = [job for job in jobs if job['job_id'] in records and self._uncertain(records[job['job_id']])]
+            self._count('cascade_settled', len(records) - len(uncertain))
+            if uncertain:
+                self._count('cascade_escalated', len(uncertain))
+                escalated = self._request_batch(uncertain, self.cascade_final_tier)
+                for job in uncertain:
+                    # Already escalated: a missing final-tier answer is retried at the final tier only
+                    escalated_ids.add(job['job_id'])
+                    records.pop(job['job_id'])
+                    if job['job_id'] in escalated:
+                        records[job['job_id']] = escalated[job['job_id']]
+        
+        scores = {}
+        for job in jobs:
+            record = records.get(job['job_id'])
+            if record is None:
+                logger.warning(f"No valid batch result for {job['job_id']}; scoring it individually")
+                self._count('batch_fallbacks')
+                tier = self.cascade_final_tier if job['job_id'] in escalated_ids else None
+                scores[job['job_id']] = self.analyze(job, tier=tier)
+            else:
+                self._count('batch_scored')
+                scores[job['job_id']] = self._record(job, record)
+        return scores
+
+    def _request_batch(self, jobs: List[Dict], tier: Optional[str] = None) -> Dict[str, Dict]:
+        """One batched request; returns the valid records by job_id."""
         try:
-            analysis = self.llm.generate_structured(system_prompt, user_prompt, {})
-            score = float(analysis.get('score', 0))
-            
-            # Save analysis to notes
-            notes = f"Narrative: {analysis.get('matched_narrative')}\n"
-            notes += f"Reasoning: {analysis.get('reasoning')}\n"
-            notes += f"Strengths: {', '.join(analysis.get('strengths', []))}\n"
-            notes += f"Gaps: {', '.join(analysis.get('gaps', []))}"
-            
-            # Update DB
-            self.db.update_fit_score(job['job_id'], score, notes)
+            # The packed output budget must reach the provider, or long replies are cut off mid-JSON
+            response = self.llm.generate_structured(BATCH_SYSTEM_PROMPT, self._batch_prompt(jobs), {},
+                                                    call_site="barometer_batch", tier=tier,
+                                                    max_tokens=self.batch_output_tokens)
+        except Exception as e:
+            logger.error(f"Batched Barometer analysis failed: {e}")
+            response = {}
+        return self._valid_records(jobs, response)
+
+    def _batch_prompt(self, jobs: List[Dict]) -> List[PromptSegment]:
+        return [
+            PromptSegment(self._batch_prefix(), cacheable=True),
+            PromptSegment("".join(self._batch_entry(job) for job in jobs) + """
+        Analyze the fit of every listing.
+        """)
+        ]
+
+    def submit_offline(self, units: List[List[Dict]], tier: Optional[str] = None) -> List[str]:
+        """
+        Submit units (one request each, as `_score` would send them) as provider
+        batches of at most `max_requests`. Each batch id is checkpointed in the
+        DB with the job ids behind every request, and its listings move to
+        'batch_pending' until `collect_offline_batches` applies the results.
+        Returns the job ids of batches that could not be submitted; their
+        status is left unchanged.
+        """
+        unsent: List[str] = []
+        if tier is None and self.cascade:
+            tier = self.cascade_first_tier
+        for start in range(0, len(units), self.offline_max_requests):
+            requests, items = [], {}
+            for i, unit in enumerate(units[start:start + self.offline_max_requests], start):
+                custom_id = f"unit-{i}"
+                if len(unit) == 1:
+                    requests.append(BatchRequest(custom_id, SYSTEM_PROMPT, self._analysis_prompt(unit[0]),
+                                                 call_site="barometer", output_schema={}, tier=tier))
+                else:
+                    requests.append(BatchRequest(custom_id, BATCH_SYSTEM_PROMPT, self._batch_prompt(unit),
+                                                 call_site="barometer_batch", output_schema={}, tier=tier,
+                                                 max_tokens=self.batch_output_tokens))
+                items[custom_id] = {'job_ids': [job['job_id'] for job in unit], 'tier': tier}
+            job_ids = [job_id for item in items.values() for job_id in item['job_ids']]
+            try:
+                batch_id = self.llm.submit_batch(requests)
+            except Exception as e:
+                logger.error(f"Submitting Barometer batch failed: {e}")
+                unsent.extend(job_ids)
+                continue
+            self.db.save_llm_batch(batch_id, "barometer", items)
+            self.db.update_application_statuses(job_ids, 'batch_pending')
+            self._count('offline_submitted', len(job_ids))
+        return unsent
+
+    def collect_offline_batches(self):
+        """
+        Apply every finished Barometer batch recorded in the DB, whichever
+        process submitted it. Listings without a valid result go back to 'new';
+        with the cascade on, first-tier scores near min_fit_score are
+        resubmitted at the final tier. Only listings still 'batch_pending' are
+        touched, so applying a batch twice changes nothing.
+        """
+        for batch in self.db.get_pending_llm_batches("barometer"):
+            batch_id = batch['batch_id']
+            try:
+                answers = self.llm.poll_batch(batch_id, call_site="barometer_offline", structured=True)
+            except Exception as e:
+                logger.error(f"Polling Barometer batch {batch_id} failed: {e}")
+                continue
+            if answers is None:
+                logger.info(f"Barometer batch {batch_id} is still processing.")
+                continue
             
-            return score
+            requeue, escalate = [], []
+            for custom_id, item in batch['items'].items():
+                jobs = self.db.get_listings(item['job_ids'], status='batch_pending')
+                if not jobs:
+                    continue
+                self._count('llm_analyzed', len(jobs))
+                response = answers.get(custom_id) or {}
+                if len(item['job_ids']) == 1:
+                    response = {'results': [{**response, 'job_id': item['job_ids'][0]}]}
+                records = self._valid_records(jobs, response)
+                first_tier = self.cascade and item.get('tier') == self.cascade_first_tier
+                for job in jobs:
+                    record = records.get(job['job_id'])
+                    if record is None:
+                        requeue.append(job['job_id'])
+                    elif first_tier and self._uncertain(record):
+                        escalate.append(job)
+                    else:
+                        if first_tier:
+                            self._count('cascade_settled')
+                        self._record(job, record)
+                        self._count('offline_collected')
             
+            if escalate:
+                self._count('cascade_escalated', len(escalate))
+                units = self.pack_batches(escalate) if self.batch_scoring else [[job] for job in escalate]
+                # Escalations that could not be submitted are still 'batch_pending': queue them again
+                requeue += self.submit_offline(units, tier=self.cascade_final_tier)
+            self.db.update_application_statuses(requeue, 'new')
+            self._count('offline_requeued', len(requeue))
+            self.db.complete_llm_batch(batch_id)
+
+    def prescore(self, job: Dict) -> Optional[float]:
+        """
+        Settle a listing locally when its lexical score is clearly outside the
+        LLM band. Returns the recorded score, or None if the LLM should decide.
+        """
+        if self.prescorer is None:
+            return None
+        
+        lexical = self.prescorer.score(job.get('description') or "")
+        total = lexical['total']
+        if total < self.min_fit_score - self.reject_margin:
+            verdict = "below"
+            self._count('prescore_rejected')
+        elif self.accept_margin is not None and total >= self.min_fit_score + self.accept_margin:
+            verdict = "above"
+            self._count('prescore_accepted')
+        else:
+            self._count('prescore_llm_band')
+            return None
+        
+        breakdown = ", ".join(f"{dim}={lexical[dim]:.2f}" for dim in DIMENSIONS)
+        notes = f"Lexical pre-score: {total:.1f} ({breakdown})\n"
+        notes += f"Clearly {verdict} the LLM band around min_fit_score={self.min_fit_score}; not sent to the model."
+        self.db.update_fit_score(job['job_id'], round(total, 1), notes)
+        logger.info(f"Pre-scored {job['company']} - {job['role']} at {total:.1f} without the LLM")
+        return total
+
+    def _score(self, jobs: List[Dict]):
+        """Worker task: one LLM request (single or batched); each fit score is committed as it lands."""
+        try:
+            if self.batch_scoring:
+                self.analyze_batch(jobs)
+                self._count('llm_analyzed', len(jobs))
+            else:
+                for job in jobs:
+                    self.analyze(job)
+                    self._count('llm_analyzed')
         except Exception as e:
-            logger.error(f"Barometer analysis failed for {job['job_id']}: {e}")
-            return 0.0
+            logger.error(f"Barometer worker failed: {e}")
+
+    def _out_of_time(self, started: float) -> bool:
+        return self.max_seconds_per_cycle is not None and time.monotonic() - started >= self.max_seconds_per_cycle
+
+    def _fit_prescorer(self, queue: List[str]):
+        """
+        Fit the pre-score's IDF on up to `fit_sample` descriptions spread evenly
+        over the whole queue. The queue is sorted by narrative similarity, so
+        its first page alone would overstate the narrative's own terms.
+        """
+        if self.prescorer is None or not queue:
+            return
+        step = max(1, len(queue) // self.prescore_fit_sample)
+        sample = queue[::step][:self.prescore_fit_sample]
+        descriptions = []
+        for start in range(0, len(sample), self.page_size):
+            descriptions += [job.get('description') or "" for job in self.db.get_listings(sample[start:start + self.page_size])]
+        self.prescorer.fit(descriptions)
+
+    def _llm_units(self, queue: List[str], started: float) -> Iterator[List[Dict]]:
+        """
+        Read the queue a page at a time, settle what the pre-score can, and
+        yield the rest as LLM request units (one listing, or a packed batch).
+        Units are counted as 'llm_analyzed' once their request finishes, so
+        listings left over when the time budget runs out are not.
+        """
+        for start in range(0, len(queue), self.page_size):
+            if self._out_of_time(started):
+                return
+            # Re-check status: another cycle may have scored some of these meanwhile
+            jobs = self.db.get_listings(queue[start:start + self.page_size], status='new')
+            llm_jobs = [job for job in jobs if self.prescore(job) is None]
+            yield from self.pack_batches(llm_jobs) if self.batch_scoring else [[job] for job in llm_jobs]
 
     def run_analysis_cycle(self):
         """
-        Fetch unprocessed jobs and analyze them.
+        Drain the queue of unprocessed jobs, most narrative-similar first.
+
+        Listings are read a page at a time. Clear misfits are settled by the
+        lexical pre-score on this thread; the rest are scored by up to
+        `max_workers` concurrent LLM requests. The cycle stops taking new work
+        once `max_jobs_per_cycle` jobs were handed out or `max_seconds_per_cycle`
+        has passed; anything left stays 'new' for the next cycle.
+        
+        In offline mode the LLM requests are instead submitted as provider
+        batches, and the batches of earlier cycles are collected first.
         """
         logger.info("Barometer analysis cycle started.")
+        self.stats = Counter()
+        started = time.monotonic()
         
-        # Get jobs that are 'new' (scouted but not analyzed)
-        # Note: db.get_recent_unprocessed_listings returns dicts
-        jobs = self.db.get_recent_unprocessed_listings(limit=20)
+        if self.offline_batch:
+            self.collect_offline_batches()
         
-        logger.info(f"Found {len(jobs)} jobs to analyze.")
+        queue = self.rank_queue(self.db.get_unprocessed_job_ids(self.max_age_days))
+        if self.max_jobs_per_cycle is not None:
+            queue = queue[:self.max_jobs_per_cycle]
+        logger.info(f"Found {len(queue)} jobs to analyze.")
+        self._fit_prescorer(queue)
         
-        for job in jobs:
-            self.analyze(job)
-            
-        logger.info("Barometer analysis cycle complete.")
+        if self.offline_batch:
+            self.submit_offline(list(self._llm_units(queue, started)))
+            logger.info(
+                f"Barometer offline batches: {self.stats['offline_collected']} scores collected, "
+                f"{self.stats['offline_requeued']} requeued, {self.stats['offline_submitted']} listings submitted"
+            )
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="barometer") as pool:
+                in_flight = set()
+                for unit in self._llm_units(queue, started):
+                    # Keep only a couple of requests queued per worker so the budget stays enforceable
+                    while len(in_flight) >= self.max_workers * 2 and not self._out_of_time(started):
+                        _, in_flight = wait(in_flight, timeout=1, return_when=FIRST_COMPLETED)
+                    if self._out_of_time(started):
+                        break
+                    in_flight.add(pool.submit(self._score, unit))
+                
+                if self._out_of_time(started):
+                    logger.info(f"Barometer time budget of {self.max_seconds_per_cycle}s spent; finishing in-flight requests.")
+                    pool.shutdown(wait=True, cancel_futures=True)
+        
+        if self.prescorer is not None:
+            logger.info(
+                f"Barometer pre-score: {self.stats['prescore_rejected']} rejected, {self.stats['prescore_accepted']} accepted "
+                f"locally; {self.stats['llm_analyzed']} sent to the LLM"
+            )
+        if self.cascade:
+            logger.info(
+                f"Barometer cascade: {self.stats['cascade_settled']} settled by '{self.cascade_first_tier}', "
+                f"{self.stats['cascade_escalated']} escalated to '{self.cascade_final_tier}'"
+            )
+        logger.info(f"Barometer analysis cycle complete in {time.monotonic() - started:.1f}s.")
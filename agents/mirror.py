@@ -4,7 +4,7 @@ import json
 from datetime import datetime
 from typing import Dict, Tuple
 from db.manager import DatabaseManager
-from utils.llm_client import LLMClient
+from utils.llm_client import LLMClient, PromptSegment
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,7 @@ class Mirror:
         self.db = db_manager
         self.llm = llm_client
         self.master_source = self._load_master_source()
+        self.processed = 0 # Jobs drafted in the last cycle
         
         # Ensure storage directories exist
         os.makedirs("storage/resumes", exist_ok=True)
@@ -32,6 +33,13 @@ class Mirror:
             logger.error("docs/BURNS_MASTER_RESUME_SOURCE.md not found!")
             return ""
 
+    def _master_block(self) -> str:
+        """The master resume source, sent ahead of any per-job text so providers can cache it."""
+        return f"""
+        MASTER RESUME SOURCE:
+        {self.master_source}
+        """
+
     def generate(self, job: Dict) -> Tuple[str, str]:
         """
         Generate a tailored resume and cover letter for a specific job.
@@ -95,19 +103,16 @@ class Mirror:
         ## Education & Certifications
         """
         
-        user_prompt = f"""
-        MASTER RESUME SOURCE:
-        {self.master_source}
-        
+        user_prompt = [PromptSegment(self._master_block(), cacheable=True), PromptSegment(f"""
         TARGET JOB:
         Company: {job['company']}
         Role: {job['role']}
         Description: {job['description'][:10000]}
         
         Generate the tailored resume in Markdown.
-        """
+        """)]
         
-        return self.llm.generate(system_prompt, user_prompt)
+        return self.llm.generate(system_prompt, user_prompt, call_site="mirror_resume")
 
     def _generate_cover_letter(self, job: Dict, resume_context: str) -> str:
         """Use LLM to generate a tailored cover letter."""
@@ -123,10 +128,8 @@ class Mirror:
         5. Format in Markdown.
         """
         
-        user_prompt = f"""
-        MASTER RESUME SOURCE:
-        {self.master_source}
-        
+        # Master source first (cacheable, same for every job), per-job context after it
+        user_prompt = [PromptSegment(self._master_block(), cacheable=True), PromptSegment(f"""
         GENERATED RESUME CONTEXT:
         {resume_context[:2000]}...
         
@@ -136,15 +139,16 @@ class Mirror:
         Description: {job['description'][:5000]}
         
         Generate the tailored cover letter in Markdown.
-        """
+        """)]
         
-        return self.llm.generate(system_prompt, user_prompt)
+        return self.llm.generate(system_prompt, user_prompt, call_site="mirror_cover_letter")
 
     def run_generation_cycle(self):
         """
         Fetch analyzed jobs (fit score > threshold) and generate materials.
         """
         logger.info("Mirror generation cycle started.")
+        self.processed = 0
         
         # Get jobs that are 'analyzed' but not yet 'drafted'
         # We need to query the DB for this. 
@@ -187,6 +191,7 @@ class Mirror:
                 )
                 
                 self.db.update_application_status(job['job_id'], 'drafted')
+                self.processed += 1
                 
             except Exception as e:
                 logger.error(f"Mirror generation failed for {job['job_id']}: {e}")
@@ -1,110 +1,255 @@
+import asyncio
 import logging
-import time
-import random
-from typing import List, Dict, Optional
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, FrozenSet, Optional, Tuple
 from urllib.parse import urljoin, urlparse
+import httpx
 import requests
 from bs4 import BeautifulSoup
 from duckduckgo_search import DDGS
-from playwright.sync_api import sync_playwright
+from utils.browser_pool import BrowserPool, AsyncBrowserPool, DEFAULT_USER_AGENT
+from utils.page_fetcher import TieredFetcher
+from utils.navigation import NavigationProfile
+from utils.http_cache import HttpCache
+from utils.triage import LeadTriage
+from utils.vector_index import VectorIndex
+from utils.content_extraction import extract_main_content, prompt_chars_saved, CHARS_PER_TOKEN, PROMPT_SLICES
+from utils.ats_extractors import ATSRegistry
+from utils.structured_data import extract_job_posting, has_required_fields
+from utils.normalize import canonicalize_url, normalize_company_name
+from utils.rate_limit import DomainRateLimiter
+from utils.query_cache import QueryCache
+from utils.page_snapshot import SnapshotCache, WORD_PATTERN
 
 logger = logging.getLogger(__name__)
 
+# Searches share one politeness budget, keyed like any other domain
+SEARCH_ENDPOINT = "https://duckduckgo.com"
+
+DEFAULT_CAREERS_URL_PATTERNS = [
+    "https://careers.{slug}.com",
+    "https://{slug}.com/careers",
+    "https://{slug}.com/jobs",
+    "https://www.{slug}.com/careers",
+]
+
 class CareerPageValidator:
     """Validates that a job listing exists on the company's official careers page."""
     
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, browser_pool: Optional[BrowserPool] = None, config: Optional[Dict] = None,
+                 navigation: Optional[NavigationProfile] = None, http_cache: Optional[HttpCache] = None):
         self.db = db_manager
+        self.browser_pool = browser_pool or BrowserPool()
+        self.navigation = navigation or NavigationProfile(config)
+        self.http_cache = http_cache
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        
+        cache_config = (config or {}).get('scout', {}).get('careers_cache', {}) or {}
+        self.positive_ttl_days = cache_config.get('positive_ttl_days', 30)
+        self.negative_ttl_days = cache_config.get('negative_ttl_days', 7)
+        # Prefetched cache entries by normalized company name (None = known miss)
+        self._cache_entries: Dict[str, Optional[Dict]] = {}
+        
+        scout_config = (config or {}).get('scout', {})
+        self.url_patterns = scout_config.get('careers_url_patterns', DEFAULT_CAREERS_URL_PATTERNS)
+        self.probe_timeout = scout_config.get('careers_probe_timeout_seconds', 5)
+        self.discovery_budget_seconds = scout_config.get('careers_discovery_budget_seconds', 12)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._async_client: Optional[httpx.AsyncClient] = None
+        
+        # Rendered careers pages, shared by every lead from the same company
+        snapshot_config = scout_config.get('careers_snapshot', {}) or {}
+        self.snapshots = SnapshotCache(
+            ttl_seconds=snapshot_config.get('ttl_minutes', 60) * 60,
+            max_entries=snapshot_config.get('max_entries', 256)
+        )
+        self._snapshot_locks: Dict[str, asyncio.Lock] = {}
+    
+    def reset_for_loop(self):
+        """Drop the per-page asyncio locks; they are bound to the event loop of the run that made them."""
+        self._snapshot_locks.clear()
+
+    def prefetch_cache(self, companies: List[str]):
+        """Load careers cache entries for a whole batch of companies in one query."""
+        self._cache_entries.update(
+            self.db.prefetch_careers_cache(companies, self.positive_ttl_days, self.negative_ttl_days)
+        )
+    
+    def _cached_entry(self, company_name: str) -> Optional[Dict]:
+        key = normalize_company_name(company_name)
+        if key in self._cache_entries:
+            return self._cache_entries[key]
+        return self.db.get_careers_cache_entry(company_name, self.positive_ttl_days, self.negative_ttl_days)
+    
+    def _cache_result(self, company_name: str, careers_url: str, is_valid: bool, notes: str):
+        self.db.cache_company_careers_url(company_name, careers_url, is_valid, notes)
+        self._cache_entries[normalize_company_name(company_name)] = {'careers_url': careers_url, 'is_valid': is_valid}
     
     def find_careers_url(self, company_name: str, job_url: str) -> Optional[str]:
         """
         Attempt to find the company's official careers page URL.
         """
-        # Check cache
-        cached_url = self.db.get_cached_careers_url(company_name)
-        if cached_url:
-            logger.info(f"Using cached careers URL for {company_name}")
-            return cached_url
-        
-        # Strategy 1: Common patterns
-        common_patterns = [
-            f"https://careers.{company_name.lower().replace(' ', '')}.com",
-            f"https://{company_name.lower().replace(' ', '')}.com/careers",
-            f"https://{company_name.lower().replace(' ', '')}.com/jobs",
-            f"https://www.{company_name.lower().replace(' ', '')}.com/careers",
-        ]
+        # Check cache (negative entries short-circuit until they expire)
+        entry = self._cached_entry(company_name)
+        if entry:
+            if entry['is_valid']:
+                logger.info(f"Using cached careers URL for {company_name}")
+                return entry['careers_url']
+            logger.info(f"Cached: no careers page found for {company_name}")
+            return None
+        
+        try:
+            careers_url, notes = self._run_async(self._discover(company_name, job_url))
+        except Exception as e:
+            # Budget exhausted or event loop trouble: don't cache, try again next cycle
+            logger.warning(f"Careers URL discovery for {company_name} gave up: {e!r}")
+            return None
         
-        for pattern in common_patterns:
-            if self._validate_url(pattern):
-                self.db.cache_company_careers_url(company_name, pattern, True, "Found via pattern matching")
-                return pattern
+        if careers_url:
+            self._cache_result(company_name, careers_url, True, notes)
+            return careers_url
+        
+        # Cache negative result
+        self._cache_result(company_name, "", False, "Careers URL not found")
+        return None
+    
+    def _run_async(self, coro):
+        """
+        Run a coroutine on the validator's private event loop so the pooled
+        AsyncClient survives across companies and callers on any thread.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="careers-discovery", daemon=True).start()
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.wait_for(coro, timeout=self.discovery_budget_seconds), self._loop
+        )
+        return future.result()
+    
+    def _client(self) -> httpx.AsyncClient:
+        # Created lazily on the discovery loop, which owns its connections
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                headers={'User-Agent': DEFAULT_USER_AGENT},
+                follow_redirects=True,
+                timeout=self.probe_timeout,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            )
+        return self._async_client
+    
+    async def _discover(self, company_name: str, job_url: str) -> Tuple[Optional[str], str]:
+        """
+        Race every candidate at once and take the first that answers 200.
+        Returns (careers_url or None, how it was found).
+        """
+        client = self._client()
+        slug = company_name.lower().replace(' ', '')
         
-        # Strategy 2: Extract domain from job URL and look for careers page
+        # Speculatively fetch the job site's homepage while the patterns race
+        homepage_task = None
         if job_url:
-            domain = self._extract_domain(job_url)
+            parsed = urlparse(job_url)
+            domain = parsed.netloc
             if domain and "linkedin" not in domain and "indeed" not in domain:
-                 careers_url = self._scrape_careers_link_from_domain(domain)
-                 if careers_url:
-                    self.db.cache_company_careers_url(company_name, careers_url, True, "Found via domain scraping")
-                    return careers_url
+                homepage_task = asyncio.create_task(self._careers_links_from_homepage(client, f"{parsed.scheme or 'https'}://{domain}"))
+        
+        try:
+            # Strategy 1: Common patterns
+            candidates = [pattern.format(slug=slug) for pattern in self.url_patterns]
+            found = await self._first_valid(client, candidates)
+            if found:
+                return found, "Found via pattern matching"
+            
+            # Strategy 2: Careers links on the domain's homepage
+            if homepage_task:
+                found = await self._first_valid(client, await homepage_task)
+                if found:
+                    return found, "Found via domain scraping"
+        finally:
+            if homepage_task and not homepage_task.done():
+                homepage_task.cancel()
         
         # Strategy 3: DuckDuckGo Search
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(f"{company_name} careers page", max_results=1))
-                if results:
-                    url = results[0]['href']
-                    self.db.cache_company_careers_url(company_name, url, True, "Found via search")
-                    return url
+            results = await asyncio.to_thread(self._search_careers_page, company_name)
+            if results:
+                return results[0]['href'], "Found via search"
         except Exception as e:
             logger.warning(f"Search failed for {company_name}: {e}")
-
-        # Cache negative result
-        self.db.cache_company_careers_url(company_name, "", False, "Careers URL not found")
-        return None
+        
+        return None, ""
     
-    def _extract_domain(self, url: str) -> str:
-        """Extract base domain from URL."""
+    def _search_careers_page(self, company_name: str) -> List[Dict]:
+        with DDGS() as ddgs:
+            return list(ddgs.text(f"{company_name} careers page", max_results=1))
+    
+    async def _first_valid(self, client: httpx.AsyncClient, urls: List[str]) -> Optional[str]:
+        """HEAD every URL concurrently; return the first 200 and cancel the rest."""
+        if not urls:
+            return None
+        
+        async def probe(url: str) -> Optional[str]:
+            return url if await self._validate_url_async(client, url) else None
+        
+        tasks = [asyncio.create_task(probe(url)) for url in dict.fromkeys(urls)]
         try:
-            parsed = urlparse(url)
-            return parsed.netloc
-        except:
-            return ""
+            for next_done in asyncio.as_completed(tasks):
+                url = await next_done
+                if url:
+                    return url
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
     
-    def _validate_url(self, url: str) -> bool:
+    async def _validate_url_async(self, client: httpx.AsyncClient, url: str) -> bool:
         """Check if URL is reachable and returns 200."""
         try:
-            response = self.session.head(url, timeout=5, allow_redirects=True)
+            response = await client.head(url)
             return response.status_code == 200
         except Exception:
             return False
     
-    def _scrape_careers_link_from_domain(self, domain: str) -> Optional[str]:
-        """Scrape the main website to find careers link."""
+    async def _careers_links_from_homepage(self, client: httpx.AsyncClient, url: str) -> List[str]:
+        """Scrape the main website for links that look like a careers page."""
         try:
-            url = f"https://{domain}"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for "Careers" links
-            careers_patterns = ['careers', 'jobs', 'join', 'apply', 'work with us']
-            for link in soup.find_all('a', href=True):
-                link_text = link.get_text().lower()
-                link_href = link['href']
-                
-                if any(pattern in link_text for pattern in careers_patterns):
-                    full_url = urljoin(url, link_href)
-                    if self._validate_url(full_url):
-                        return full_url
-            
-            return None
+            headers = self.http_cache.conditional_headers(url) if self.http_cache else {}
+            response = await client.get(url, timeout=10, headers=headers)
+            body = response.text
+            if self.http_cache:
+                if response.status_code == 304:
+                    body = self.http_cache.read(url) or ""
+                    self.http_cache.revalidated(url)
+                elif response.status_code == 200:
+                    self.http_cache.store(url, body, dict(response.headers))
+            soup = BeautifulSoup(body, 'html.parser')
         except Exception as e:
-            logger.warning(f"Failed to scrape {domain}: {e}")
-            return None
+            logger.warning(f"Failed to scrape {url}: {e}")
+            return []
+        
+        # Look for "Careers" links
+        careers_patterns = ['careers', 'jobs', 'join', 'apply', 'work with us']
+        return [
+            urljoin(url, link['href']) for link in soup.find_all('a', href=True)
+            if any(pattern in link.get_text().lower() for pattern in careers_patterns)
+        ]
+    
+    def close(self):
+        """Shut down the discovery event loop and its HTTP client."""
+        if self._loop is None:
+            return
+        if self._async_client is not None:
+            asyncio.run_coroutine_threadsafe(self._async_client.aclose(), self._loop).result()
+            self._async_client = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
     
     def verify_job_on_careers_page(self, job_title: str, company: str, careers_url: str) -> bool:
         """
@@ -115,37 +260,97 @@ class CareerPageValidator:
             return False
         
         try:
-            # Use Playwright for dynamic content (many careers pages are SPAs)
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                page.goto(careers_url, timeout=30000)
-                
-                # Wait for content to load
-                page.wait_for_load_state("networkidle")
-                
-                content = page.content().lower()
-                browser.close()
-            
-            # Normalize job title for matching
-            normalized_title = job_title.lower().replace(" - ", " ").replace("(", "").replace(")", "")
-            key_words = normalized_title.split()[:3]  # Check first 3 words
+            snapshot = self.snapshots.get(careers_url) or self._revalidate_snapshot(careers_url)
+            if snapshot is None:
+                # Use Playwright for dynamic content (many careers pages are SPAs)
+                with self.browser_pool.page() as page:
+                    # DOMContentLoaded plus a settle wait; networkidle never arrives on pages with beacons
+                    response = self.navigation.navigate(page, careers_url)
+                    snapshot = self._store_snapshot(careers_url, page.content(), response.headers if response else None)
             
-            matches = sum(1 for word in key_words if word in content)
-            
-            # Heuristic: If significant overlap in title words, assume it's there
-            if matches >= 2:
-                logger.info(f"✓ Job verified on {company} careers page")
-                return True
-            else:
-                logger.warning(f"✗ Job NOT found on {company} careers page - likely ghost job")
-                return False
+            return self._title_on_page(job_title, company, snapshot['words'])
         
         except Exception as e:
             logger.error(f"Error verifying job on careers page: {e}")
             # Fallback: if we can't verify, we might still want to keep it but flag it
             return False
 
+    async def verify_job_on_careers_page_async(self, job_title: str, company: str, careers_url: str, browser_pool: AsyncBrowserPool) -> bool:
+        """Async variant of verify_job_on_careers_page for the concurrent mission."""
+        if not careers_url:
+            logger.warning(f"No careers URL provided for {company}")
+            return False
+        
+        try:
+            # Several leads from one company share a careers page: render it once
+            async with self._snapshot_locks.setdefault(careers_url, asyncio.Lock()):
+                snapshot = self.snapshots.get(careers_url) or await asyncio.to_thread(self._revalidate_snapshot, careers_url)
+                if snapshot is None:
+                    async with browser_pool.page() as page:
+                        response = await self.navigation.navigate_async(page, careers_url)
+                        snapshot = self._store_snapshot(careers_url, await page.content(), response.headers if response else None)
+            
+            return self._title_on_page(job_title, company, snapshot['words'])
+        
+        except Exception as e:
+            logger.error(f"Error verifying job on careers page: {e}")
+            return False
+
+    def _store_snapshot(self, careers_url: str, content: str, headers: Optional[Dict]) -> Dict:
+        if self.http_cache:
+            try:
+                self.http_cache.store(careers_url, content, dict(headers or {}))
+            except Exception as e:
+                logger.warning(f"Failed to cache {careers_url}: {e}")
+        return self.snapshots.put(careers_url, content, headers)
+    
+    def _revalidate_snapshot(self, careers_url: str) -> Optional[Dict]:
+        """
+        Conditional GET for an expired snapshot, or for a page rendered on an earlier
+        run and kept in the HTTP cache. Returns a snapshot on 304, otherwise None (re-render).
+        """
+        stale = self.snapshots.stale(careers_url)
+        if stale is not None:
+            headers = SnapshotCache.conditional_headers(stale)
+        elif self.http_cache:
+            headers = self.http_cache.conditional_headers(careers_url)
+        else:
+            return None
+        if not headers:
+            return None
+        
+        try:
+            response = self.session.get(careers_url, headers=headers, timeout=self.probe_timeout)
+        except requests.RequestException as e:
+            logger.debug(f"Revalidating {careers_url} failed: {e}")
+            return None
+        if response.status_code != 304:
+            return None
+        
+        if stale is not None:
+            return self.snapshots.touch(careers_url)
+        content = self.http_cache.read(careers_url)
+        if content is None:
+            return None
+        self.http_cache.revalidated(careers_url)
+        entry = self.http_cache.lookup(careers_url)
+        return self.snapshots.put(careers_url, content, {'etag': entry.get('etag'), 'last-modified': entry.get('last_modified')})
+
+    def _title_on_page(self, job_title: str, company: str, page_words: FrozenSet[str]) -> bool:
+        """Check whether the job title's words appear in the careers page's word index."""
+        # Normalize job title for matching
+        key_words = WORD_PATTERN.findall(job_title.lower())[:3]  # Check first 3 words
+        
+        matches = sum(1 for word in key_words if word in page_words)
+        
+        # Heuristic: If significant overlap in title words, assume it's there
+        if matches >= 2:
+            logger.info(f"✓ Job verified on {company} careers page")
+            return True
+        else:
+            logger.warning(f"✗ Job NOT found on {company} careers page - likely ghost job")
+            return False
+
 class Scout:
     """The Scout: Finds and scrapes job listings from multiple sources."""
     
@@ -153,65 +358,94 @@ class Scout:
         self.db = db_manager
         self.llm = llm_client
         self.config = config
-        self.validator = CareerPageValidator(db_manager)
+        self.browser_pool = BrowserPool(config)
+        self.navigation = NavigationProfile(config)
+        self.http_cache = HttpCache.from_config(config)
+        self.validator = CareerPageValidator(
+            db_manager, browser_pool=self.browser_pool, config=config, navigation=self.navigation, http_cache=self.http_cache
+        )
+        self.fetcher = TieredFetcher(self.browser_pool, config, navigation=self.navigation, http_cache=self.http_cache)
+        self.ats = ATSRegistry(config)
+        self.rate_limiter = DomainRateLimiter.from_config(config)
+        self.triage = LeadTriage(config)
+        self.vector_index = VectorIndex.from_config(config)
         self.keywords = config.get('scout', {}).get('keywords', [])
         self.locations = config.get('scout', {}).get('locations', [])
+        self.async_mode = config.get('scout', {}).get('async_mode', False)
+        self.max_concurrency = config.get('scout', {}).get('max_concurrency', 8)
+        self.search_workers = config.get('scout', {}).get('search_workers', 4)
+        extraction_config = config.get('scout', {}).get('content_extraction', {}) or {}
+        self.extract_main_content = extraction_config.get('enabled', True)
+        self.keep_raw_text = extraction_config.get('keep_raw_text', False)
+        self.main_content_min_length = extraction_config.get('min_length', 200)
+        self.search_cache = QueryCache(
+            cache_dir=config.get('scout', {}).get('search_cache_dir', "storage/cache/search"),
+            ttl_hours=config.get('scout', {}).get('search_cache_ttl_hours', 6)
+        )
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        
+    def _count(self, key: str, amount: int = 1):
+        # Lead stages run on worker threads (asyncio.to_thread, the sync pool)
+        with self._stats_lock:
+            self.stats[key] += amount
         
     def search_web(self) -> List[Dict]:
         """
         Broad web search for jobs using DuckDuckGo to find listings outside standard aggregators.
+        The keyword x location grid is fanned out over `scout.search_workers` threads that
+        share one rate limiter; recent results are served from the on-disk query cache.
         """
         logger.info("Starting broad web search...")
         found_jobs = []
         
-        with DDGS() as ddgs:
-            for keyword in self.keywords:
-                for location in self.locations:
-                    query = f"{keyword} jobs in {location} site:greenhouse.io OR site:lever.co OR site:workday.com"
-                    logger.info(f"Searching: {query}")
-                    
-                    try:
-                        results = list(ddgs.text(query, max_results=20))
-                        for r in results:
-                            found_jobs.append({
-                                'title': r['title'],
-                                'url': r['href'],
-                                'snippet': r['body'],
-                                'source': 'web_search'
-                            })
-                        time.sleep(random.uniform(1, 3)) # Rate limiting
-                    except Exception as e:
-                        logger.error(f"Search error for {query}: {e}")
+        queries = [
+            f"{keyword} jobs in {location} site:greenhouse.io OR site:lever.co OR site:workday.com"
+            for keyword in self.keywords
+            for location in self.locations
+        ]
+        
+        with ThreadPoolExecutor(max_workers=self.search_workers) as executor:
+            for results in executor.map(self._run_query, queries):
+                found_jobs.extend(results)
                         
         return found_jobs
 
+    def _run_query(self, query: str) -> List[Dict]:
+        """Run a single search query, consulting the query cache first."""
+        cached = self.search_cache.get(query)
+        if cached is not None:
+            logger.info(f"Search cache hit: {query}")
+            return cached
+        
+        logger.info(f"Searching: {query}")
+        try:
+            self.rate_limiter.acquire(SEARCH_ENDPOINT)
+            with DDGS() as ddgs:
+                results = list(ddgs.text(query, max_results=20))
+        except Exception as e:
+            logger.error(f"Search error for {query}: {e}")
+            return []
+        
+        leads = [{
+            'title': r['title'],
+            'url': r['href'],
+            'snippet': r['body'],
+            'source': 'web_search'
+        } for r in results]
+        self.search_cache.put(query, leads)
+        return leads
+
     def scrape_job_details(self, url: str) -> Dict:
         """
-        Scrape full job details from a URL using Playwright.
+        Scrape full job details from a URL, trying a static HTTP fetch before
+        falling back to a render in the shared browser pool.
         """
-        try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                page.goto(url, timeout=30000)
-                
-                # Extract content
-                title = page.title()
-                content = page.content()
-                text_content = page.inner_text("body")
-                
-                # Basic extraction (LLM can refine this later)
-                # We rely on the LLM to parse the unstructured text into structured data
-                
-                browser.close()
-                return {
-                    'title': title,
-                    'description': text_content,
-                    'raw_html': content
-                }
-        except Exception as e:
-            logger.error(f"Failed to scrape {url}: {e}")
-            return {}
+        return self.fetcher.fetch(url)
+
+    async def scrape_job_details_async(self, url: str, browser_pool: AsyncBrowserPool, client: httpx.AsyncClient) -> Dict:
+        """Async variant of scrape_job_details for the concurrent mission."""
+        return await self.fetcher.fetch_async(url, browser_pool, client)
 
     def parse_with_llm(self, raw_text: str, url: str) -> Dict:
         """
@@ -236,7 +470,8 @@ class Scout:
             structured_data = self.llm.generate_structured(
                 system_prompt, 
                 f"URL: {url}\n\nTEXT:\n{truncated_text}",
-                {} # Schema is implicit in prompt for now, can be explicit
+                {}, # Schema is implicit in prompt for now, can be explicit
+                call_site="scout_parse"
             )
             return structured_data
         except Exception as e:
@@ -247,63 +482,306 @@ class Scout:
         """
         Execute the full scouting mission.
         """
+        if self.async_mode:
+            return asyncio.run(self.run_mission_async())
+
         logger.info("Scout mission started.")
+        self._reset_stats()
         
         # 1. Broad Web Search
         raw_leads = self.search_web()
         logger.info(f"Found {len(raw_leads)} raw leads from web search.")
+        self.stats['raw_leads'] = len(raw_leads)
         
-        for lead in raw_leads:
-            url = lead['url']
-            
-            # Skip if already exists
-            if self.db.is_duplicate(url):
-                logger.info(f"Skipping duplicate: {url}")
-                continue
-            
-            # 2. Scrape Details
-            details = self.scrape_job_details(url)
-            if not details or not details.get('description'):
-                continue
-                
-            # 3. Parse with LLM
-            parsed = self.parse_with_llm(details['description'], url)
-            if not parsed or not parsed.get('company') or not parsed.get('role'):
-                logger.warning(f"Failed to parse job from {url}")
-                continue
-                
-            company = parsed['company']
-            role = parsed['role']
-            
+        # Skip if already exists, then drop irrelevant hits before any fetching
+        new_leads = self._triage_leads(self._filter_new_leads(raw_leads))
+        
+        # Pull whole ATS boards when several leads share one
+        self.ats.prefetch_boards([lead['url'] for lead in new_leads])
+        
+        # 2. Scrape Details / 3. Parse (ATS API, embedded JobPosting data or LLM)
+        collected = []
+        for lead in new_leads:
+            details, parsed = self._collect_lead(lead)
+            if parsed:
+                collected.append((lead, details, parsed))
+        
+        # One round trip for every company's careers cache entry
+        self.validator.prefetch_cache([parsed['company'] for _, _, parsed in collected])
+        
+        for lead, details, parsed in collected:
             # 4. Verify on Careers Page (Ghost Job Check)
-            # Note: For web search results that ARE careers pages (greenhouse/lever), 
-            # this check is redundant but harmless.
-            careers_url = self.validator.find_careers_url(company, url)
-            is_verified = False
-            if careers_url:
-                 # If the job URL itself IS the careers page (e.g. greenhouse), it's verified by definition
-                 if urlparse(url).netloc == urlparse(careers_url).netloc:
-                     is_verified = True
-                 else:
-                    is_verified = self.validator.verify_job_on_careers_page(role, company, careers_url)
+            careers_url, is_verified = self._locate_careers_page(lead['url'], parsed)
+            if careers_url and not is_verified:
+                self.rate_limiter.acquire(careers_url)
+                is_verified = self.validator.verify_job_on_careers_page(parsed['role'], parsed['company'], careers_url)
             
             # 5. Save to DB
-            # We save even if not verified, but mark it. 
-            # User preference "HITL" suggests we might want to see them anyway.
-            # But spec says "prevent ghost jobs". 
-            # Compromise: Save with is_verified flag.
+            if self._save_lead(lead, details, parsed, careers_url, is_verified):
+                self._count('saved')
             
-            self.db.save_listing(
-                url=url,
-                company=company,
-                role=role,
-                description=details['description'], # Save full text
-                source=lead['source'],
-                location=parsed.get('location'),
-                job_type=parsed.get('job_type'),
-                date_posted=parsed.get('date_posted'),
-                company_careers_url=careers_url,
-                careers_page_verified=is_verified
-            )
+        self._log_summary()
+        logger.info("Scout mission complete.")
+
+    def _collect_lead(self, lead: Dict) -> Tuple[Dict, Optional[Dict]]:
+        """Fetch and parse one lead. Returns (details, parsed); parsed is None on failure."""
+        url = lead['url']
+        details, parsed = self._extract_from_ats(url)
+        if parsed:
+            return details, parsed
+        
+        self.rate_limiter.acquire(url)
+        details = self.scrape_job_details(url)
+        if not details or not details.get('description'):
+            return details, None
+        self._condense_description(details)
+        return details, self._parse_details(url, details)
+
+    async def run_mission_async(self):
+        """
+        Concurrent scouting mission.
+
+        Keeps up to `scout.max_concurrency` leads in flight while every request
+        to a job board is paced by that board's own token bucket. Blocking
+        work (DB, LLM, careers URL discovery) runs on worker threads.
+        """
+        logger.info(f"Scout mission started (async, max_concurrency={self.max_concurrency}).")
+        self._reset_stats()
+        self.validator.reset_for_loop() # asyncio locks are bound to this run's loop
+        
+        raw_leads = await asyncio.to_thread(self.search_web)
+        logger.info(f"Found {len(raw_leads)} raw leads from web search.")
+        self.stats['raw_leads'] = len(raw_leads)
+        
+        new_leads = self._triage_leads(await asyncio.to_thread(self._filter_new_leads, raw_leads))
+        await asyncio.to_thread(self.ats.prefetch_boards, [lead['url'] for lead in new_leads])
+        
+        browser_pool = AsyncBrowserPool(self.config)
+        client = httpx.AsyncClient(
+            headers={'User-Agent': DEFAULT_USER_AGENT},
+            limits=httpx.Limits(max_connections=self.max_concurrency * 2)
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def bounded(lead: Dict, stage):
+            async with semaphore:
+                try:
+                    return await stage
+                except Exception as e:
+                    logger.error(f"Lead failed for {lead['url']}: {e}")
+                    return None
+        
+        try:
+            results = await asyncio.gather(*(
+                bounded(lead, self._collect_lead_async(lead, browser_pool, client)) for lead in new_leads
+            ))
+            collected = [(lead, *result) for lead, result in zip(new_leads, results) if result and result[1]]
             
+            await asyncio.to_thread(self.validator.prefetch_cache, [parsed['company'] for _, _, parsed in collected])
+            
+            await asyncio.gather(*(
+                bounded(lead, self._verify_and_save_async(lead, details, parsed, browser_pool))
+                for lead, details, parsed in collected
+            ))
+        finally:
+            await client.aclose()
+            await browser_pool.close()
+            
+        self._log_summary()
         logger.info("Scout mission complete.")
+
+    async def _collect_lead_async(self, lead: Dict, browser_pool: AsyncBrowserPool, client: httpx.AsyncClient) -> Tuple[Dict, Optional[Dict]]:
+        url = lead['url']
+        
+        details, parsed = await asyncio.to_thread(self._extract_from_ats, url)
+        if parsed:
+            return details, parsed
+        
+        await self.rate_limiter.acquire_async(url)
+        details = await self.scrape_job_details_async(url, browser_pool, client)
+        if not details or not details.get('description'):
+            return details, None
+        await asyncio.to_thread(self._condense_description, details)
+        return details, await asyncio.to_thread(self._parse_details, url, details)
+
+    async def _verify_and_save_async(self, lead: Dict, details: Dict, parsed: Dict, browser_pool: AsyncBrowserPool):
+        careers_url, is_verified = await asyncio.to_thread(self._locate_careers_page, lead['url'], parsed)
+        if careers_url and not is_verified:
+            await self.rate_limiter.acquire_async(careers_url)
+            is_verified = await self.validator.verify_job_on_careers_page_async(
+                parsed['role'], parsed['company'], careers_url, browser_pool
+            )
+        
+        if await asyncio.to_thread(self._save_lead, lead, details, parsed, careers_url, is_verified):
+            self._count('saved')
+
+    def _filter_new_leads(self, leads: List[Dict]) -> List[Dict]:
+        """
+        Collapse leads whose URLs share a canonical form within the batch, and
+        drop leads already in the database with a single bulk lookup. Leads keep
+        their original URL; the canonical form is only the dedupe key.
+        """
+        unique: Dict[str, Dict] = {}
+        for lead in leads:
+            canonical = canonicalize_url(lead['url'])
+            if canonical in unique:
+                self._count('batch_repeats')
+                continue
+            unique[canonical] = lead
+        
+        existing = self.db.existing_urls(unique.keys())
+        for url in existing:
+            logger.info(f"Skipping duplicate: {url}")
+        self._count('duplicates', len(existing))
+        
+        return [lead for url, lead in unique.items() if url not in existing]
+
+    def _triage_leads(self, leads: List[Dict]) -> List[Dict]:
+        """Score leads on title and snippet; log and count every rejection so recall can be tuned."""
+        kept, rejected = self.triage.triage(leads)
+        for lead, reason in rejected:
+            self._count(f'triage_{reason}')
+            logger.info(f"Triage rejected ({reason}, score={lead['triage_score']}): {lead.get('title')} - {lead['url']}")
+        self._count('triage_kept', len(kept))
+        self._count('triage_deprioritized', sum(lead['triage_score'] < self.triage.deprioritize_below for lead in kept))
+        if rejected:
+            logger.info(f"Triage kept {len(kept)} of {len(leads)} leads.")
+        return kept
+
+    def _extract_from_ats(self, url: str) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Pull structured fields straight from the ATS JSON API when the URL belongs to one.
+        Returns (details, parsed); parsed is None when the lead needs the scrape + LLM path.
+        """
+        if not self.ats.match(url):
+            return {}, None
+        
+        # Postings served from a prefetched board make no request, so only API lookups wait
+        listing = self.ats.extract(url, rate_limiter=self.rate_limiter)
+        if not listing or not listing.get('company') or not listing.get('role') or not listing.get('description'):
+            return {}, None
+        
+        self._count('ats_api')
+        details = {'title': listing['role'], 'description': listing['description'], 'raw_html': '', 'tier': 'ats_api'}
+        return details, listing
+
+    def _condense_description(self, details: Dict):
+        """
+        Replace the scraped page text with just its main content (job body without
+        nav, banners, footers or "similar jobs" lists). The page text is kept as
+        raw_description when `scout.content_extraction.keep_raw_text` is set.
+        """
+        self._count('scraped_listings')
+        if not self.extract_main_content:
+            return
+        raw_text = details['description']
+        clean = extract_main_content(details.get('raw_html', ''), min_length=self.main_content_min_length)
+        if not clean or len(clean) >= len(raw_text):
+            return
+        
+        self._count('main_content_extracted')
+        self._count('prompt_chars_saved', prompt_chars_saved(raw_text, clean))
+        if self.keep_raw_text:
+            details['raw_description'] = raw_text
+        details['description'] = clean
+
+    def _reset_stats(self):
+        self.stats = Counter()
+        self.search_cache.hits = self.search_cache.misses = 0
+        self.fetcher.stats = Counter()
+        self.validator.snapshots.stats = Counter()
+        self.navigation.stats = Counter()
+        if self.http_cache:
+            self.http_cache.stats = Counter()
+
+    def _log_summary(self):
+        """Log the per-mission counters."""
+        self.stats['search_cache_hits'] = self.search_cache.hits
+        self.stats['search_cache_misses'] = self.search_cache.misses
+        self.stats.update(self.fetcher.stats)
+        self.stats.update(self.validator.snapshots.stats)
+        self.stats.update(self.navigation.stats)
+        if self.http_cache:
+            self.stats.update(self.http_cache.stats)
+        summary = ", ".join(f"{key}={value}" for key, value in sorted(self.stats.items()))
+        logger.info(f"Scout mission summary: {summary}")
+        
+        if self.stats['scraped_listings']:
+            saved = self.stats['prompt_chars_saved'] / self.stats['scraped_listings']
+            logger.info(
+                f"Main-content extraction: {saved:,.0f} chars (~{saved / CHARS_PER_TOKEN:,.0f} tokens) saved per scraped listing "
+                f"across the {len(PROMPT_SLICES)} downstream prompts"
+            )
+
+    def _parse_details(self, url: str, details: Dict) -> Optional[Dict]:
+        """
+        Turn scraped page text into structured fields; None if company/role are missing.
+        Embedded schema.org JobPosting data is used first; the LLM only fills in
+        what it leaves missing.
+        """
+        structured = extract_job_posting(details.get('raw_html', ''))
+        if has_required_fields(structured):
+            self._count('llm_skipped_structured')
+            return structured
+        
+        # Byte-identical content was already parsed on an earlier fetch
+        cached = self.http_cache.get_parsed(details.get('content_hash')) if self.http_cache else None
+        if cached:
+            self._count('llm_skipped_unchanged')
+            return cached
+        
+        self._count('llm_parsed')
+        parsed = self.parse_with_llm(details['description'], url)
+        if parsed:
+            parsed = {**parsed, **{k: v for k, v in structured.items() if v}}
+        if not parsed or not parsed.get('company') or not parsed.get('role'):
+            logger.warning(f"Failed to parse job from {url}")
+            return None
+        if self.http_cache:
+            self.http_cache.put_parsed(details.get('content_hash'), parsed)
+        return parsed
+
+    def _locate_careers_page(self, url: str, parsed: Dict) -> Tuple[Optional[str], bool]:
+        """
+        Find the company's careers page. Returns (careers_url, is_verified), where
+        is_verified is already True when the job URL lives on the careers site itself.
+        """
+        # Note: For web search results that ARE careers pages (greenhouse/lever), 
+        # this check is redundant but harmless.
+        careers_url = self.validator.find_careers_url(parsed['company'], url)
+        # If the job URL itself IS the careers page (e.g. greenhouse), it's verified by definition
+        is_verified = bool(careers_url) and urlparse(url).netloc == urlparse(careers_url).netloc
+        return careers_url, is_verified
+
+    def _save_lead(self, lead: Dict, details: Dict, parsed: Dict, careers_url: Optional[str], is_verified: bool) -> Optional[str]:
+        # We save even if not verified, but mark it. 
+        # User preference "HITL" suggests we might want to see them anyway.
+        # But spec says "prevent ghost jobs". 
+        # Compromise: Save with is_verified flag.
+        job_id = self.db.save_listing(
+            url=lead['url'],
+            company=parsed['company'],
+            role=parsed['role'],
+            description=details['description'], # Save full text
+            source=lead['source'],
+            location=parsed.get('location'),
+            job_type=parsed.get('job_type'),
+            date_posted=parsed.get('date_posted'),
+            company_careers_url=careers_url,
+            careers_page_verified=is_verified,
+            raw_description=details.get('raw_description')
+        )
+        if job_id:
+            # Vectorized once at ingestion for the Barometer's similarity ranking
+            try:
+                self.vector_index.add(job_id, details['description'])
+            except Exception as e:
+                logger.warning(f"Failed to index {job_id}: {e}")
+        return job_id
+
+    def close(self):
+        """Release the shared browser pool, the validator's HTTP client and the page cache."""
+        self.validator.close()
+        self.browser_pool.close()
+        if self.http_cache:
+            self.http_cache.close()
@@ -2,7 +2,7 @@ import logging
 import json
 from typing import Dict, Tuple, List
 from db.manager import DatabaseManager
-from utils.llm_client import LLMClient
+from utils.llm_client import LLMClient, BatchRequest
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,12 @@ class Tribunal:
         self.config = config
         self.personas = config.get('tribunal', {}).get('personas', ["ATS Specialist", "Recruiter", "Hiring Manager"])
         self.min_score = config.get('tribunal', {}).get('min_approval_score', 90)
+        self.processed = 0 # Applications reviewed in the last cycle
+        
+        # Offline mode: persona reviews go out as one provider batch per cycle, collected on a later cycle
+        offline_config = config.get('tribunal', {}).get('offline_batch', {}) or {}
+        self.offline_batch = offline_config.get('enabled', False)
+        self.offline_max_requests = offline_config.get('max_requests', 10000)
 
     def review(self, job: Dict, resume_md: str, cl_md: str) -> Tuple[float, str]:
         """
@@ -26,13 +32,13 @@ class Tribunal:
         """
         logger.info(f"Tribunal convening for: {job['company']} - {job['role']}")
         
-        scores = []
-        feedbacks = []
-        
-        for persona in self.personas:
-            score, feedback = self._conduct_review(persona, job, resume_md, cl_md)
-            scores.append(score)
-            feedbacks.append(f"**{persona}**: {feedback}")
+        reviews = [self._conduct_review(persona, job, resume_md, cl_md) for persona in self.personas]
+        return self._verdict(reviews)
+
+    def _verdict(self, reviews: List[Tuple[float, str]]) -> Tuple[float, str]:
+        """Average the persona scores and join their feedback, in persona order."""
+        scores = [score for score, _ in reviews]
+        feedbacks = [f"**{persona}**: {feedback}" for persona, (_, feedback) in zip(self.personas, reviews)]
             
         final_score = sum(scores) / len(scores)
         aggregated_feedback = "\n\n".join(feedbacks)
@@ -42,7 +48,19 @@ class Tribunal:
 
     def _conduct_review(self, persona: str, job: Dict, resume_md: str, cl_md: str) -> Tuple[float, str]:
         """Ask a specific persona to review the materials."""
-        
+        system_prompt, user_prompt = self._review_prompts(persona, job, resume_md, cl_md)
+        try:
+            review = self.llm.generate_structured(system_prompt, user_prompt, {}, call_site="tribunal_review")
+            return self._persona_review(review)
+        except Exception as e:
+            logger.error(f"Tribunal review failed for {persona}: {e}")
+            return 0.0, "Error during review."
+
+    @staticmethod
+    def _persona_review(review: Dict) -> Tuple[float, str]:
+        return float(review.get('score', 0)), review.get('feedback', 'No feedback provided.')
+
+    def _review_prompts(self, persona: str, job: Dict, resume_md: str, cl_md: str) -> Tuple[str, str]:
         system_prompt = f"""
         You are a {persona} reviewing a job application.
         
@@ -74,84 +92,138 @@ class Tribunal:
         
         Review as a {persona}.
         """
-        
-        try:
-            review = self.llm.generate_structured(system_prompt, user_prompt, {})
-            return float(review.get('score', 0)), review.get('feedback', 'No feedback provided.')
-        except Exception as e:
-            logger.error(f"Tribunal review failed for {persona}: {e}")
-            return 0.0, "Error during review."
+        return system_prompt, user_prompt
+
+    @staticmethod
+    def _job(app: Dict) -> Dict:
+        return {
+            'job_id': app['job_id'],
+            'company': app['company'],
+            'role': app['role'],
+            'description': app['description']
+        }
 
     def run_review_cycle(self, mirror_agent):
         """
         Fetch drafted applications, review them, and refine if necessary.
         """
         logger.info("Tribunal review cycle started.")
+        self.processed = 0
         
-        # Get applications in 'drafted' status
-        cursor = self.db.conn.cursor()
-        cursor.execute("""
-            SELECT a.*, l.company, l.role, l.description 
-            FROM applications a
-            JOIN listings l ON a.job_id = l.job_id
-            WHERE a.status = 'drafted'
-        """)
+        if self.offline_batch:
+            self.collect_offline_batches()
         
-        applications = [dict(row) for row in cursor.fetchall()]
+        # Mirror saves applications as 'draft'
+        applications = self.db.get_applications(statuses=('draft', 'drafted'))
         logger.info(f"Found {len(applications)} drafts to review.")
         
+        if self.offline_batch:
+            self.submit_offline(applications)
+            logger.info("Tribunal review cycle complete.")
+            return
+        
         for app in applications:
-            resume_md = app['resume_version']
-            cl_md = app['cover_letter_version']
-            job = {
-                'job_id': app['job_id'],
-                'company': app['company'],
-                'role': app['role'],
-                'description': app['description']
-            }
+            job = self._job(app)
+            score, feedback = self.review(job, app['resume_version'], app['cover_letter_version'])
+            self._finalize(app, job, score, feedback)
+
+        logger.info("Tribunal review cycle complete.")
+
+    def _finalize(self, app: Dict, job: Dict, score: float, feedback: str):
+        """Refine materials that scored below min_score, then save the final verdict."""
+        resume_md = app['resume_version']
+        cl_md = app['cover_letter_version']
+        
+        # Refinement Loop (max 2 iterations to save tokens/time)
+        iteration = 0
+        while score < self.min_score and iteration < 2:
+            logger.info(f"Score {score} < {self.min_score}. Requesting refinement (Iteration {iteration+1})...")
             
-            # Initial Review
-            score, feedback = self.review(job, resume_md, cl_md)
+            # Ask Mirror to refine based on feedback
+            # We need to extend Mirror to support refinement
+            # For now, we'll just re-generate with feedback injected into prompt
+            # But Mirror.generate doesn't take feedback. 
+            # Let's add a _refine method to Mirror or just pass it here if we modify Mirror.
             
-            # Refinement Loop (max 2 iterations to save tokens/time)
-            iteration = 0
-            while score < self.min_score and iteration < 2:
-                logger.info(f"Score {score} < {self.min_score}. Requesting refinement (Iteration {iteration+1})...")
-                
-                # Ask Mirror to refine based on feedback
-                # We need to extend Mirror to support refinement
-                # For now, we'll just re-generate with feedback injected into prompt
-                # But Mirror.generate doesn't take feedback. 
-                # Let's add a _refine method to Mirror or just pass it here if we modify Mirror.
-                
-                # Since we can't easily modify Mirror in this step without context switching,
-                # let's assume we can call a refine method. If not, we'll skip refinement for this MVP step.
-                # Ideally, we'd update Mirror.py to have a refine() method.
-                
-                # Let's try to use the LLM directly here to refine, or update Mirror.
-                # Updating Mirror is cleaner. I will assume Mirror has a refine method or I will add it.
-                # For this specific file write, I can't edit Mirror.py.
-                # So I will implement a local refinement helper here using the LLM.
-                
-                resume_md, cl_md = self._refine_materials(job, resume_md, cl_md, feedback)
-                score, feedback = self.review(job, resume_md, cl_md)
-                iteration += 1
+            # Since we can't easily modify Mirror in this step without context switching,
+            # let's assume we can call a refine method. If not, we'll skip refinement for this MVP step.
+            # Ideally, we'd update Mirror.py to have a refine() method.
             
-            # Save final result
-            cursor.execute("""
-                UPDATE applications 
-                SET status = 'reviewed', 
-                    tribunal_final_score = ?, 
-                    feedback = ?,
-                    resume_version = ?,
-                    cover_letter_version = ?
-                WHERE application_id = ?
-            """, (score, feedback, resume_md, cl_md, app['application_id']))
-            self.db.conn.commit()
+            # Let's try to use the LLM directly here to refine, or update Mirror.
+            # Updating Mirror is cleaner. I will assume Mirror has a refine method or I will add it.
+            # For this specific file write, I can't edit Mirror.py.
+            # So I will implement a local refinement helper here using the LLM.
             
-            logger.info(f"Application {app['application_id']} reviewed. Final Score: {score}")
+            resume_md, cl_md = self._refine_materials(job, resume_md, cl_md, feedback)
+            score, feedback = self.review(job, resume_md, cl_md)
+            iteration += 1
+        
+        # Save final result
+        self.db.update_application_review(app['application_id'], score, feedback, resume_md, cl_md)
+        
+        self.processed += 1
+        logger.info(f"Application {app['application_id']} reviewed. Final Score: {score}")
 
-        logger.info("Tribunal review cycle complete.")
+    def submit_offline(self, applications: List[Dict]):
+        """
+        Submit one review request per (application, persona) as provider
+        batches of at most `max_requests`, checkpoint each batch id in the DB
+        and park the applications as 'review_pending' until
+        `collect_offline_batches` applies the verdicts.
+        """
+        per_batch = max(1, self.offline_max_requests // len(self.personas))
+        for start in range(0, len(applications), per_batch):
+            chunk = applications[start:start + per_batch]
+            requests, items = [], {}
+            for app in chunk:
+                job = self._job(app)
+                for i, persona in enumerate(self.personas):
+                    custom_id = f"{app['application_id']}-{i}"
+                    system_prompt, user_prompt = self._review_prompts(persona, job, app['resume_version'], app['cover_letter_version'])
+                    requests.append(BatchRequest(custom_id, system_prompt, user_prompt, call_site="tribunal_review", output_schema={}))
+                    items[custom_id] = {'application_id': app['application_id'], 'persona': persona}
+            try:
+                batch_id = self.llm.submit_batch(requests)
+            except Exception as e:
+                logger.error(f"Submitting Tribunal batch failed: {e}")
+                continue
+            self.db.save_llm_batch(batch_id, "tribunal", items)
+            for app in chunk:
+                self.db.set_application_status(app['application_id'], 'review_pending')
+
+    def collect_offline_batches(self):
+        """
+        Apply every finished Tribunal batch recorded in the DB. An application
+        is finalized (refinement included, interactively) once all its persona
+        reviews came back; otherwise it returns to 'draft' for the next cycle.
+        Only 'review_pending' applications are touched, so re-applying is harmless.
+        """
+        for batch in self.db.get_pending_llm_batches("tribunal"):
+            batch_id = batch['batch_id']
+            try:
+                answers = self.llm.poll_batch(batch_id, call_site="tribunal_offline", structured=True)
+            except Exception as e:
+                logger.error(f"Polling Tribunal batch {batch_id} failed: {e}")
+                continue
+            if answers is None:
+                logger.info(f"Tribunal batch {batch_id} is still processing.")
+                continue
+            
+            custom_ids: Dict[str, Dict[str, str]] = {}
+            for custom_id, item in batch['items'].items():
+                custom_ids.setdefault(item['application_id'], {})[item['persona']] = custom_id
+            
+            for app in self.db.get_applications(statuses=('review_pending',), application_ids=custom_ids):
+                by_persona = custom_ids[app['application_id']]
+                reviews = [answers.get(by_persona.get(persona)) for persona in self.personas]
+                if any(review is None for review in reviews):
+                    logger.warning(f"Incomplete batch review for {app['application_id']}; requeueing it")
+                    self.db.set_application_status(app['application_id'], 'draft')
+                    continue
+                job = self._job(app)
+                score, feedback = self._verdict([self._persona_review(review) for review in reviews])
+                self._finalize(app, job, score, feedback)
+            self.db.complete_llm_batch(batch_id)
 
     def _refine_materials(self, job: Dict, resume_md: str, cl_md: str, feedback: str) -> Tuple[str, str]:
         """Refine materials based on feedback."""
@@ -176,7 +248,7 @@ class Tribunal:
         Refine both documents.
         """
         
-        response = self.llm.generate(system_prompt, user_prompt)
+        response = self.llm.generate(system_prompt, user_prompt, call_site="tribunal_refine")
         
         try:
             parts = response.split('---SPLIT---')
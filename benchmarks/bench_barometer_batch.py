@@ -0,0 +1,78 @@
+"""
+Benchmark: Barometer tokens per scored job, one listing per request vs. batched scoring.
+
+A fake LLM scores every listing it is shown and counts prompt and completion
+tokens (chars / 4). Listings are synthetic, with description lengths spread
+between ~1k and ~8k characters; the real strategic_narrative.yaml is used so
+the fixed prefix has its production size.
+
+Usage:
+    python benchmarks/bench_barometer_batch.py --jobs 60
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # strategic_narrative.yaml
+
+from agents.barometer import Barometer, CHARS_PER_TOKEN
+from utils.llm_client import prompt_text
+from db.manager import DatabaseManager
+
+WORDS = ("roadmap stakeholders platform agents retrieval evaluation pricing onboarding analytics "
+         "experimentation compliance reliability latency customers partners launch").split()
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def generate_structured(self, system, user, schema, **kwargs):
+        self.calls += 1
+        user = prompt_text(user)
+        self.prompt_tokens += (len(system) + len(user)) // CHARS_PER_TOKEN
+        job_ids = re.findall(r"job_id: (\S+)", user)
+        record = {"score": 72.0, "reasoning": "Solid overlap with the AI PM narrative. " * 3,
+                  "matched_narrative": "AI Product Manager", "strengths": ["LLM systems", "roadmaps"], "gaps": ["fintech"]}
+        response = {"results": [{"job_id": j, **record} for j in job_ids]} if job_ids else record
+        self.completion_tokens += len(json.dumps(response)) // CHARS_PER_TOKEN
+        return response
+
+def seed(db: DatabaseManager, jobs: int, rng: random.Random):
+    for i in range(jobs):
+        length = rng.randint(150, 1300)
+        description = " ".join(rng.choice(WORDS) + str(rng.randint(0, 999)) for _ in range(length))
+        db.save_listing(url=f"https://bench.example/jobs/{i}", company=f"Company {i}", role="Product Manager",
+                        description=description, source="bench")
+
+def run(mode: str, jobs: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{tmp}/bench.db", near_duplicate_threshold=None)
+        seed(db, jobs, random.Random(11))
+        llm = CountingLLM()
+        config = {'barometer': {'min_fit_score': 60, 'prescore': {'enabled': False},
+                                'batch_scoring': {'enabled': mode == "batched"}},
+                  'vector_index': {'dir': os.path.join(tmp, "vectors")}}
+        barometer = Barometer(db, llm, config)
+        barometer.run_analysis_cycle()
+        db.close()
+
+    total = llm.prompt_tokens + llm.completion_tokens
+    print(f"{mode:<10} requests={llm.calls:4d}  prompt={llm.prompt_tokens:8,d}  completion={llm.completion_tokens:7,d}  "
+          f"tokens/job={total / jobs:8,.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=60)
+    args = parser.parse_args()
+    run("single", args.jobs)
+    run("batched", args.jobs)
+
+if __name__ == "__main__":
+    main()
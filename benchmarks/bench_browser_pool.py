@@ -0,0 +1,79 @@
+"""
+Benchmark: pages/sec for a cold Chromium launch per URL vs. the shared BrowserPool.
+
+Serves a synthetic job page from a local HTTP server so the numbers measure
+browser overhead rather than the network.
+
+Usage:
+    python benchmarks/bench_browser_pool.py --pages 20
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+from utils.browser_pool import BrowserPool
+
+JOB_PAGE = b"""<html><head><title>Senior Product Manager - Acme</title></head>
+<body><h1>Senior Product Manager</h1><p>Acme is hiring a Senior Product Manager in Seattle, WA.</p></body></html>"""
+
+class JobPageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(JOB_PAGE)))
+        self.end_headers()
+        self.wfile.write(JOB_PAGE)
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JobPageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def scrape_cold(urls):
+    """The pre-pool behaviour: one Chromium launch per URL."""
+    for url in urls:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            page.goto(url, timeout=30000)
+            page.inner_text("body")
+            browser.close()
+
+def scrape_pooled(urls):
+    pool = BrowserPool()
+    try:
+        for url in urls:
+            with pool.page() as page:
+                page.goto(url, timeout=30000)
+                page.inner_text("body")
+    finally:
+        pool.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+
+    server = start_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/job/{i}" for i in range(args.pages)]
+
+    for name, fn in (("cold launch per URL", scrape_cold), ("shared browser pool", scrape_pooled)):
+        start = time.perf_counter()
+        fn(urls)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {len(urls)} pages in {elapsed:6.2f}s  ->  {len(urls) / elapsed:6.2f} pages/sec")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
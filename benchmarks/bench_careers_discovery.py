@@ -0,0 +1,135 @@
+"""
+Benchmark: careers-URL discovery latency, sequential probes vs. the concurrent race.
+
+A local fake-site server answers the candidate URLs for N companies with
+randomized latency; most companies have one working pattern, some only expose
+their careers link on the homepage, and a few have nothing at all.
+
+Usage:
+    python benchmarks/bench_careers_discovery.py --companies 40
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from bs4 import BeautifulSoup
+from agents.scout import CareerPageValidator
+from db.manager import DatabaseManager
+
+PATTERNS = ["/{slug}/careers-site", "/{slug}/careers", "/{slug}/jobs", "/{slug}/www-careers"]
+
+class FakeSites(BaseHTTPRequestHandler):
+    routes = {}  # path -> (status, latency seconds, body)
+    current_company = ""  # "/" serves this company's homepage
+
+    def _respond(self, send_body):
+        path = f"/{self.current_company}/home" if self.path == "/" else self.path
+        status, latency, body = self.routes.get(path, (404, 0.05, b""))
+        time.sleep(latency)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def log_message(self, *args):
+        pass
+
+def build_sites(companies: int, seed: int = 7):
+    rng = random.Random(seed)
+    slugs = []
+    for i in range(companies):
+        slug = f"company{i}"
+        slugs.append(slug)
+        for pattern in PATTERNS:
+            FakeSites.routes[pattern.format(slug=slug)] = (404, rng.uniform(0.05, 0.6), b"")
+        kind = rng.random()
+        if kind < 0.7:
+            winner = rng.choice(PATTERNS).format(slug=slug)
+            FakeSites.routes[winner] = (200, rng.uniform(0.05, 0.6), b"")
+        elif kind < 0.9:
+            links = "".join(f'<a href="/{slug}/page{j}">Careers {j}</a>' for j in range(4))
+            FakeSites.routes[f"/{slug}/home"] = (200, rng.uniform(0.05, 0.3), f"<html><body>{links}</body></html>".encode())
+            for j in range(4):
+                FakeSites.routes[f"/{slug}/page{j}"] = (200 if j == 3 else 404, rng.uniform(0.05, 0.4), b"")
+    return slugs
+
+def sequential_discovery(base: str, slug: str):
+    """The pre-race algorithm: one blocking HEAD after another."""
+    session = requests.Session()
+    for pattern in PATTERNS:
+        url = base + pattern.format(slug=slug)
+        if session.head(url, timeout=5).status_code == 200:
+            return url
+    home = f"{base}/"
+    response = session.get(home, timeout=10)
+    soup = BeautifulSoup(response.content, 'html.parser')
+    for link in soup.find_all('a', href=True):
+        if 'careers' in link.get_text().lower():
+            url = urljoin(home, link['href'])
+            if session.head(url, timeout=5).status_code == 200:
+                return url
+    return None
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def report(name, latencies):
+    print(f"{name:<22} p50={percentile(latencies, 50) * 1000:7.0f}ms  p95={percentile(latencies, 95) * 1000:7.0f}ms  "
+          f"mean={statistics.mean(latencies) * 1000:7.0f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--companies", type=int, default=40)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSites)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    slugs = build_sites(args.companies)
+
+    sequential = []
+    for slug in slugs:
+        FakeSites.current_company = slug
+        start = time.perf_counter()
+        sequential_discovery(base, slug)
+        sequential.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{tmp}/bench.db")
+        config = {'scout': {'careers_url_patterns': [base + p for p in PATTERNS]}}
+        validator = CareerPageValidator(db, config=config)
+        validator._search_careers_page = lambda company: [] # Keep the benchmark offline
+
+        concurrent = []
+        for slug in slugs:
+            FakeSites.current_company = slug
+            start = time.perf_counter()
+            validator.find_careers_url(slug, f"{base}/{slug}/job/1")
+            concurrent.append(time.perf_counter() - start)
+        validator.close()
+        db.close()
+
+    report("sequential probes", sequential)
+    report("concurrent race", concurrent)
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: Barometer cost and throughput, single large tier vs. small-first cascade.
+
+A fake LLM stands in for both tiers. Every synthetic listing has a hidden
+"true" fit; the small tier answers within +/-12 points of it, the large tier
+within +/-3. Tokens are counted as chars / 4 and priced with `llm.pricing`
+from config.yaml; latency is simulated per tier (fixed overhead plus time
+per output token), so the report shows modelled seconds, not wall time.
+Agreement is the share of listings whose accept/reject decision against
+min_fit_score matches the single-tier run.
+
+Usage:
+    python benchmarks/bench_model_cascade.py --jobs 200 --band 10
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import zlib
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # strategic_narrative.yaml, config.yaml
+
+import yaml
+from sqlalchemy import text
+from agents.barometer import Barometer, CHARS_PER_TOKEN
+from db.manager import DatabaseManager
+from utils.llm_client import prompt_text
+
+WORDS = ("roadmap stakeholders platform agents retrieval evaluation pricing onboarding analytics "
+         "experimentation compliance reliability latency customers partners launch").split()
+
+# (seconds per request, seconds per output token, score noise)
+TIER_PROFILE = {"small": (0.4, 0.004, 12.0), "large": (1.5, 0.02, 3.0)}
+
+class TierLLM:
+    def __init__(self, truth, models, pricing):
+        self.truth = truth
+        self.models = models
+        self.pricing = pricing
+        self.requests = Counter()
+        self.seconds = 0.0
+        self.cost = 0.0
+
+    def generate_structured(self, system, user, schema, tier=None, **kwargs):
+        tier = tier or "large"
+        prompt = prompt_text(user)
+        company = prompt.split("Company: ")[1].split("\n")[0]
+        base, per_token, noise = TIER_PROFILE[tier]
+        # Deterministic per (listing, tier) so cascade and single-tier runs see the same answers
+        rng = random.Random(zlib.crc32(f"{company}/{tier}".encode()))
+        score = min(100.0, max(0.0, self.truth[company] + rng.uniform(-noise, noise)))
+        response = {"score": round(score, 1), "reasoning": "Overlap with the AI PM narrative. " * 3,
+                    "matched_narrative": "AI Product Manager", "strengths": ["LLM systems"], "gaps": ["fintech"]}
+
+        prompt_tokens = (len(system) + len(prompt)) // CHARS_PER_TOKEN
+        output_tokens = len(json.dumps(response)) // CHARS_PER_TOKEN
+        price = self.pricing.get(self.models[tier], {})
+        self.cost += (prompt_tokens * price.get('input', 0) + output_tokens * price.get('output', 0)) / 1e6
+        self.seconds += base + per_token * output_tokens
+        self.requests[tier] += 1
+        return response
+
+def seed(db: DatabaseManager, jobs: int, rng: random.Random):
+    truth = {}
+    for i in range(jobs):
+        description = " ".join(rng.choice(WORDS) + str(rng.randint(0, 999)) for _ in range(rng.randint(150, 1300)))
+        company = f"Company{i}"
+        truth[company] = rng.uniform(10, 95)
+        db.save_listing(url=f"https://bench.example/jobs/{i}", company=company, role="Product Manager",
+                        description=description, source="bench")
+    return truth
+
+def run(cascade: bool, jobs: int, band: float, llm_config: dict, min_fit_score: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{tmp}/bench.db", near_duplicate_threshold=None)
+        truth = seed(db, jobs, random.Random(7))
+        llm = TierLLM(truth, llm_config['models'], llm_config.get('pricing', {}))
+        config = {'barometer': {'min_fit_score': min_fit_score, 'prescore': {'enabled': False}, 'max_workers': 1,
+                                'cascade': {'enabled': cascade, 'band': band}},
+                  'vector_index': {'dir': os.path.join(tmp, "vectors")}}
+        Barometer(db, llm, config).run_analysis_cycle()
+        with db.engine.connect() as conn:
+            accepted = {row[0]: row[1] >= min_fit_score
+                        for row in conn.execute(text("SELECT company, fit_score FROM listings"))}
+        db.close()
+    return llm, accepted
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--band", type=float, default=10)
+    args = parser.parse_args()
+
+    with open("config.yaml") as f:
+        config = yaml.safe_load(f)
+    min_fit_score = config.get('barometer', {}).get('min_fit_score', 60)
+
+    results = {name: run(cascade, args.jobs, args.band, config['llm'], min_fit_score)
+               for name, cascade in (("single", False), ("cascade", True))}
+    baseline_accepted = results["single"][1]
+    for name, (llm, accepted) in results.items():
+        agreement = sum(accepted[c] == baseline_accepted[c] for c in accepted) / len(accepted)
+        print(f"{name:<8} requests small={llm.requests['small']:4d} large={llm.requests['large']:4d}  "
+              f"cost=${llm.cost:7.3f} (${llm.cost / args.jobs * 1000:6.2f}/1k jobs)  "
+              f"modelled={llm.seconds:7.1f}s ({args.jobs / llm.seconds:5.2f} jobs/s)  agreement={agreement:.1%}")
+
+if __name__ == "__main__":
+    main()
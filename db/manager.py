@@ -1,10 +1,14 @@
 import os
 import hashlib
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
-from sqlalchemy import create_engine, text
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Iterable, Set
+from sqlalchemy import create_engine, text, bindparam, inspect
 from sqlalchemy.exc import IntegrityError
+from utils.normalize import canonicalize_url, normalize_company_name
+from utils.bloom import BloomFilter
+from utils import fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +17,10 @@ class DatabaseManager:
     Database-agnostic manager (SQLite/PostgreSQL) using SQLAlchemy.
     """
     
-    def __init__(self, db_url: Optional[str] = None):
+    # Keep IN (...) lists well under SQLite's bound-parameter limit
+    BULK_QUERY_CHUNK = 500
+
+    def __init__(self, db_url: Optional[str] = None, use_url_filter: bool = False, near_duplicate_threshold: Optional[float] = 0.85):
         # Default to SQLite if no URL provided
         self.db_url = db_url or os.getenv("DATABASE_URL", "sqlite:///jobs.db")
         
@@ -23,6 +30,14 @@ class DatabaseManager:
             
         self.engine = create_engine(self.db_url)
         self.initialize_db()
+        
+        # Optional in-process Bloom filter of canonical listing URLs, warmed on first use
+        self.use_url_filter = use_url_filter
+        self.url_filter: Optional[BloomFilter] = None
+        
+        # Listings whose description fingerprint is at least this similar to an
+        # existing one are linked to it instead of being queued (None disables)
+        self.near_duplicate_threshold = near_duplicate_threshold
     
     def initialize_db(self):
         """Create tables if they don't exist."""
@@ -46,11 +61,13 @@ class DatabaseManager:
                 CREATE TABLE IF NOT EXISTS listings (
                     job_id VARCHAR(32) PRIMARY KEY,
                     url TEXT UNIQUE NOT NULL,
+                    canonical_url TEXT,
                     company TEXT NOT NULL,
                     role TEXT NOT NULL,
                     location TEXT,
                     job_type TEXT,
                     description TEXT NOT NULL,
+                    raw_description TEXT,
                     date_posted VARCHAR(32),
                     date_found TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     source TEXT,
@@ -112,6 +129,55 @@ class DatabaseManager:
                 );
             """))
             
+            # Near-duplicate detection: MinHash signature per listing plus LSH band buckets
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS listing_fingerprints (
+                    job_id VARCHAR(32) PRIMARY KEY,
+                    signature TEXT NOT NULL,
+                    canonical_job_id VARCHAR(32),
+                    similarity FLOAT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """))
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS listing_lsh_buckets (
+                    bucket VARCHAR(32) NOT NULL,
+                    job_id VARCHAR(32) NOT NULL
+                );
+            """))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON listing_lsh_buckets(bucket);"))
+            
+            # One row per LLM call: which agent/stage, tokens, latency, retries, parse outcome
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS llm_calls (
+                    call_id {"SERIAL PRIMARY KEY" if "postgresql" in self.db_url else "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    stage VARCHAR(32),
+                    call_site VARCHAR(64),
+                    model VARCHAR(128),
+                    input_tokens INTEGER,
+                    output_tokens INTEGER,
+                    cache_read_tokens INTEGER,
+                    cache_write_tokens INTEGER,
+                    latency_ms INTEGER,
+                    retries INTEGER,
+                    parse_ok BOOLEAN,
+                    response_cached BOOLEAN,
+                    created_at TIMESTAMP
+                );
+            """))
+            
+            # Provider batch jobs awaiting collection; items maps each custom_id to what its result is for
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS llm_batches (
+                    batch_id VARCHAR(128) PRIMARY KEY,
+                    stage VARCHAR(32) NOT NULL,
+                    status VARCHAR(16) NOT NULL,
+                    items TEXT NOT NULL,
+                    submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed_at TIMESTAMP
+                );
+            """))
+            
             # Indexes (Postgres/SQLite syntax slightly different for IF NOT EXISTS on indexes)
             # We'll skip explicit index creation in this raw SQL block to avoid errors, 
             # or wrap in try/except.
@@ -121,27 +187,124 @@ class DatabaseManager:
                 pass # Index likely exists
 
             conn.commit()
+        
+        self._add_missing_columns("listings", {"raw_description": "TEXT", "canonical_url": "TEXT"})
+        with self.engine.connect() as conn:
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_listings_canonical_url ON listings(canonical_url);"))
+            conn.commit()
+        self._rekey_careers_cache()
             
         logger.info(f"Database initialized at {self.db_url}")
     
+    def _add_missing_columns(self, table: str, columns: Dict[str, str]):
+        """Bring tables created by older versions up to date (CREATE TABLE IF NOT EXISTS won't)."""
+        existing = {column['name'] for column in inspect(self.engine).get_columns(table)}
+        with self.engine.connect() as conn:
+            for name, column_type in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"))
+            conn.commit()
+    
+    def _rekey_careers_cache(self):
+        """
+        Move careers cache rows saved under a raw company name to the normalized
+        key lookups use. Where both exist, the more recently verified row wins.
+        """
+        with self.engine.connect() as conn:
+            rows = [dict(row._mapping) for row in conn.execute(text("SELECT company, last_verified FROM company_careers_cache"))]
+            current = {row['company']: row for row in rows}
+            for row in rows:
+                key = normalize_company_name(row['company'])
+                if key == row['company'] or row['company'] not in current:
+                    continue
+                existing = current.get(key)
+                params = {"company": row['company'], "key": key}
+                if existing is None or self._verified_after(row, existing):
+                    conn.execute(text("DELETE FROM company_careers_cache WHERE company = :key"), params)
+                    conn.execute(text("UPDATE company_careers_cache SET company = :key WHERE company = :company"), params)
+                    current[key] = current.pop(row['company'])
+                else:
+                    conn.execute(text("DELETE FROM company_careers_cache WHERE company = :company"), params)
+                    current.pop(row['company'])
+            conn.commit()
+
+    @classmethod
+    def _verified_after(cls, row: Dict, other: Dict) -> bool:
+        verified, other_verified = cls._parse_timestamp(row['last_verified']), cls._parse_timestamp(other['last_verified'])
+        if verified is None or other_verified is None:
+            return other_verified is None and verified is not None
+        return cls._as_utc(verified) > cls._as_utc(other_verified)
+
     def generate_job_id(self, url: str) -> str:
         return hashlib.md5(url.encode()).hexdigest()[:12]
     
     def is_duplicate(self, url: str) -> bool:
+        # Match on canonical_url, and on url for rows saved before that column existed
+        with self.engine.connect() as conn:
+            return self._url_exists(conn, url)
+
+    def _url_exists(self, conn, url: str) -> bool:
+        result = conn.execute(
+            text("SELECT job_id FROM listings WHERE canonical_url = :canonical OR url IN (:url, :canonical)"),
+            {"url": url, "canonical": canonicalize_url(url)}
+        )
+        return result.fetchone() is not None
+
+    def warm_url_filter(self, capacity: Optional[int] = None) -> BloomFilter:
+        """Build the Bloom filter of canonical URLs from every listing (streamed, one round trip)."""
         with self.engine.connect() as conn:
-            result = conn.execute(text("SELECT job_id FROM listings WHERE url = :url"), {"url": url})
-            return result.fetchone() is not None
+            total = conn.execute(text("SELECT COUNT(*) FROM listings")).scalar() or 0
+            url_filter = BloomFilter(capacity=capacity or max(total * 2, 10000))
+            result = conn.execution_options(stream_results=True).execute(text("SELECT url, canonical_url FROM listings"))
+            for url, canonical in result:
+                url_filter.add(canonical or canonicalize_url(url))
+        self.url_filter = url_filter
+        logger.info(f"URL filter warmed with {total} listings")
+        return url_filter
+
+    def existing_urls(self, urls: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of `urls` already stored as listings, comparing canonical forms.
+        Costs one query per BULK_QUERY_CHUNK candidates; with the URL filter enabled,
+        URLs it rules out never reach the database.
+        """
+        urls = list(urls)
+        if self.use_url_filter and self.url_filter is None:
+            self.warm_url_filter()
+
+        by_form: Dict[str, List[str]] = {}
+        for url in urls:
+            canonical = canonicalize_url(url)
+            if self.url_filter is not None and canonical not in self.url_filter:
+                continue # Definitely new
+            for form in {url, canonical}:
+                by_form.setdefault(form, []).append(url)
+
+        if not by_form:
+            return set()
+
+        query = text("SELECT url, canonical_url FROM listings WHERE canonical_url IN :urls OR url IN :urls").bindparams(
+            bindparam("urls", expanding=True))
+        forms = list(by_form)
+        found: Set[str] = set()
+        with self.engine.connect() as conn:
+            for i in range(0, len(forms), self.BULK_QUERY_CHUNK):
+                result = conn.execute(query, {"urls": forms[i:i + self.BULK_QUERY_CHUNK]})
+                for stored in result:
+                    for form in stored:
+                        found.update(by_form.get(form, []))
+        return found
     
     def save_listing(self, url: str, company: str, role: str, description: str, source: str, **kwargs) -> Optional[str]:
-        if self.is_duplicate(url):
-            return None
-        
-        job_id = self.generate_job_id(url)
+        # The original URL is kept for fetching; the canonical form is the dedupe key
+        canonical_url = canonicalize_url(url)
+        job_id = self.generate_job_id(canonical_url)
         
         # Prepare params
         params = {
             "job_id": job_id,
             "url": url,
+            "canonical_url": canonical_url,
             "company": company,
             "role": role,
             "description": description,
@@ -150,27 +313,94 @@ class DatabaseManager:
             "job_type": kwargs.get("job_type"),
             "date_posted": kwargs.get("date_posted"),
             "company_careers_url": kwargs.get("company_careers_url"),
-            "careers_page_verified": kwargs.get("careers_page_verified", False)
+            "careers_page_verified": kwargs.get("careers_page_verified", False),
+            "raw_description": kwargs.get("raw_description")
         }
         
         query = text("""
             INSERT INTO listings (
-                job_id, url, company, role, description, source, location, job_type, 
-                date_posted, company_careers_url, careers_page_verified
+                job_id, url, canonical_url, company, role, description, source, location, job_type, 
+                date_posted, company_careers_url, careers_page_verified, raw_description
             ) VALUES (
-                :job_id, :url, :company, :role, :description, :source, :location, :job_type,
-                :date_posted, :company_careers_url, :careers_page_verified
+                :job_id, :url, :canonical_url, :company, :role, :description, :source, :location, :job_type,
+                :date_posted, :company_careers_url, :careers_page_verified, :raw_description
             )
         """)
         
+        signature = fingerprint.minhash(description) if self.near_duplicate_threshold else []
+        
         try:
+            # Duplicate check and insert share one connection
             with self.engine.connect() as conn:
+                if self._url_exists(conn, url):
+                    return None
                 conn.execute(query, params)
+                if signature:
+                    self._link_near_duplicate(conn, job_id, signature)
                 conn.commit()
-            return job_id
+        except IntegrityError:
+            # Lost a race with a concurrent insert of the same URL
+            return None
         except Exception as e:
             logger.error(f"Failed to save listing: {e}")
             return None
+        
+        if self.url_filter is not None:
+            self.url_filter.add(canonical_url)
+        return job_id
+
+    def _link_near_duplicate(self, conn, job_id: str, signature: List[int]):
+        """
+        Store the listing's fingerprint. If an indexed listing is similar enough,
+        link to its canonical listing and mark this one 'near_duplicate' so it is
+        never queued for analysis; otherwise index its LSH buckets.
+        """
+        buckets = fingerprint.lsh_buckets(signature)
+        candidates = conn.execute(
+            text("""
+                SELECT DISTINCT f.job_id, f.signature, f.canonical_job_id
+                FROM listing_lsh_buckets b
+                JOIN listing_fingerprints f ON f.job_id = b.job_id
+                WHERE b.bucket IN :buckets
+            """).bindparams(bindparam("buckets", expanding=True)),
+            {"buckets": buckets}
+        ).fetchall()
+        
+        best_id, best_score = None, 0.0
+        for candidate_id, encoded, canonical_id in candidates:
+            score = fingerprint.similarity(signature, fingerprint.decode_signature(encoded))
+            if score > best_score:
+                best_id, best_score = canonical_id or candidate_id, score
+        
+        if best_id and best_score >= self.near_duplicate_threshold:
+            conn.execute(text("""
+                INSERT INTO listing_fingerprints (job_id, signature, canonical_job_id, similarity)
+                VALUES (:job_id, :signature, :canonical, :similarity)
+            """), {"job_id": job_id, "signature": fingerprint.encode_signature(signature), "canonical": best_id, "similarity": best_score})
+            conn.execute(text("""
+                UPDATE listings SET application_status = 'near_duplicate', notes = :notes
+                WHERE job_id = :job_id
+            """), {"job_id": job_id, "notes": f"Near-duplicate of {best_id} (similarity {best_score:.2f})"})
+            logger.info(f"Listing {job_id} is a near-duplicate of {best_id} ({best_score:.2f})")
+            return
+        
+        conn.execute(text("""
+            INSERT INTO listing_fingerprints (job_id, signature) VALUES (:job_id, :signature)
+        """), {"job_id": job_id, "signature": fingerprint.encode_signature(signature)})
+        # Only canonical listings are indexed, which keeps the bucket table small
+        conn.execute(
+            text("INSERT INTO listing_lsh_buckets (bucket, job_id) VALUES (:bucket, :job_id)"),
+            [{"bucket": bucket, "job_id": job_id} for bucket in buckets]
+        )
+
+    def get_canonical_job_id(self, job_id: str) -> Optional[str]:
+        """Return the listing a near-duplicate was linked to, or None."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT canonical_job_id FROM listing_fingerprints WHERE job_id = :job_id"),
+                {"job_id": job_id}
+            ).fetchone()
+            return row[0] if row else None
 
     def get_recent_unprocessed_listings(self, days: int = 15, limit: int = 50) -> List[Dict]:
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
@@ -188,6 +418,33 @@ class DatabaseManager:
             # Convert rows to dicts
             return [dict(row._mapping) for row in result]
 
+    def get_unprocessed_job_ids(self, max_age_days: Optional[float] = None) -> List[str]:
+        """Every listing still waiting for analysis (newest first); ids only, so the whole queue is cheap to rank."""
+        query = "SELECT job_id FROM listings WHERE application_status = 'new'"
+        params = {}
+        if max_age_days is not None:
+            query += " AND date_found > :cutoff_date"
+            params["cutoff_date"] = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        query += " ORDER BY date_found DESC"
+        with self.engine.connect() as conn:
+            return [row[0] for row in conn.execute(text(query), params)]
+
+    def get_listings(self, job_ids: Iterable[str], status: Optional[str] = None) -> List[Dict]:
+        """Fetch listings by id in the order given, one query per BULK_QUERY_CHUNK ids; optionally only those in `status`."""
+        job_ids = list(job_ids)
+        sql = "SELECT * FROM listings WHERE job_id IN :job_ids"
+        if status is not None:
+            sql += " AND application_status = :status"
+        query = text(sql).bindparams(bindparam("job_ids", expanding=True))
+
+        rows: Dict[str, Dict] = {}
+        with self.engine.connect() as conn:
+            for start in range(0, len(job_ids), self.BULK_QUERY_CHUNK):
+                chunk = job_ids[start:start + self.BULK_QUERY_CHUNK]
+                for row in conn.execute(query, {"job_ids": chunk, "status": status}):
+                    rows[row.job_id] = dict(row._mapping)
+        return [rows[job_id] for job_id in job_ids if job_id in rows]
+
     def update_fit_score(self, job_id: str, score: float, notes: str = ""):
         query = text("""
             UPDATE listings
@@ -208,6 +465,20 @@ class DatabaseManager:
             conn.execute(query, {"status": status, "job_id": job_id})
             conn.commit()
 
+    def update_application_statuses(self, job_ids: Iterable[str], status: str):
+        """Set the same status on many listings in one transaction."""
+        query = text("""
+            UPDATE listings
+            SET application_status = :status, updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = :job_id
+        """)
+        params = [{"status": status, "job_id": job_id} for job_id in job_ids]
+        if not params:
+            return
+        with self.engine.connect() as conn:
+            conn.execute(query, params)
+            conn.commit()
+
     def save_application(self, job_id: str, resume_version: str, cover_letter_version: str, tribunal_score: float, user_approved: bool = False) -> str:
         import uuid
         application_id = str(uuid.uuid4())[:12]
@@ -233,6 +504,48 @@ class DatabaseManager:
             conn.commit()
         return application_id
 
+    def get_applications(self, statuses: Optional[Iterable[str]] = None, application_ids: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Applications joined with their listing's company, role and description."""
+        sql = """
+            SELECT a.*, l.company, l.role, l.description
+            FROM applications a
+            JOIN listings l ON a.job_id = l.job_id
+            WHERE 1 = 1
+        """
+        params = {}
+        if statuses is not None:
+            sql += " AND a.status IN :statuses"
+            params["statuses"] = list(statuses)
+        if application_ids is not None:
+            sql += " AND a.application_id IN :application_ids"
+            params["application_ids"] = list(application_ids)
+        query = text(sql)
+        for name in params:
+            query = query.bindparams(bindparam(name, expanding=True))
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(query, params)]
+
+    def set_application_status(self, application_id: str, status: str):
+        query = text("UPDATE applications SET status = :status WHERE application_id = :app_id")
+        with self.engine.connect() as conn:
+            conn.execute(query, {"status": status, "app_id": application_id})
+            conn.commit()
+
+    def update_application_review(self, application_id: str, score: float, feedback: str, resume_version: str, cover_letter_version: str):
+        query = text("""
+            UPDATE applications
+            SET status = 'reviewed',
+                tribunal_final_score = :score,
+                feedback = :feedback,
+                resume_version = :resume,
+                cover_letter_version = :cl
+            WHERE application_id = :app_id
+        """)
+        with self.engine.connect() as conn:
+            conn.execute(query, {"score": score, "feedback": feedback, "resume": resume_version,
+                                 "cl": cover_letter_version, "app_id": application_id})
+            conn.commit()
+
     def mark_application_submitted(self, application_id: str):
         query = text("""
             UPDATE applications
@@ -246,6 +559,8 @@ class DatabaseManager:
     def cache_company_careers_url(self, company: str, careers_url: str, is_valid: bool = True, notes: str = ""):
         # Upsert logic differs between SQLite and Postgres.
         # For simplicity, we'll try update, if 0 rows, then insert.
+        # Entries are keyed on the normalized name so "Acme, Inc." and "Acme" share one.
+        key = normalize_company_name(company)
         
         with self.engine.connect() as conn:
             # Try Update
@@ -253,23 +568,73 @@ class DatabaseManager:
                 UPDATE company_careers_cache 
                 SET careers_url = :url, is_valid = :valid, verification_notes = :notes, last_verified = CURRENT_TIMESTAMP
                 WHERE company = :company
-            """), {"url": careers_url, "valid": is_valid, "notes": notes, "company": company})
+            """), {"url": careers_url, "valid": is_valid, "notes": notes, "company": key})
             
             if result.rowcount == 0:
                 # Insert
                 conn.execute(text("""
                     INSERT INTO company_careers_cache (company, careers_url, is_valid, verification_notes, last_verified)
                     VALUES (:company, :url, :valid, :notes, CURRENT_TIMESTAMP)
-                """), {"company": company, "url": careers_url, "valid": is_valid, "notes": notes})
+                """), {"company": key, "url": careers_url, "valid": is_valid, "notes": notes})
             
             conn.commit()
 
-    def get_cached_careers_url(self, company: str) -> Optional[str]:
-        query = text("SELECT careers_url FROM company_careers_cache WHERE company = :company AND is_valid = :valid")
+    @staticmethod
+    def _parse_timestamp(value) -> Optional[datetime]:
+        """TIMESTAMP columns come back as datetime (Postgres) or text (SQLite)."""
+        if value is None or isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        # CURRENT_TIMESTAMP is UTC in SQLite and (by default) server time in Postgres; naive values are taken as UTC
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+    @classmethod
+    def _is_fresh(cls, row: Dict, positive_ttl_days: Optional[float], negative_ttl_days: Optional[float]) -> bool:
+        """Positive and negative entries expire on their own TTLs (None = never expires)."""
+        ttl_days = positive_ttl_days if row['is_valid'] else negative_ttl_days
+        if ttl_days is None:
+            return True
+        verified = cls._parse_timestamp(row['last_verified'])
+        if verified is None:
+            return False
+        return datetime.now(timezone.utc) - cls._as_utc(verified) < timedelta(days=ttl_days)
+
+    def prefetch_careers_cache(self, companies: Iterable[str], positive_ttl_days: Optional[float] = 30, negative_ttl_days: Optional[float] = 7) -> Dict[str, Optional[Dict]]:
+        """
+        Load fresh cache entries for a batch of companies in one query.
+        Returns {normalized name: entry or None}; None means "not cached, go probe".
+        Each entry has careers_url, is_valid and last_verified.
+        """
+        keys = {normalize_company_name(c) for c in companies if c}
+        entries: Dict[str, Optional[Dict]] = {key: None for key in keys}
+        if not keys:
+            return entries
+        
+        query = text("""
+            SELECT company, careers_url, is_valid, last_verified FROM company_careers_cache
+            WHERE company IN :companies
+        """).bindparams(bindparam("companies", expanding=True))
         with self.engine.connect() as conn:
-            result = conn.execute(query, {"company": company, "valid": True})
-            row = result.fetchone()
-            return row[0] if row else None
+            for row in conn.execute(query, {"companies": list(keys)}):
+                entry = dict(row._mapping)
+                entry['is_valid'] = bool(entry['is_valid'])
+                if self._is_fresh(entry, positive_ttl_days, negative_ttl_days):
+                    entries[entry.pop('company')] = entry
+        return entries
+
+    def get_careers_cache_entry(self, company: str, positive_ttl_days: Optional[float] = 30, negative_ttl_days: Optional[float] = 7) -> Optional[Dict]:
+        """Fresh cache entry (positive or negative) for one company, or None on a miss."""
+        return self.prefetch_careers_cache([company], positive_ttl_days, negative_ttl_days).get(normalize_company_name(company))
+
+    def get_cached_careers_url(self, company: str, max_age_days: Optional[float] = None) -> Optional[str]:
+        entry = self.get_careers_cache_entry(company, positive_ttl_days=max_age_days)
+        return entry['careers_url'] if entry and entry['is_valid'] else None
 
     def audit_log(self, job_id: Optional[str], action: str, details: str = ""):
         query = text("INSERT INTO audit_log (job_id, action, details) VALUES (:job_id, :action, :details)")
@@ -277,5 +642,40 @@ class DatabaseManager:
             conn.execute(query, {"job_id": job_id, "action": action, "details": details})
             conn.commit()
 
+    def save_llm_calls(self, records: List[Dict]):
+        """Persist LLMMetrics records in one transaction."""
+        if not records:
+            return
+        query = text("""
+            INSERT INTO llm_calls (stage, call_site, model, input_tokens, output_tokens, cache_read_tokens,
+                                   cache_write_tokens, latency_ms, retries, parse_ok, response_cached, created_at)
+            VALUES (:stage, :call_site, :model, :input_tokens, :output_tokens, :cache_read_tokens,
+                    :cache_write_tokens, :latency_ms, :retries, :parse_ok, :response_cached, :created_at)
+        """)
+        with self.engine.connect() as conn:
+            conn.execute(query, records)
+            conn.commit()
+
+    def save_llm_batch(self, batch_id: str, stage: str, items: Dict[str, object]):
+        """Checkpoint a submitted provider batch so a later run (or process) can collect it."""
+        query = text("INSERT INTO llm_batches (batch_id, stage, status, items) VALUES (:batch_id, :stage, 'pending', :items)")
+        with self.engine.connect() as conn:
+            conn.execute(query, {"batch_id": batch_id, "stage": stage, "items": json.dumps(items)})
+            conn.commit()
+
+    def get_pending_llm_batches(self, stage: str) -> List[Dict]:
+        query = text("SELECT * FROM llm_batches WHERE stage = :stage AND status = 'pending' ORDER BY submitted_at")
+        with self.engine.connect() as conn:
+            rows = [dict(row._mapping) for row in conn.execute(query, {"stage": stage})]
+        for row in rows:
+            row['items'] = json.loads(row['items'])
+        return rows
+
+    def complete_llm_batch(self, batch_id: str, status: str = "applied"):
+        query = text("UPDATE llm_batches SET status = :status, completed_at = CURRENT_TIMESTAMP WHERE batch_id = :batch_id")
+        with self.engine.connect() as conn:
+            conn.execute(query, {"status": status, "batch_id": batch_id})
+            conn.commit()
+
     def close(self):
         self.engine.dispose()
@@ -3,6 +3,7 @@ import os
 import yaml
 import time
 import schedule
+from typing import Dict
 import sentry_sdk
 from dotenv import load_dotenv
 from db.manager import DatabaseManager
@@ -40,7 +41,11 @@ class BurnsBarometer:
     
     def __init__(self, config_path: str = "config.yaml"):
         self.config = self._load_config(config_path)
-        self.db = DatabaseManager()
+        db_config = self.config.get('database', {})
+        self.db = DatabaseManager(
+            use_url_filter=db_config.get('url_bloom_filter', False),
+            near_duplicate_threshold=db_config.get('near_duplicate_threshold', 0.85)
+        )
         try:
             self.llm = LLMClient(config_path)
             logger.info("LLM Client initialized successfully.")
@@ -111,10 +116,49 @@ class BurnsBarometer:
             logger.error(f"Cycle failed: {e}")
             sentry_sdk.capture_exception(e)
         
+        if self.llm:
+            self._report_llm_usage()
+            for call_site, stats in self.llm.cache_summary().items():
+                logger.info(
+                    f"LLM cache [{call_site}]: {stats['hits']} hits / {stats['misses']} misses "
+                    f"({stats['hit_rate']:.0%}), ~{stats['tokens_saved']:,} tokens saved"
+                )
+        
         logger.info("=== Burns Barometer Cycle Complete ===")
     
+    def _jobs_processed(self) -> Dict[str, int]:
+        """Jobs each stage handled this cycle, for tokens-per-job figures."""
+        jobs = {}
+        if self.scout:
+            jobs['scout'] = self.scout.stats['scraped_listings']
+        if self.barometer:
+            stats = self.barometer.stats
+            jobs['barometer'] = stats['prescore_rejected'] + stats['prescore_accepted'] + stats['llm_analyzed']
+        if self.mirror:
+            jobs['mirror'] = self.mirror.processed
+        if self.tribunal:
+            jobs['tribunal'] = self.tribunal.processed
+        return jobs
+
+    def _report_llm_usage(self):
+        """Flush per-call LLM records to llm_calls and log latency/token figures per stage."""
+        try:
+            self.db.save_llm_calls(self.llm.metrics.drain())
+        except Exception as e:
+            logger.error(f"Failed to save LLM call metrics: {e}")
+        for stage, stats in self.llm.metrics.summary(self._jobs_processed()).items():
+            per_job = f"{stats['tokens_per_job']:,.0f} tokens/job" if stats['tokens_per_job'] is not None else "no jobs"
+            logger.info(
+                f"LLM [{stage}]: {stats['calls']} calls, p50 {stats['p50_latency']:.2f}s / p95 {stats['p95_latency']:.2f}s, "
+                f"{stats['input_tokens']:,} in + {stats['cache_read_tokens']:,} cached + {stats['output_tokens']:,} out, "
+                f"{per_job}, {stats['retries']} retries, {stats['parse_failures']} parse failures"
+            )
+        self.llm.metrics.reset()
+
     def cleanup(self):
         """Close all connections."""
+        if self.scout:
+            self.scout.close()
         self.db.close()
 
 def job():
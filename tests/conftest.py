@@ -1,7 +1,11 @@
 import pytest
 import os
+import json
 import sys
 import sqlite3
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add project root to Python path so we can import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,7 +16,7 @@ from db.manager import DatabaseManager
 def db_manager(tmp_path):
     """Create a temporary database for testing."""
     db_path = tmp_path / "test_jobs.db"
-    manager = DatabaseManager(str(db_path))
+    manager = DatabaseManager(f"sqlite:///{db_path}")
     yield manager
     manager.close()
 
@@ -20,10 +24,122 @@ def db_manager(tmp_path):
 def mock_llm_client():
     """Mock LLM client for testing."""
     class MockLLM:
-        def generate(self, system, user):
+        def generate(self, system, user, **kwargs):
             return "Mocked response"
         
-        def generate_structured(self, system, user, schema):
+        def generate_structured(self, system, user, schema, **kwargs):
             return {"score": 85.0, "feedback": "Good match", "company": "TestCorp", "role": "TestRole"}
             
     return MockLLM()
+
+@pytest.fixture
+def http_server():
+    """
+    Local HTTP stand-in. Register canned responses with
+    server.routes[path] = (status, headers, body); every request is logged in server.requests.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def _respond(self, send_body=True):
+            self.server.requests.append((self.command, self.path, dict(self.headers)))
+            route = self.server.routes.get(self.path)
+            if callable(route):
+                route = route(self)
+            status, headers, body = route or (404, {}, b"Not Found")
+            if isinstance(body, str):
+                body = body.encode()
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self._respond()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.body = self.rfile.read(length) if length else b""
+            self._respond()
+
+        def do_HEAD(self):
+            self._respond(send_body=False)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.routes = {}
+    server.requests = []
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def batch_server(http_server):
+    """
+    Local stand-in for the Anthropic Message Batches API, on http_server.
+    A batch reports 'in_progress' for its first `server.polls_until_ended`
+    retrievals, then 'ended'. Each request is answered by
+    `server.respond(custom_id, params)`, returning the reply text or None for
+    an errored request. Submitted requests are kept in server.batches.
+    """
+    http_server.batches = {}
+    http_server.polls_until_ended = 1
+    http_server.respond = lambda custom_id, params: '{"score": 70}'
+
+    def now():
+        return datetime.now(timezone.utc).isoformat()
+
+    def result(custom_id, params):
+        text = http_server.respond(custom_id, params)
+        if text is None:
+            return {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": "boom"}}}
+        message = {"id": f"msg_{custom_id}", "type": "message", "role": "assistant", "model": params["model"],
+                   "content": [{"type": "text", "text": text}], "stop_reason": "end_turn", "stop_sequence": None,
+                   "usage": {"input_tokens": 40, "output_tokens": 10}}
+        return {"type": "succeeded", "message": message}
+
+    def describe(batch_id):
+        batch = http_server.batches[batch_id]
+        ended = batch["polls"] > http_server.polls_until_ended
+        if ended and batch["ended_at"] is None:
+            batch["ended_at"] = now()
+        body = {
+            "id": batch_id, "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0 if ended else len(batch["requests"]), "succeeded": 0,
+                               "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": batch["created_at"], "expires_at": batch["created_at"], "ended_at": batch["ended_at"],
+            "archived_at": None, "cancel_initiated_at": None,
+            "results_url": f"{http_server.base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+        return 200, {"Content-Type": "application/json"}, json.dumps(body)
+
+    def retrieve(batch_id):
+        def handler(request):
+            http_server.batches[batch_id]["polls"] += 1
+            return describe(batch_id)
+        return handler
+
+    def results(batch_id):
+        def handler(request):
+            lines = [json.dumps({"custom_id": r["custom_id"], "result": result(r["custom_id"], r["params"])})
+                     for r in http_server.batches[batch_id]["requests"]]
+            return 200, {"Content-Type": "application/binary"}, "\n".join(lines)
+        return handler
+
+    def create(request):
+        batch_id = f"msgbatch_{len(http_server.batches) + 1}"
+        requests = json.loads(request.body)["requests"]
+        http_server.batches[batch_id] = {"requests": requests, "polls": 0, "created_at": now(), "ended_at": None}
+        http_server.routes[f"/v1/messages/batches/{batch_id}"] = retrieve(batch_id)
+        http_server.routes[f"/v1/messages/batches/{batch_id}/results"] = results(batch_id)
+        return describe(batch_id)
+
+    http_server.routes["/v1/messages/batches"] = create
+    return http_server
@@ -1,6 +1,14 @@
+import json
+import re
+import time
 import pytest
+import yaml
+from sqlalchemy import text
 from agents.barometer import Barometer
 from agents.mirror import Mirror
+from agents.tribunal import Tribunal
+from utils.lexical_scorer import LexicalScorer
+from utils.llm_client import LLMClient, PromptSegment, prompt_text
 
 def test_barometer_analysis(db_manager, mock_llm_client):
     config = {'barometer': {'min_fit_score': 60}}
@@ -34,3 +42,560 @@ def test_mirror_generation(db_manager, mock_llm_client):
     resume, cl = mirror.generate(job)
     assert resume == "Mocked response"
     assert cl == "Mocked response"
+
+def test_scout_search_fans_out_and_caches(tmp_path, monkeypatch, mock_llm_client):
+    from agents import scout as scout_module
+
+    calls = []
+
+    class FakeDDGS:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def text(self, query, max_results=20):
+            calls.append(query)
+            return [{'title': 'PM', 'href': f'https://jobs.lever.co/acme/{len(calls)}', 'body': 'Senior PM'}]
+
+    monkeypatch.setattr(scout_module, "DDGS", FakeDDGS)
+    config = {'scout': {
+        'keywords': ['Staff PM', 'Senior PM'],
+        'locations': ['Remote', 'Seattle, WA'],
+        'rate_limit_seconds': 0,
+        'search_cache_dir': str(tmp_path),
+        'http_cache': {'dir': str(tmp_path / "http")},
+    }}
+
+    scout = scout_module.Scout(None, mock_llm_client, config)
+    assert len(scout.search_web()) == 4
+    assert len(calls) == 4
+
+    # Second pass is served from the on-disk cache
+    scout = scout_module.Scout(None, mock_llm_client, config)
+    assert len(scout.search_web()) == 4
+    assert len(calls) == 4
+    assert scout.search_cache.hits == 4
+
+def test_scout_skips_llm_when_json_ld_is_complete(tmp_path, mock_llm_client):
+    from agents.scout import Scout
+
+    scout = Scout(None, mock_llm_client, {'scout': {'search_cache_dir': str(tmp_path), 'http_cache': {'enabled': False}}})
+    details = {
+        'description': 'Staff PM at Acme',
+        'raw_html': '<script type="application/ld+json">{"@type": "JobPosting", "title": "Staff PM", "hiringOrganization": "Acme"}</script>'
+    }
+    parsed = scout._parse_details("https://acme.com/jobs/1", details)
+    assert (parsed['company'], parsed['role']) == ("Acme", "Staff PM")
+    assert scout.stats['llm_skipped_structured'] == 1
+
+    # Without embedded data the LLM is consulted
+    parsed = scout._parse_details("https://acme.com/jobs/2", {'description': 'text', 'raw_html': '<html></html>'})
+    assert parsed['company'] == "TestCorp"
+    assert scout.stats['llm_parsed'] == 1
+
+def test_validator_honors_negative_cache(db_manager, monkeypatch):
+    from agents.scout import CareerPageValidator
+
+    validator = CareerPageValidator(db_manager)
+    db_manager.cache_company_careers_url("Ghost Co", "", False, "Careers URL not found")
+    monkeypatch.setattr(validator, "_discover", lambda *args: pytest.fail("should not probe"))
+
+    validator.prefetch_cache(["Ghost Co."])
+    assert validator.find_careers_url("Ghost Co.", "https://jobs.lever.co/ghost/1") is None
+
+def test_careers_discovery_races_candidates(db_manager, http_server):
+    import time
+    from agents.scout import CareerPageValidator
+
+    def slow(handler):
+        time.sleep(2)
+        return (200, {}, b"")
+
+    http_server.routes["/acme/careers"] = slow
+    http_server.routes["/acme/jobs"] = (200, {}, b"")
+    config = {'scout': {'careers_url_patterns': [
+        http_server.base_url + "/{slug}/careers",
+        http_server.base_url + "/{slug}/jobs",
+        http_server.base_url + "/{slug}/missing",
+    ]}}
+    validator = CareerPageValidator(db_manager, config=config)
+
+    start = time.monotonic()
+    assert validator.find_careers_url("Acme", None) == http_server.base_url + "/acme/jobs"
+    assert time.monotonic() - start < 1.5
+    assert db_manager.get_cached_careers_url("Acme") == http_server.base_url + "/acme/jobs"
+
+    # A company whose every probe is slow runs out of budget and is not cached
+    http_server.routes["/slowco/careers"] = slow
+    validator.url_patterns = [http_server.base_url + "/{slug}/careers"]
+    validator.discovery_budget_seconds = 0.5
+    assert validator.find_careers_url("SlowCo", None) is None
+    assert db_manager.get_careers_cache_entry("SlowCo") is None
+    validator.close()
+
+def test_careers_snapshot_renders_once_and_revalidates(db_manager, http_server):
+    from contextlib import contextmanager
+    from agents.scout import CareerPageValidator
+
+    class FakePool:
+        renders = 0
+
+        @contextmanager
+        def page(self):
+            pool = self
+
+            class Response:
+                headers = {'etag': '"v1"'}
+
+            class Page:
+                def route(self, pattern, handler):
+                    pass
+
+                def on(self, event, handler):
+                    pass
+
+                def goto(self, url, **kwargs):
+                    pool.renders += 1
+                    return Response()
+
+                def evaluate(self, script):
+                    return 80
+
+                def wait_for_timeout(self, ms):
+                    pass
+
+                def content(self):
+                    return '<ul><li>Staff Product Manager</li><li>Senior Data Engineer (Remote)</li></ul>'
+
+            yield Page()
+
+    pool = FakePool()
+    validator = CareerPageValidator(db_manager, browser_pool=pool)
+    careers_url = http_server.base_url + "/careers"
+
+    assert validator.verify_job_on_careers_page("Staff Product Manager", "Acme", careers_url)
+    assert validator.verify_job_on_careers_page("Senior Data Engineer - Remote", "Acme", careers_url)
+    assert not validator.verify_job_on_careers_page("Head of Sales", "Acme", careers_url)
+    assert pool.renders == 1
+
+    # Once expired, a 304 keeps the snapshot without another render
+    http_server.routes["/careers"] = lambda handler: (
+        (304, {}, b"") if handler.headers.get("If-None-Match") == '"v1"' else (200, {}, b"changed")
+    )
+    validator.snapshots.ttl_seconds = 0
+    assert validator.verify_job_on_careers_page("Staff Product Manager", "Acme", careers_url)
+    assert pool.renders == 1
+    assert validator.snapshots.stats['snapshot_revalidated'] == 1
+
+def test_unchanged_page_skips_llm_parsing(tmp_path, http_server, mock_llm_client):
+    from agents.scout import Scout
+
+    calls = []
+    llm = type("CountingLLM", (), {"generate_structured": lambda self, system, user, schema, **kwargs: calls.append(user) or mock_llm_client.generate_structured(system, user, schema)})()
+    page = b"<html><body><h1>Staff PM</h1>" + b"<p>Own the roadmap for our platform.</p>" * 40 + b"</body></html>"
+    http_server.routes["/jobs/1"] = lambda handler: (
+        (304, {}, b"") if handler.headers.get("If-None-Match") == '"abc"' else (200, {"ETag": '"abc"'}, page)
+    )
+    config = {'scout': {'search_cache_dir': str(tmp_path), 'http_cache': {'dir': str(tmp_path / "http")}}}
+    url = http_server.base_url + "/jobs/1"
+
+    scout = Scout(None, llm, config)
+    details = scout.fetcher.fetch(url)
+    assert not details['unchanged']
+    assert scout._parse_details(url, details)['company'] == "TestCorp"
+    scout.close()
+
+    # A later run revalidates with If-None-Match, gets a 304 and reuses the earlier parse
+    scout = Scout(None, llm, config)
+    details = scout.fetcher.fetch(url)
+    assert details['unchanged'] and "Own the roadmap" in details['description']
+    assert scout._parse_details(url, details)['company'] == "TestCorp"
+    assert len(calls) == 1
+    assert scout.stats['llm_skipped_unchanged'] == 1
+    scout.close()
+
+def test_barometer_prescore_skips_llm_for_clear_misfits(db_manager, tmp_path):
+    from utils.lexical_scorer import LexicalScorer
+
+    calls = []
+
+    class CountingLLM:
+        def generate_structured(self, system, user, schema, **kwargs):
+            calls.append(user)
+            return {"score": 72.0, "reasoning": "ok", "strengths": [], "gaps": []}
+
+    config = {'barometer': {'min_fit_score': 60, 'weight_seniority': 0.3, 'weight_tech_stack': 0.25,
+                            'weight_domain_match': 0.25, 'weight_growth_opportunity': 0.2},
+              'vector_index': {'dir': str(tmp_path / "vectors")}}
+    barometer = Barometer(db_manager, CountingLLM(), config)
+    barometer.prescorer = LexicalScorer({
+        'narratives': [{'name': 'AI Product Manager', 'themes': ['Building multi-agent systems', 'Safety-by-design']}],
+        'technical_competencies': {'high_confidence': ['LangGraph, RAG, pgvector', 'Python, Docker']},
+    }, config['barometer'])
+
+    db_manager.save_listing(
+        url="https://acme.com/jobs/1", company="Acme", role="Senior PM, AI Platform", source="test",
+        description="Senior product manager to own the roadmap for our multi-agent AI platform: RAG, LangGraph, "
+                    "safety guardrails, Python services on Docker. Lead a greenfield launch with executive stakeholders."
+    )
+    db_manager.save_listing(
+        url="https://globex.com/jobs/2", company="Globex", role="Warehouse Associate", source="test",
+        description="Pick, pack and ship orders in our fulfillment center. Must lift 50 lbs and work night shifts."
+    )
+
+    barometer.run_analysis_cycle()
+
+    assert len(calls) == 1 and "Acme" in prompt_text(calls[0])
+    assert barometer.stats['prescore_rejected'] == 1
+    with db_manager.engine.connect() as conn:
+        rows = dict(conn.execute(text("SELECT company, application_status FROM listings")).fetchall())
+    assert rows == {"Acme": "analyzed", "Globex": "analyzed"}
+
+def test_barometer_ranks_backlog_by_narrative_similarity(db_manager, tmp_path):
+    from utils.vector_index import VectorIndex
+
+    analyzed = []
+
+    class RecordingLLM:
+        def generate_structured(self, system, user, schema, **kwargs):
+            analyzed.append(prompt_text(user).split("Company: ")[1].split("\n")[0])
+            return {"score": 70.0}
+
+    config = {'barometer': {'min_fit_score': 60, 'max_jobs_per_cycle': 2, 'prescore': {'enabled': False}},
+              'vector_index': {'dir': str(tmp_path / "vectors")}}
+    barometer = Barometer(db_manager, RecordingLLM(), config)
+    barometer.narrative_vectors = barometer.vector_index.vectorizer.transform(
+        ["AI product manager building multi-agent LLM systems with RAG and safety guardrails"]
+    )
+
+    listings = {
+        "Acme": "Product manager for our multi-agent LLM platform: RAG pipelines, safety guardrails, agent evaluation.",
+        "Globex": "Store manager for a retail location. Staff scheduling, inventory, customer service.",
+        "Initech": "Product manager for LLM features, RAG search and AI safety reviews.",
+    }
+    for company, description in listings.items():
+        db_manager.save_listing(url=f"https://{company.lower()}.com/jobs/1", company=company, role="PM",
+                                description=description, source="test")
+
+    barometer.run_analysis_cycle()
+    # Globex was saved last (newest) but is least similar, so it misses the batch of 2
+    assert sorted(analyzed) == ["Acme", "Initech"]
+
+    # Vectors were appended once and are visible to a fresh reader
+    index = VectorIndex(str(tmp_path / "vectors"))
+    assert len(index) == 3
+    assert barometer.vector_index.add_many([(db_manager.generate_job_id("https://acme.com/jobs/1"), "again")]) == 0
+
+class FakeBatchLLM:
+    """Answers batched Barometer prompts; `drop` and `garble` pick job_ids to leave out or corrupt."""
+
+    def __init__(self, drop=(), garble=()):
+        self.calls = []
+        self.drop, self.garble = set(drop), set(garble)
+
+    def generate_structured(self, system, user, schema, **kwargs):
+        import re
+        self.calls.append(user)
+        job_ids = re.findall(r"job_id: (\S+)", prompt_text(user))
+        if not job_ids:
+            return {"score": 66.0, "reasoning": "single"}
+        results = []
+        for job_id in job_ids:
+            if job_id in self.drop:
+                continue
+            results.append({"job_id": job_id, "score": "n/a" if job_id in self.garble else 81.0, "reasoning": "batched"})
+        return {"results": results}
+
+def _barometer_with_listings(db_manager, tmp_path, llm, count, **batch_config):
+    config = {'barometer': {'min_fit_score': 60, 'prescore': {'enabled': False},
+                            'batch_scoring': {'enabled': True, **batch_config}},
+              'vector_index': {'dir': str(tmp_path / "vectors")}}
+    barometer = Barometer(db_manager, llm, config)
+    barometer.narrative = {"narratives": [{"name": "AI PM"}]}
+    for i in range(count):
+        db_manager.save_listing(url=f"https://acme.com/jobs/{i}", company="Acme", role=f"PM {i}",
+                                description=" ".join(f"duty{i}x{k}" for k in range(60)), source="test")
+    return barometer
+
+def test_barometer_batch_scores_many_listings_per_request(db_manager, tmp_path):
+    llm = FakeBatchLLM()
+    barometer = _barometer_with_listings(db_manager, tmp_path, llm, 5, max_listings_per_request=3)
+
+    barometer.run_analysis_cycle()
+
+    assert len(llm.calls) == 2  # 3 + 2
+    assert barometer.stats['batch_scored'] == 5
+    with db_manager.engine.connect() as conn:
+        scores = [row[0] for row in conn.execute(text("SELECT fit_score FROM listings"))]
+    assert scores == [81.0] * 5
+
+def test_barometer_batch_falls_back_for_missing_or_malformed_records(db_manager, tmp_path):
+    job_ids = [db_manager.generate_job_id(f"https://acme.com/jobs/{i}") for i in range(3)]
+    llm = FakeBatchLLM(drop=[job_ids[0]], garble=[job_ids[1]])
+    barometer = _barometer_with_listings(db_manager, tmp_path, llm, 3)
+
+    scores = barometer.analyze_batch(db_manager.get_recent_unprocessed_listings())
+
+    assert scores == {job_ids[0]: 66.0, job_ids[1]: 66.0, job_ids[2]: 81.0}
+    assert len(llm.calls) == 3  # one batch + two single-job retries
+    assert barometer.stats['batch_fallbacks'] == 2
+
+def test_barometer_batch_size_follows_token_budget(db_manager, tmp_path):
+    barometer = _barometer_with_listings(db_manager, tmp_path, FakeBatchLLM(), 0, max_prompt_tokens=2000)
+    short = [{'job_id': str(i), 'company': 'A', 'role': 'PM', 'description': 'x' * 400} for i in range(6)]
+    long = [{'job_id': str(i), 'company': 'A', 'role': 'PM', 'description': 'x' * 3000} for i in range(6)]
+
+    assert [len(b) for b in barometer.pack_batches(short)] == [6]
+    assert all(len(b) <= 2 for b in barometer.pack_batches(long))
+    assert sum(len(b) for b in barometer.pack_batches(long)) == 6
+
+def test_barometer_batch_requests_carry_the_packed_output_budget(db_manager, tmp_path, monkeypatch, http_server):
+    sent = []
+
+    def messages(handler):
+        body = json.loads(handler.body)
+        sent.append(body["max_tokens"])
+        content = body["messages"][0]["content"]
+        prompt = content if isinstance(content, str) else "".join(block["text"] for block in content)
+        results = [{"job_id": job_id, "score": 81.0, "reasoning": "batched"}
+                   for job_id in re.findall(r"job_id: (\S+)", prompt)]
+        reply = {"id": "msg_1", "type": "message", "role": "assistant", "model": "fake",
+                 "content": [{"type": "text", "text": json.dumps({"results": results})}], "stop_reason": "end_turn",
+                 "stop_sequence": None, "usage": {"input_tokens": 30, "output_tokens": 5}}
+        return 200, {"Content-Type": "application/json"}, json.dumps(reply)
+
+    http_server.routes["/v1/messages"] = messages
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    for caching in (True, False):  # SDK request and LangChain request
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({"llm": {"provider": "anthropic", "model": "fake", "prompt_caching": caching,
+                                                       "base_url": http_server.base_url}}))
+        barometer = _barometer_with_listings(db_manager, tmp_path, LLMClient(str(config_path)), 0,
+                                             max_listings_per_request=8, max_output_tokens=4000)
+        jobs = [{'job_id': f"{caching}-{i}", 'company': 'Acme', 'role': 'PM', 'description': 'duties'} for i in range(8)]
+
+        assert barometer.analyze_batch(jobs) == {job['job_id']: 81.0 for job in jobs}
+    # The client default (1024) would cut a full batch of eight records off mid-JSON
+    assert sent == [4000, 4000]
+
+def test_barometer_drains_queue_past_one_page_within_budget(db_manager, tmp_path):
+    llm = FakeBatchLLM()
+    barometer = _barometer_with_listings(db_manager, tmp_path, llm, 7, max_listings_per_request=1)
+    barometer.page_size = 3
+    barometer.max_workers = 3
+
+    barometer.max_jobs_per_cycle = 5
+    barometer.run_analysis_cycle()
+    assert len(db_manager.get_unprocessed_job_ids()) == 2
+
+    barometer.max_jobs_per_cycle = None
+    barometer.run_analysis_cycle()
+    assert db_manager.get_unprocessed_job_ids() == []
+    assert len(llm.calls) == 7
+
+def test_barometer_counts_only_listings_the_llm_finished_within_budget(db_manager, tmp_path):
+    class SlowLLM(FakeBatchLLM):
+        def generate_structured(self, system, user, schema, **kwargs):
+            time.sleep(0.2)
+            return super().generate_structured(system, user, schema, **kwargs)
+
+    llm = SlowLLM()
+    barometer = _barometer_with_listings(db_manager, tmp_path, llm, 7, max_listings_per_request=1)
+    barometer.page_size = 3
+    barometer.max_workers = 1
+    barometer.max_seconds_per_cycle = 0.3
+
+    barometer.run_analysis_cycle()
+
+    # Units built but cancelled when the budget ran out are not counted
+    assert 0 < len(llm.calls) < 7
+    assert barometer.stats['llm_analyzed'] == len(llm.calls)
+
+def test_barometer_and_mirror_send_static_blocks_first_as_cacheable(db_manager, tmp_path):
+    prompts = []
+
+    class RecordingLLM:
+        def generate_structured(self, system, user, schema, **kwargs):
+            prompts.append(user)
+            return {"score": 70.0}
+
+        def generate(self, system, user, **kwargs):
+            prompts.append(user)
+            return "# Draft"
+
+    llm = RecordingLLM()
+    barometer = Barometer(db_manager, llm, {'vector_index': {'dir': str(tmp_path / "vectors")}})
+    barometer.narrative = {"narratives": [{"name": "AI PM"}]}
+    job = {'job_id': 'j1', 'company': 'Acme', 'role': 'PM', 'description': 'Own the roadmap'}
+    barometer.analyze(job)
+    barometer.analyze_batch([job, {**job, 'job_id': 'j2'}])
+    mirror = Mirror(db_manager, llm)
+    mirror.master_source = "MASTER FACTS"
+    mirror._generate_resume(job)
+    mirror._generate_cover_letter(job, "# Draft")
+
+    for prompt in prompts:
+        assert prompt[0].cacheable and not prompt[-1].cacheable
+        assert "Acme" not in prompt[0].text and "Acme" in prompt_text(prompt)
+    assert prompts[1][0].text.startswith(prompts[0][0].text)  # batched requests share the single-job prefix
+    assert prompts[-2][0] == prompts[-1][0] == PromptSegment(mirror._master_block(), cacheable=True)
+
+class TieredLLM:
+    """Small tier answers from `small_scores`; the large tier always says 75."""
+
+    def __init__(self, small_scores):
+        self.small_scores = small_scores
+        self.calls = []
+        self.garble_large_batches = False
+
+    def generate_structured(self, system, user, schema, tier=None, **kwargs):
+        import re
+        text = prompt_text(user)
+        job_ids = re.findall(r"job_id: (\S+)", text)
+        self.calls.append((tier, len(job_ids) or 1))
+        score = lambda key: self.small_scores[key] if tier == "small" else 75.0
+        if job_ids and tier == "large" and self.garble_large_batches:
+            return {"results": []}
+        if job_ids:
+            return {"results": [{"job_id": j, "score": score(j), "reasoning": tier} for j in job_ids]}
+        company = text.split("Company: ")[1].split("\n")[0]
+        return {"score": score(company), "reasoning": tier}
+
+def test_barometer_cascade_escalates_only_uncertain_scores(db_manager, tmp_path):
+    config = {'barometer': {'min_fit_score': 60, 'prescore': {'enabled': False},
+                            'cascade': {'enabled': True, 'band': 10}},
+              'vector_index': {'dir': str(tmp_path / "vectors")}}
+    llm = TieredLLM({"Far": 20.0, "Close": 55.0, "Strong": 90.0})
+    barometer = Barometer(db_manager, llm, config)
+    for company in ("Far", "Close", "Strong"):
+        barometer.analyze({'job_id': company, 'company': company, 'role': 'PM', 'description': 'Own the roadmap'})
+
+    assert llm.calls == [("small", 1), ("small", 1), ("large", 1), ("small", 1)]
+    assert barometer.stats['cascade_settled'] == 2 and barometer.stats['cascade_escalated'] == 1
+
+    # Batched: one small-tier request for all, one large-tier request for the uncertain ones
+    barometer.batch_scoring = True
+    jobs = [{'job_id': j, 'company': j, 'role': 'PM', 'description': 'Own the roadmap'} for j in ("Far", "Close", "Strong")]
+    llm.calls = []
+    assert barometer.analyze_batch(jobs) == {"Far": 20.0, "Close": 75.0, "Strong": 90.0}
+    assert llm.calls == [("small", 3), ("large", 1)]
+
+    # An escalated job without a final-tier batch answer is retried at the final tier, not the whole cascade
+    llm.garble_large_batches = True
+    llm.calls = []
+    assert barometer.analyze_batch(jobs)["Close"] == 75.0
+    assert llm.calls == [("small", 3), ("large", 1), ("large", 1)]
+
+def _batch_client(tmp_path, monkeypatch, server):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"llm": {"provider": "anthropic", "model": "fake", "base_url": server.base_url}}))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    return LLMClient(str(config_path))
+
+def test_barometer_offline_batches_are_collected_after_a_restart(db_manager, tmp_path, monkeypatch, batch_server):
+    job_ids = [db_manager.generate_job_id(f"https://acme.com/jobs/{i}") for i in range(4)]
+
+    def respond(custom_id, params):
+        prompt = "".join(block["text"] for block in params["messages"][0]["content"])
+        listed = re.findall(r"job_id: (\w+)", prompt) or [job_ids[int(re.search(r"Role: PM (\d+)", prompt).group(1))]]
+        # The first listing is missing from the first answer, so it goes back to the queue
+        results = [{"job_id": job_id, "score": 72, "reasoning": "fit"} for job_id in listed
+                   if job_id != job_ids[0] or len(batch_server.batches) > 1]
+        return json.dumps({"results": results} if len(listed) > 1 else results[0])
+    batch_server.respond = respond
+
+    def status():
+        with db_manager.engine.connect() as conn:
+            return dict(conn.execute(text("SELECT job_id, application_status FROM listings")).fetchall())
+
+    barometer = _barometer_with_listings(db_manager, tmp_path, _batch_client(tmp_path, monkeypatch, batch_server), 4,
+                                         max_listings_per_request=3)
+    barometer.weights['offline_batch'] = {'enabled': True}
+    barometer.offline_batch = True
+    barometer.run_analysis_cycle()
+    assert barometer.stats['offline_submitted'] == 4
+    assert set(status().values()) == {'batch_pending'}
+    assert len(db_manager.get_pending_llm_batches("barometer")) == 1
+
+    # A new process picks the batch up from the DB; the first poll finds it still running
+    restarted = _barometer_with_listings(db_manager, tmp_path, _batch_client(tmp_path, monkeypatch, batch_server), 0)
+    restarted.offline_batch = True
+    restarted.run_analysis_cycle()
+    assert set(status().values()) == {'batch_pending'}
+
+    restarted.run_analysis_cycle()
+    assert restarted.stats['offline_collected'] == 3
+    assert restarted.stats['offline_requeued'] == 1
+    assert restarted.stats['offline_submitted'] == 1  # the requeued listing, in a fresh batch
+    assert status()[job_ids[0]] == 'batch_pending'
+    assert [job_id for job_id, s in status().items() if s == 'analyzed'] == job_ids[1:]
+
+    restarted.run_analysis_cycle()
+    restarted.collect_offline_batches()  # applying a finished batch again changes nothing
+    assert set(status().values()) == {'analyzed'}
+    assert db_manager.get_pending_llm_batches("barometer") == []
+
+def test_tribunal_offline_reviews_requeue_incomplete_applications(db_manager, tmp_path, monkeypatch, batch_server):
+    job_ids = [db_manager.save_listing(url=f"https://acme.com/jobs/{i}", company="Acme", role=f"PM {i}",
+                                       description="Ship AI products", source="test") for i in range(2)]
+    app_ids = [db_manager.save_application(job_id, f"Resume {i}", f"CL {i}", 0) for i, job_id in enumerate(job_ids)]
+    batch_server.respond = lambda custom_id, params: (
+        None if custom_id == f"{app_ids[1]}-1" and len(batch_server.batches) == 1
+        else '{"score": 80, "feedback": "Sharp."}')
+    config = {'tribunal': {'personas': ["Recruiter", "Hiring Manager"], 'min_approval_score': 60,
+                           'offline_batch': {'enabled': True}}}
+
+    Tribunal(db_manager, _batch_client(tmp_path, monkeypatch, batch_server), config).run_review_cycle(None)
+    assert {app['status'] for app in db_manager.get_applications()} == {'review_pending'}
+
+    batch_server.polls_until_ended = 0
+    tribunal = Tribunal(db_manager, _batch_client(tmp_path, monkeypatch, batch_server), config)
+    tribunal.run_review_cycle(None)
+    reviewed = db_manager.get_applications(statuses=('reviewed',))
+    assert [app['application_id'] for app in reviewed] == [app_ids[0]]
+    assert reviewed[0]['tribunal_final_score'] == 80
+    assert reviewed[0]['feedback'] == "**Recruiter**: Sharp.\n\n**Hiring Manager**: Sharp."
+    # The application with a failed persona review went into the next batch
+    assert db_manager.get_applications(application_ids=[app_ids[1]])[0]['status'] == 'review_pending'
+
+    tribunal.run_review_cycle(None)
+    assert {app['status'] for app in db_manager.get_applications()} == {'reviewed'}
+    assert tribunal.processed == 1
+
+def test_barometer_offline_escalation_requeues_listings_when_submit_fails(db_manager, tmp_path, monkeypatch, batch_server):
+    batch_server.polls_until_ended = 0
+    batch_server.respond = lambda custom_id, params: '{"score": 62}'  # within the band: escalate
+    llm = _batch_client(tmp_path, monkeypatch, batch_server)
+    barometer = _barometer_with_listings(db_manager, tmp_path, llm, 2, enabled=False)
+    barometer.offline_batch = True
+    barometer.cascade = True
+    barometer.run_analysis_cycle()
+    assert barometer.stats['offline_submitted'] == 2
+
+    def unavailable(requests):
+        raise RuntimeError("batch API unavailable")
+    monkeypatch.setattr(llm, "submit_batch", unavailable)
+    barometer.collect_offline_batches()
+
+    assert barometer.stats['cascade_escalated'] == 2
+    assert barometer.stats['offline_requeued'] == 2
+    assert sorted(db_manager.get_unprocessed_job_ids()) == sorted(
+        db_manager.generate_job_id(f"https://acme.com/jobs/{i}") for i in range(2))
+    assert db_manager.get_pending_llm_batches("barometer") == []
+
+def test_barometer_prescore_idf_is_fitted_across_the_whole_queue(db_manager, tmp_path):
+    barometer = _barometer_with_listings(db_manager, tmp_path, FakeBatchLLM(), 12)
+    barometer.page_size = 5
+    barometer.prescore_fit_sample = 6
+    barometer.prescorer = LexicalScorer({'narratives': [{'name': 'AI Product Manager'}]}, {}, min_fit_docs=1)
+    fitted = []
+    barometer.prescorer.fit = lambda descriptions: fitted.append(descriptions)
+
+    barometer.run_analysis_cycle()
+
+    # One fit per cycle, on listings sampled from every page rather than the first page only
+    assert len(fitted) == 1 and len(fitted[0]) == 6
+    roles = {int(d.split("x")[0].removeprefix("duty")) for d in fitted[0]}
+    assert max(roles) >= 10
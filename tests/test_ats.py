@@ -0,0 +1,82 @@
+import os
+import pytest
+from utils.ats_extractors import ATSRegistry
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "ats")
+
+def fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+JSON = {"Content-Type": "application/json"}
+
+@pytest.fixture
+def registry(http_server):
+    base = http_server.base_url
+    config = {'scout': {'ats': {'api_bases': {'greenhouse': base, 'lever': base, 'workday': base}}}}
+    return ATSRegistry(config)
+
+def test_greenhouse_job_extraction(http_server, registry):
+    http_server.routes["/v1/boards/acmerobotics/jobs/4012345"] = (200, JSON, fixture("greenhouse_job.json"))
+
+    listing = registry.extract("https://boards.greenhouse.io/acmerobotics/jobs/4012345?gh_src=abc")
+    assert listing['company'] == "Acme Robotics"
+    assert listing['role'] == "Senior Product Manager, AI Platform"
+    assert listing['location'] == "Remote - US"
+    assert listing['date_posted'] == "2026-09-28"
+    assert "Ship LLM-powered workflows" in listing['description']
+    assert "<li>" not in listing['description']
+
+def test_lever_job_extraction(http_server, registry):
+    posting_id = "5c0e8a2f-1b7d-4e0a-9a51-3f1c2d4e5f60"
+    http_server.routes[f"/v0/postings/northwind/{posting_id}"] = (200, JSON, fixture("lever_job.json"))
+
+    listing = registry.extract(f"https://jobs.lever.co/northwind/{posting_id}/apply")
+    assert listing['company'] == "Northwind"
+    assert listing['role'] == "Technical Product Manager"
+    assert listing['job_type'] == "Full-time"
+    assert listing['location'] == "Spokane, WA"
+    assert listing['date_posted'] == "2024-10-01"
+    assert "Run discovery with operators" in listing['description']
+
+def test_workday_job_extraction(http_server, registry):
+    path = "/wday/cxs/globex/Globex_Careers/job/Seattle-WA/Principal-Product-Manager---Data_R-20451"
+    http_server.routes[path] = (200, JSON, fixture("workday_job.json"))
+
+    listing = registry.extract("https://globex.wd5.myworkdayjobs.com/en-US/Globex_Careers/job/Seattle-WA/Principal-Product-Manager---Data_R-20451")
+    assert listing['company'] == "Globex Corporation"
+    assert listing['role'] == "Principal Product Manager - Data"
+    assert listing['job_type'] == "Full time"
+    assert listing['date_posted'] == "2026-10-10"
+
+def test_board_bulk_mode_uses_one_request(http_server, registry):
+    http_server.routes["/v1/boards/acmerobotics/jobs?content=true"] = (200, JSON, fixture("greenhouse_board.json"))
+    urls = [
+        "https://boards.greenhouse.io/acmerobotics/jobs/4012345",
+        "https://boards.greenhouse.io/acmerobotics/jobs/4012399",
+    ]
+
+    class RecordingLimiter:
+        def __init__(self):
+            self.urls = []
+
+        def acquire(self, url):
+            self.urls.append(url)
+
+    limiter = RecordingLimiter()
+    assert registry.prefetch_boards(urls) == 1
+    listings = [registry.extract(url, rate_limiter=limiter) for url in urls]
+
+    assert [l['role'] for l in listings] == ["Senior Product Manager, AI Platform", "Staff Product Manager, Safety"]
+    assert len(http_server.requests) == 1
+    # Served from memory: no politeness wait per lead
+    assert limiter.urls == []
+    assert registry.extract("https://boards.greenhouse.io/other/jobs/1", rate_limiter=limiter) is None
+    # The wait is keyed on the API host that is called, not the job page host
+    assert limiter.urls == [f"{http_server.base_url}/v1/boards/other/jobs/1"]
+
+def test_unknown_urls_and_api_failures_fall_back(http_server, registry):
+    assert registry.match("https://example.com/careers/123") is None
+    assert registry.extract("https://example.com/careers/123") is None
+    # No route registered -> 404 -> caller falls back to scrape + LLM
+    assert registry.extract("https://boards.greenhouse.io/acmerobotics/jobs/999") is None
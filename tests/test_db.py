@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import text
 from db.manager import DatabaseManager
 
 def test_save_listing(db_manager):
@@ -40,6 +41,138 @@ def test_application_workflow(db_manager):
     
     db_manager.mark_application_submitted(app_id)
     
-    cursor = db_manager.conn.cursor()
-    cursor.execute("SELECT status FROM applications WHERE application_id = ?", (app_id,))
-    assert cursor.fetchone()[0] == 'submitted'
+    with db_manager.engine.connect() as conn:
+        status = conn.execute(text("SELECT status FROM applications WHERE application_id = :app_id"),
+                              {"app_id": app_id}).scalar()
+    assert status == 'submitted'
+
+def test_canonical_duplicates_and_bulk_lookup(db_manager):
+    db_manager.use_url_filter = True
+    job_id = db_manager.save_listing(
+        url="http://boards.greenhouse.io/acme/jobs/1/?gh_src=ddg",
+        company="Acme",
+        role="PM",
+        description="Do work",
+        source="test"
+    )
+    assert job_id is not None
+    # The listing keeps the URL it was found at; the canonical form is only the dedupe key
+    with db_manager.engine.connect() as conn:
+        stored = conn.execute(text("SELECT url, canonical_url FROM listings WHERE job_id = :job_id"),
+                              {"job_id": job_id}).one()
+    assert tuple(stored) == ("http://boards.greenhouse.io/acme/jobs/1/?gh_src=ddg",
+                             "https://boards.greenhouse.io/acme/jobs/1")
+    assert db_manager.is_duplicate("https://boards.greenhouse.io/acme/jobs/1")
+    assert db_manager.save_listing(
+        url="https://boards.greenhouse.io/acme/jobs/1",
+        company="Acme", role="PM", description="Do work", source="test"
+    ) is None
+
+    existing = db_manager.existing_urls([
+        "https://boards.greenhouse.io/acme/jobs/1?utm_source=x",
+        "https://boards.greenhouse.io/acme/jobs/2",
+    ])
+    assert existing == {"https://boards.greenhouse.io/acme/jobs/1?utm_source=x"}
+    assert db_manager.url_filter is not None
+
+def test_near_duplicate_listings_are_linked(db_manager):
+    description = " ".join(
+        "Lead the roadmap for our agent platform and partner with research on evaluation tooling".split() * 8
+    ) + " Seattle WA hybrid role with competitive benefits and equity"
+    original = db_manager.save_listing(
+        url="https://boards.greenhouse.io/acme/jobs/1", company="Acme", role="Staff PM",
+        description=description, source="test"
+    )
+    repost = db_manager.save_listing(
+        url="https://www.indeed.com/viewjob?jk=abc", company="Acme", role="Staff PM",
+        description=description + " Apply today", source="test"
+    )
+    unrelated = db_manager.save_listing(
+        url="https://jobs.lever.co/other/1", company="Other", role="Barista",
+        description="Pour coffee, greet customers and keep the espresso machine spotless every morning shift",
+        source="test"
+    )
+
+    assert db_manager.get_canonical_job_id(repost) == original
+    assert db_manager.get_canonical_job_id(unrelated) is None
+
+    queued = {job['job_id'] for job in db_manager.get_recent_unprocessed_listings()}
+    assert queued == {original, unrelated}
+
+def test_careers_cache_ttls_and_normalized_keys(db_manager):
+    db_manager.cache_company_careers_url("Acme, Inc.", "https://acme.com/careers", True, "pattern")
+    db_manager.cache_company_careers_url("Ghost Co", "", False, "not found")
+
+    entry = db_manager.get_careers_cache_entry("ACME")
+    assert entry['careers_url'] == "https://acme.com/careers" and entry['is_valid']
+
+    # Negative entries are returned (not treated as misses) while fresh
+    negative = db_manager.get_careers_cache_entry("Ghost")
+    assert negative is not None and not negative['is_valid']
+    assert db_manager.get_cached_careers_url("Ghost") is None
+
+    # Expired entries read as misses
+    assert db_manager.get_careers_cache_entry("Ghost", negative_ttl_days=0) is None
+    assert db_manager.get_careers_cache_entry("Acme", positive_ttl_days=0) is None
+
+    batch = db_manager.prefetch_careers_cache(["Acme LLC", "Ghost", "Unknown Corp"])
+    assert batch["acme"]['is_valid']
+    assert not batch["ghost"]['is_valid']
+    assert batch["unknown"] is None
+
+def test_older_listings_table_gains_raw_description(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "old.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE listings (
+                job_id VARCHAR(32) PRIMARY KEY, url TEXT UNIQUE NOT NULL, company TEXT NOT NULL,
+                role TEXT NOT NULL, location TEXT, job_type TEXT, description TEXT NOT NULL,
+                date_posted VARCHAR(32), source TEXT, company_careers_url TEXT,
+                careers_page_verified BOOLEAN DEFAULT FALSE, application_status VARCHAR(32) DEFAULT 'new'
+            )
+        """)
+
+    manager = DatabaseManager(f"sqlite:///{db_path}")
+    job_id = manager.save_listing(
+        url="https://acme.com/jobs/1", company="Acme", role="PM", description="Clean body",
+        source="test", raw_description="Nav | Clean body | Footer"
+    )
+    with manager.engine.connect() as conn:
+        row = conn.execute(text("SELECT raw_description FROM listings WHERE job_id = :id"), {"id": job_id}).fetchone()
+    assert row[0] == "Nav | Clean body | Footer"
+    manager.close()
+
+def test_llm_calls_are_persisted(db_manager):
+    record = {'stage': 'barometer', 'call_site': 'barometer_batch', 'model': 'fake', 'input_tokens': 1200,
+              'output_tokens': 300, 'cache_read_tokens': 2000, 'cache_write_tokens': 0, 'latency_ms': 850,
+              'retries': 1, 'parse_ok': True, 'response_cached': False, 'created_at': '2026-01-01T00:00:00'}
+    db_manager.save_llm_calls([record, {**record, 'parse_ok': False}])
+    db_manager.save_llm_calls([])
+
+    with db_manager.engine.connect() as conn:
+        rows = conn.execute(text("SELECT stage, input_tokens, parse_ok FROM llm_calls ORDER BY call_id")).fetchall()
+    assert [tuple(row) for row in rows] == [("barometer", 1200, 1), ("barometer", 1200, 0)]
+
+def test_careers_cache_rows_under_raw_names_are_rekeyed(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    manager = DatabaseManager(db_url)
+    with manager.engine.connect() as conn:
+        # Rows written before keys were normalized
+        conn.execute(text("""
+            INSERT INTO company_careers_cache (company, careers_url, is_valid, last_verified) VALUES
+            ('Acme, Inc.', 'https://acme.com/careers', 1, CURRENT_TIMESTAMP),
+            ('Globex LLC', 'https://old.globex.com/jobs', 1, '2020-01-01 00:00:00'),
+            ('globex', 'https://globex.com/careers', 1, CURRENT_TIMESTAMP)
+        """))
+        conn.commit()
+    manager.close()
+
+    manager = DatabaseManager(db_url)
+    assert manager.get_cached_careers_url("Acme") == "https://acme.com/careers"
+    assert manager.get_cached_careers_url("Globex") == "https://globex.com/careers"
+    with manager.engine.connect() as conn:
+        keys = sorted(row[0] for row in conn.execute(text("SELECT company FROM company_careers_cache")))
+    assert keys == ["acme", "globex"]
+    manager.close()
@@ -0,0 +1,614 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import pytest
+import yaml
+from utils import browser_pool
+from utils.browser_pool import BrowserPool
+from utils.rate_limit import TokenBucket, DomainRateLimiter
+from utils.query_cache import QueryCache
+from utils.page_fetcher import TieredFetcher, TIER_STATIC, TIER_BROWSER
+from utils.structured_data import extract_job_posting, has_required_fields
+from utils.normalize import canonicalize_url
+from utils.bloom import BloomFilter
+from utils.navigation import NavigationProfile
+from utils.http_cache import HttpCache
+from utils.content_extraction import extract_main_content, prompt_chars_saved
+from utils.llm_client import LLMClient, PromptSegment, BatchRequest
+from utils.llm_metrics import LLMMetrics
+
+class FakePage:
+    def on(self, event, handler):
+        pass
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    def new_page(self):
+        return FakePage()
+
+    def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    def close(self):
+        self.connected = False
+
+class FakePlaywright:
+    def __init__(self):
+        self.browsers = []
+        self.chromium = self
+
+    def launch(self, headless=True):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    fake = FakePlaywright()
+    monkeypatch.setattr(browser_pool, "sync_playwright", lambda: fake)
+    return fake
+
+def test_browser_pool_reuses_and_recycles(fake_playwright):
+    pool = BrowserPool({'scout': {'browser_pool': {'max_uses': 2}}})
+
+    for _ in range(3):
+        with pool.page():
+            pass
+
+    # Two pages on the first browser, then a recycle
+    assert len(fake_playwright.browsers) == 2
+    assert pool.stats['recycles'] == 1
+    assert all(c.closed for c in fake_playwright.browsers[0].contexts)
+
+    pool.close()
+    assert not fake_playwright.browsers[1].connected
+
+def test_browser_pool_relaunches_after_crash(fake_playwright):
+    pool = BrowserPool()
+    with pool.page():
+        pass
+
+    fake_playwright.browsers[0].connected = False
+    with pool.page():
+        pass
+
+    assert len(fake_playwright.browsers) == 2
+    assert pool.stats['crashes'] == 1
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    # First token is free, the next two wait ~50ms each
+    assert time.monotonic() - start >= 0.09
+
+def test_domain_rate_limiter_groups_subdomains():
+    limiter = DomainRateLimiter(default_interval=2, overrides={'lever.co': 0.5})
+    assert limiter.bucket_for("https://boards.greenhouse.io/a/jobs/1") is limiter.bucket_for("https://job-boards.greenhouse.io/b")
+    assert limiter.bucket_for("https://jobs.lever.co/acme/1").rate == 2.0
+    assert limiter.bucket_for("https://example.com").rate == 0.5
+
+def test_query_cache_normalizes_and_expires(tmp_path):
+    cache = QueryCache(cache_dir=str(tmp_path), ttl_hours=1)
+    assert cache.get("PM jobs  in Remote") is None
+
+    cache.put("PM jobs  in Remote", [{'url': 'https://jobs.lever.co/acme/1'}])
+    assert cache.get("pm jobs in remote") == [{'url': 'https://jobs.lever.co/acme/1'}]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+    assert cache.get("pm jobs in remote") is None
+    assert list(tmp_path.iterdir()) == []  # the expired file is deleted, not just skipped
+
+    # Entries for queries that are never asked again are pruned when the cache is opened
+    cache.put("old query", [])
+    cache.put("fresh query", [])
+    two_hours_ago = time.time() - 7200
+    os.utime(cache._path("old query"), (two_hours_ago, two_hours_ago))
+    reopened = QueryCache(cache_dir=str(tmp_path), ttl_hours=1)
+    assert [p.name for p in tmp_path.iterdir()] == [os.path.basename(reopened._path("fresh query"))]
+
+class FakeRenderPool:
+    """Stands in for BrowserPool; records every URL that needed a real render."""
+
+    def __init__(self):
+        self.rendered = []
+
+    @contextmanager
+    def page(self):
+        pool = self
+
+        class Page:
+            def route(self, pattern, handler):
+                pass
+
+            def on(self, event, handler):
+                pass
+
+            def goto(self, url, **kwargs):
+                pool.rendered.append(url)
+
+            def evaluate(self, script):
+                return 42
+
+            def wait_for_timeout(self, ms):
+                pass
+
+            def title(self):
+                return "Rendered"
+
+            def inner_text(self, selector):
+                return "Rendered job description " * 50
+
+            def content(self):
+                return "<html></html>"
+
+        yield Page()
+
+def test_tiered_fetcher_prefers_static_and_remembers_domain(http_server):
+    body = "<html><head><title>Staff PM</title></head><body><h1>Staff PM</h1><p>" + "Own the roadmap. " * 60 + "</p></body></html>"
+    http_server.routes["/jobs/1"] = (200, {"Content-Type": "text/html"}, body)
+    http_server.routes["/spa/1"] = (200, {"Content-Type": "text/html"}, '<html><body><div id="root"></div><script src="app.js"></script></body></html>')
+    for page in ("/spa/2", "/spa/3"):
+        http_server.routes[page] = http_server.routes["/spa/1"]
+
+    pool = FakeRenderPool()
+    fetcher = TieredFetcher(pool)
+
+    details = fetcher.fetch(f"{http_server.base_url}/jobs/1")
+    assert details['tier'] == TIER_STATIC
+    assert details['title'] == "Staff PM"
+    assert "Own the roadmap." in details['description']
+
+    # The SPA shell escalates to the browser...
+    assert fetcher.fetch(f"{http_server.base_url}/spa/1")['tier'] == TIER_BROWSER
+    # ...but one miss does not demote the domain; a second in a row does
+    requests_before = len(http_server.requests)
+    assert fetcher.fetch(f"{http_server.base_url}/spa/2")['tier'] == TIER_BROWSER
+    assert len(http_server.requests) == requests_before + 1
+    requests_before = len(http_server.requests)
+    assert fetcher.fetch(f"{http_server.base_url}/spa/3")['tier'] == TIER_BROWSER
+    assert len(http_server.requests) == requests_before
+    assert len(pool.rendered) == 3
+
+    # Once the browser verdict expires static is probed again, and a static hit resets the streak
+    fetcher._browser_until[urlparse(http_server.base_url).netloc] = 0
+    assert fetcher.fetch(f"{http_server.base_url}/jobs/1")['tier'] == TIER_STATIC
+    assert fetcher.stats['static_reprobes'] == 1
+    assert not fetcher.static_misses
+
+def test_extract_job_posting_from_json_ld():
+    html = """<html><head>
+    <meta property="og:site_name" content="Acme Careers">
+    <script type="application/ld+json">{"@context": "https://schema.org", "@graph": [
+        {"@type": "WebSite", "name": "Acme"},
+        {"@type": "JobPosting", "title": "Staff Product Manager",
+         "hiringOrganization": {"@type": "Organization", "name": "Acme Robotics"},
+         "jobLocation": {"@type": "Place", "address": {"addressLocality": "Seattle", "addressRegion": "WA"}},
+         "jobLocationType": "TELECOMMUTE",
+         "employmentType": ["FULL_TIME"], "datePosted": "2026-10-01T08:00:00Z",
+         "description": "&lt;p&gt;Lead the agent platform.&lt;/p&gt;"}
+    ]}</script></head><body></body></html>"""
+
+    posting = extract_job_posting(html)
+    assert posting['company'] == "Acme Robotics"
+    assert posting['role'] == "Staff Product Manager"
+    assert posting['location'] == "Remote; Seattle, WA"
+    assert posting['job_type'] == "FULL_TIME"
+    assert posting['date_posted'] == "2026-10-01"
+    assert posting['description'] == "Lead the agent platform."
+    assert has_required_fields(posting)
+
+def test_extract_job_posting_from_microdata_with_og_company():
+    html = """<html><head><meta property="og:site_name" content="Northwind"></head><body>
+    <div itemscope itemtype="http://schema.org/JobPosting">
+      <h1 itemprop="title">Technical Product Manager</h1>
+      <span itemprop="jobLocation">Spokane, WA</span>
+      <time itemprop="datePosted" datetime="2026-09-12">Sep 12</time>
+    </div></body></html>"""
+
+    posting = extract_job_posting(html)
+    assert posting['role'] == "Technical Product Manager"
+    assert posting['company'] == "Northwind"
+    assert posting['date_posted'] == "2026-09-12"
+
+def test_extract_job_posting_without_markup():
+    assert extract_job_posting("<html><head><meta property='og:title' content='Jobs'></head></html>") == {}
+
+def test_canonicalize_url_collapses_trivial_variants():
+    canonical = "https://boards.greenhouse.io/acme/jobs/123"
+    for variant in (
+        "http://boards.greenhouse.io/acme/jobs/123",
+        "https://boards.greenhouse.io/acme/jobs/123/",
+        "https://boards.greenhouse.io/acme/jobs/123?gh_src=abc123",
+        "https://Boards.Greenhouse.io/acme/jobs/123?utm_source=ddg#apply",
+    ):
+        assert canonicalize_url(variant) == canonical
+
+    assert canonicalize_url("https://www.acme.com/careers?gh_jid=9&b=2&a=1") == "https://acme.com/careers?a=1&b=2&gh_jid=9"
+    assert canonicalize_url("https://jobs.lever.co/acme/5c0e8a2f/apply") == "https://jobs.lever.co/acme/5c0e8a2f"
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    urls = [f"https://jobs.lever.co/acme/{i}" for i in range(1000)]
+    bloom.update(urls)
+
+    assert all(url in bloom for url in urls)
+    false_positives = sum(f"https://example.com/{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+def test_navigation_profile_blocks_subresources_and_waits_for_stable_text():
+    profile = NavigationProfile({'scout': {'navigation': {
+        'timeout_seconds': 20, 'domain_timeouts': {'myworkdayjobs.com': 45}, 'stability_interval_ms': 1
+    }}})
+    assert profile.timeout_ms("https://acme.wd5.myworkdayjobs.com/jobs") == 45000
+    assert profile.timeout_ms("https://acme.com/careers") == 20000
+    # Keys match the host or a parent domain, most specific first
+    profile.ready_selectors = {'greenhouse.io': "#app", 'boards.greenhouse.io': "#app_body"}
+    assert profile.ready_selector("https://boards.greenhouse.io/acme/jobs/1") == "#app_body"
+    assert profile.ready_selector("https://job-boards.greenhouse.io/acme/jobs/1") == "#app"
+    assert profile.ready_selector("https://notgreenhouse.io/jobs") is None
+    profile.ready_selectors = {}
+
+    class Request:
+        def __init__(self, resource_type, url):
+            self.resource_type, self.url = resource_type, url
+
+    class Route:
+        def __init__(self, resource_type, url):
+            self.request = Request(resource_type, url)
+            self.outcome = None
+
+        def abort(self):
+            self.outcome = "aborted"
+
+        def continue_(self):
+            self.outcome = "continued"
+
+    class Response:
+        headers = {'content-length': '2048'}
+
+    class Page:
+        lengths = iter([0, 120, 480, 480, 480, 999])
+
+        def route(self, pattern, handler):
+            self.routes = [Route(t, u) for t, u in [
+                ("document", "https://acme.com/careers"),
+                ("script", "https://acme.com/app.js"),
+                ("image", "https://acme.com/logo.png"),
+                ("script", "https://www.googletagmanager.com/gtm.js"),
+            ]]
+            for route in self.routes:
+                handler(route)
+
+        def on(self, event, handler):
+            self.on_response = handler
+
+        def goto(self, url, wait_until=None, timeout=None):
+            self.wait_until, self.timeout = wait_until, timeout
+            self.on_response(Response())
+            return Response()
+
+        def evaluate(self, script):
+            return next(self.lengths)
+
+        def wait_for_timeout(self, ms):
+            pass
+
+    page = Page()
+    profile.navigate(page, "https://acme.com/careers")
+
+    assert [r.outcome for r in page.routes] == ["continued", "continued", "aborted", "aborted"]
+    assert (page.wait_until, page.timeout) == ("domcontentloaded", 20000)
+    # Settled once the text length held for two polls; the last value was never read
+    assert next(page.lengths) == 999
+    assert profile.stats['nav_bytes'] == 2048
+    assert profile.stats['nav_blocked'] == 2
+
+def test_http_cache_dedupes_content_and_evicts_lru(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=5_000)
+    first = cache.store("https://a.com/1", "same body", {"ETag": '"v1"'})
+    second = cache.store("https://b.com/1", "same body")
+    assert first['content_hash'] == second['content_hash']
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+    assert cache.conditional_headers("https://a.com/1") == {'If-None-Match': '"v1"'}
+    assert cache.store("https://a.com/1", "same body")['unchanged']
+
+    # Incompressible bodies overflow the bound; the least recently used one goes first
+    import os
+    cache.store("https://c.com/1", os.urandom(3000).hex())
+    cache.read("https://a.com/1")
+    cache.store("https://d.com/1", os.urandom(3000).hex())
+    assert cache.lookup("https://c.com/1") is None
+    assert cache.read("https://a.com/1") == "same body"
+    assert cache.stats['http_cache_evicted'] == 1
+
+def test_main_content_extraction_drops_page_chrome():
+    import os
+    from utils.page_fetcher import extract_text
+
+    with open(os.path.join(os.path.dirname(__file__), "fixtures", "pages", "job_with_chrome.html"), encoding="utf-8") as f:
+        html = f.read()
+    _, page_text = extract_text(html)
+    content = extract_main_content(html)
+
+    assert content.startswith("Senior Product Manager, Payments")
+    assert "Own the roadmap for card issuing" in content
+    assert "6+ years of product management" in content
+    for chrome in ("cookies", "Benefits", "Similar jobs", "Staff Product Manager, Identity", "equal opportunity"):
+        assert chrome in page_text
+        assert chrome not in content
+    assert prompt_chars_saved(page_text, content) == 5 * (len(page_text) - len(content))
+
+    # Too little main content -> caller keeps the full page text
+    assert extract_main_content("<html><body><nav><a href='/'>Home</a></nav><p>Short.</p></body></html>") is None
+
+def test_lead_triage_scores_title_and_snippet():
+    from utils.triage import LeadTriage
+
+    triage = LeadTriage({'scout': {
+        'keywords': ['Senior PM', 'AI/ML Product'],
+        'locations': ['Remote', 'Seattle, WA'],
+        'triage': {'min_score': 0.4, 'deprioritize_below': 0.7},
+    }})
+    leads = [
+        {'title': 'Product Manager, Billing', 'snippet': 'Austin, TX', 'url': 'https://a.com/3'},
+        {'title': 'Senior Product Manager, ML Platform', 'snippet': 'Remote (US)', 'url': 'https://a.com/1'},
+        {'title': 'Product Management Intern', 'snippet': 'Remote', 'url': 'https://a.com/2'},
+        {'title': 'Senior PM', 'snippet': 'Seattle. This job is no longer accepting applications.', 'url': 'https://a.com/4'},
+        {'title': 'Warehouse Associate', 'snippet': 'Night shift', 'url': 'https://a.com/5'},
+    ]
+    kept, rejected = triage.triage(leads)
+
+    assert [lead['url'] for lead in kept] == ['https://a.com/1', 'https://a.com/3']
+    assert kept[0]['triage_score'] == 1.0
+    assert kept[1]['triage_score'] < 0.7  # deprioritized, so it comes last
+    assert {lead['url']: reason for lead, reason in rejected} == {
+        'https://a.com/2': 'excluded_term',
+        'https://a.com/4': 'expired',
+        'https://a.com/5': 'low_score',
+    }
+
+def test_llm_client_replays_identical_requests_from_cache(tmp_path, monkeypatch):
+    class FakeChat:
+        def __init__(self):
+            self.calls = 0
+
+        def invoke(self, messages):
+            self.calls += 1
+            reply = '{"score": 70}' if self.calls < 3 else "not json"
+            return type("Reply", (), {"content": reply, "usage_metadata": {"input_tokens": 100, "output_tokens": 20, "total_tokens": 120}})()
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "llm:\n  cache:\n    enabled: true\n"
+        f"    dir: {tmp_path / 'llm'}\n"
+        "    call_sites:\n      mirror_resume: {bypass: true}\n      scout_parse: {ttl_hours: 0}\n"
+    )
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    client = LLMClient(str(config_path))
+    client.llm = FakeChat()
+
+    assert client.generate_structured("sys", "job A", {}, call_site="barometer") == {"score": 70}
+    assert client.generate_structured("sys", "job A", {}, call_site="barometer") == {"score": 70}
+    assert client.llm.calls == 1
+    client.generate("sys", "draft", call_site="mirror_resume")
+    client.generate("sys", "draft", call_site="mirror_resume")
+    assert client.llm.calls == 3  # bypassed site always asks the provider
+
+    # An unparseable answer is not replayed
+    assert client.generate_structured("sys", "job B", {}, call_site="barometer") == {}
+    client.llm.calls = 0
+    client.generate_structured("sys", "job B", {}, call_site="barometer")
+    assert client.llm.calls == 1
+
+    # Expired entries count as misses
+    client.generate("sys", "page", call_site="scout_parse")
+    client.generate("sys", "page", call_site="scout_parse")
+    assert client.llm.calls == 3
+
+    summary = client.cache_summary()
+    assert summary["barometer"]["hits"] == 1 and summary["barometer"]["tokens_saved"] == 120
+    assert summary["scout_parse"]["hit_rate"] == 0.0
+    assert "mirror_resume" not in summary
+    client.cache.close()
+
+def _fake_anthropic(http_server, throttle_first=0, retry_after="0.2", latency=0.05):
+    """Local stand-in for the Messages API: the first `throttle_first` requests get a 429."""
+    state = {"requests": 0, "in_flight": 0, "peak": 0, "times": [], "bodies": []}
+    lock = threading.Lock()
+
+    def messages(handler):
+        with lock:
+            state["requests"] += 1
+            state["times"].append(time.monotonic())
+            state["bodies"].append(json.loads(handler.body))
+            number = state["requests"]
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(latency)
+        with lock:
+            state["in_flight"] -= 1
+        if number <= throttle_first:
+            return 429, {"retry-after": retry_after, "Content-Type": "application/json"}, json.dumps(
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}})
+        body = {"id": f"msg_{number}", "type": "message", "role": "assistant", "model": "fake",
+                "content": [{"type": "text", "text": '{"score": 64}'}], "stop_reason": "end_turn",
+                "stop_sequence": None, "usage": {"input_tokens": 30, "output_tokens": 5,
+                                                 "cache_read_input_tokens": 1800, "cache_creation_input_tokens": 0}}
+        return 200, {"Content-Type": "application/json"}, json.dumps(body)
+
+    http_server.routes["/v1/messages"] = messages
+    return state
+
+def _async_client(tmp_path, monkeypatch, http_server, limits):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"llm": {"provider": "anthropic", "model": "fake",
+                                                   "base_url": http_server.base_url, "rate_limits": limits}}))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    return LLMClient(str(config_path))
+
+async def test_async_llm_client_backs_off_on_throttling_and_honors_retry_after(tmp_path, monkeypatch, http_server):
+    state = _fake_anthropic(http_server, throttle_first=3)
+    client = _async_client(tmp_path, monkeypatch, http_server, {"initial_concurrency": 4, "max_retries": 3})
+
+    results = await asyncio.gather(*(client.agenerate_structured("sys", f"job {i}", {}) for i in range(8)))
+
+    assert results == [{"score": 64}] * 8
+    assert client.limiter.stats["throttled"] == 3
+    assert client.limiter.stats["decreased"] == 1  # one multiplicative cut for the burst of 429s, not three
+    # Nothing was sent while the retry-after pause was in force
+    first_throttle_answered = state["times"][0] + 0.05
+    assert all(t >= first_throttle_answered + 0.2 or t < first_throttle_answered for t in state["times"])
+    assert client.limiter.in_flight == 0
+
+async def test_async_llm_client_grows_concurrency_and_keeps_rpm_budget(tmp_path, monkeypatch, http_server):
+    state = _fake_anthropic(http_server)
+    client = _async_client(tmp_path, monkeypatch, http_server, {"initial_concurrency": 2, "max_concurrency": 3})
+
+    await asyncio.gather(*(client.agenerate("sys", f"job {i}") for i in range(12)))
+    assert state["peak"] <= 3
+    assert client.limiter.limit == 3
+
+    paced = _async_client(tmp_path, monkeypatch, http_server, {"requests_per_minute": 600, "initial_concurrency": 8})
+    paced.limiter.requests._tokens = 0  # start with an empty bucket: one request per 0.1s
+    started = time.monotonic()
+    await asyncio.gather(*(paced.agenerate("sys", f"paced {i}") for i in range(4)))
+    assert time.monotonic() - started >= 0.35
+
+async def test_llm_client_marks_static_prefix_for_provider_prompt_caching(tmp_path, monkeypatch, http_server, caplog):
+    state = _fake_anthropic(http_server)
+    client = _async_client(tmp_path, monkeypatch, http_server, {})
+    prompt = [PromptSegment("NARRATIVE: ...", cacheable=True), PromptSegment("   "), PromptSegment("JOB: Acme")]
+
+    with caplog.at_level("INFO", logger="utils.llm_client"):
+        assert client.generate_structured("sys", prompt, {}, call_site="barometer") == {"score": 64}
+        assert await client.agenerate("sys", prompt, call_site="barometer") == '{"score": 64}'
+
+    for body in state["bodies"]:
+        blocks = body["messages"][0]["content"]
+        assert blocks[0] == {"type": "text", "text": "NARRATIVE: ...", "cache_control": {"type": "ephemeral"}}
+        assert blocks[1]["text"].startswith("JOB: Acme") and "cache_control" not in blocks[1]
+    assert "input tokens: 1,800 cached, 30 uncached" in caplog.text
+
+def test_llm_metrics_record_calls_per_stage(tmp_path, monkeypatch):
+    replies = iter(['{"score": 70}', "no json here", "draft"])
+
+    class FakeChat:
+        def invoke(self, messages):
+            return type("Reply", (), {"content": next(replies), "response_metadata": {},
+                                      "usage_metadata": {"input_tokens": 900, "output_tokens": 100}})()
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("llm:\n  model: fake\n")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    client = LLMClient(str(config_path))
+    client.llm = FakeChat()
+
+    client.generate_structured("sys", "job 1", {}, call_site="barometer")
+    client.generate_structured("sys", "job 2", {}, call_site="barometer_batch")
+    client.generate("sys", "resume", call_site="mirror_resume")
+
+    records = client.metrics.drain()
+    assert [(r['stage'], r['call_site'], r['parse_ok']) for r in records] == [
+        ("barometer", "barometer", True), ("barometer", "barometer_batch", False), ("mirror", "mirror_resume", None)]
+    assert records[0]['input_tokens'] == 900 and records[0]['model'] == "fake"
+    assert client.metrics.drain() == []
+
+    summary = client.metrics.summary({"barometer": 4})
+    assert summary["barometer"]["calls"] == 2 and summary["barometer"]["parse_failures"] == 1
+    assert summary["barometer"]["tokens_per_job"] == 500
+    assert summary["mirror"]["tokens_per_job"] is None
+
+def test_llm_metrics_latency_percentiles():
+    metrics = LLMMetrics()
+    for latency in [0.2] * 90 + [5.0] * 10:
+        metrics.record("tribunal_review", "fake", {}, latency)
+    summary = metrics.summary()["tribunal"]
+    assert 0.2 <= summary["p50_latency"] < 0.25
+    assert 5.0 <= summary["p95_latency"] < 6.3
+
+def test_llm_client_routes_call_sites_to_model_tiers(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"llm": {
+        "model": "big-default", "models": {"small": "tiny-1", "large": "big-2"},
+        "routing": {"scout_parse": "small", "mirror_resume": "large", "tribunal_review": "huge"}}}))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    client = LLMClient(str(config_path))
+
+    assert client.model_for("scout_parse") == "tiny-1"
+    assert client.model_for("mirror_resume") == "big-2"
+    assert client.model_for("barometer") == "big-default"
+    assert client.model_for("tribunal_review") == "big-default"  # unknown tier falls back
+    assert client.model_for("barometer", tier="small") == "tiny-1"
+    assert client._llm_for("tiny-1").model == "tiny-1"
+    assert client._llm_for("tiny-1") is client._llm_for("tiny-1")
+    assert client._llm_for("big-default") is client.llm
+
+    class FakeChat:
+        def __init__(self, name):
+            self.name = name
+
+        def invoke(self, messages):
+            return type("Reply", (), {"content": self.name, "response_metadata": {}})()
+
+    client.llm = FakeChat("default")
+    client._tier_llms[("tiny-1", False)] = FakeChat("small")
+    assert client.generate("sys", "page", call_site="scout_parse") == "small"
+    assert client.generate("sys", "job", call_site="barometer") == "default"
+    assert [r['model'] for r in client.metrics.drain()] == ["tiny-1", "big-default"]
+
+def test_llm_client_submits_and_polls_message_batches(tmp_path, monkeypatch, batch_server):
+    batch_server.respond = lambda custom_id, params: None if custom_id == "b" else '{"score": 70}'
+    client = _async_client(tmp_path, monkeypatch, batch_server, {})
+    prompt = [PromptSegment("NARRATIVE: ...", cacheable=True), PromptSegment("JOB: Acme")]
+
+    batch_id = client.submit_batch([BatchRequest("a", "sys", prompt, call_site="barometer", output_schema={}),
+                                    BatchRequest("b", "sys", "JOB: Initech", call_site="barometer")])
+
+    assert client.poll_batch(batch_id, call_site="barometer", structured=True) is None
+    # Results can be collected by any client, e.g. after a restart
+    restarted = _async_client(tmp_path, monkeypatch, batch_server, {})
+    assert restarted.poll_batch(batch_id, call_site="barometer", structured=True) == {"a": {"score": 70}, "b": None}
+
+    sent = {r["custom_id"]: r["params"] for r in batch_server.batches[batch_id]["requests"]}
+    blocks = sent["a"]["messages"][0]["content"]
+    assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+    assert "valid JSON object" in blocks[-1]["text"]
+    assert sent["b"]["messages"][0]["content"] == [{"type": "text", "text": "JOB: Initech"}]
+    assert restarted.metrics.summary()["barometer"]["calls"] == 1
+
+def test_offline_batch_mode_is_rejected_for_providers_without_a_batch_api(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"llm": {"provider": "openai", "model": "fake"},
+                                           "tribunal": {"offline_batch": {"enabled": True}}}))
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    with pytest.raises(ValueError, match="tribunal.offline_batch"):
+        LLMClient(str(config_path))
@@ -0,0 +1,287 @@
+import html
+import logging
+import re
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple, Type
+from urllib.parse import urlparse, parse_qs
+import requests
+from bs4 import BeautifulSoup
+from utils.rate_limit import DomainRateLimiter
+
+logger = logging.getLogger(__name__)
+
+def html_to_text(markup: str) -> str:
+    """Flatten (possibly entity-escaped) job description HTML into plain text."""
+    if not markup:
+        return ""
+    soup = BeautifulSoup(html.unescape(markup), 'html.parser')
+    return soup.get_text("\n", strip=True)
+
+class ATSExtractor(ABC):
+    """
+    Base class for applicant-tracking-system extractors.
+
+    An extractor recognizes job URLs for one ATS and turns its public JSON API
+    into the same dict `Scout.parse_with_llm` produces (company, role, location,
+    job_type, description, date_posted) without an LLM call.
+    Subclasses that set `supports_board` can also pull every posting on a
+    company's board in a single request.
+    """
+
+    name = "ats"
+    default_api_base: Optional[str] = None
+    supports_board = False
+
+    def __init__(self, session: requests.Session, api_base: Optional[str] = None, timeout: float = 10):
+        self.session = session
+        self.api_base = (api_base or self.default_api_base or "").rstrip("/")
+        self.timeout = timeout
+
+    @abstractmethod
+    def match(self, url: str) -> Optional[Dict]:
+        """Return the URL's identifying parts (board, posting id, ...) or None if it isn't ours."""
+
+    @abstractmethod
+    def api_url(self, parts: Dict) -> str:
+        """The API endpoint `extract` fetches for the posting identified by `parts`."""
+
+    @abstractmethod
+    def extract(self, url: str) -> Optional[Dict]:
+        """Fetch a single posting and return structured fields."""
+
+    def board_key(self, parts: Dict) -> Optional[str]:
+        return parts.get('board') if self.supports_board else None
+
+    def fetch_board(self, board: str) -> Dict[str, Dict]:
+        """Fetch every posting on a board, keyed by posting id (nothing unless `supports_board`)."""
+        return {}
+
+    def _get_json(self, url: str, **kwargs):
+        response = self.session.get(url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+class GreenhouseExtractor(ATSExtractor):
+    """boards.greenhouse.io/{board}/jobs/{id} -> boards-api.greenhouse.io/v1/boards/{board}/jobs/{id}"""
+
+    name = "greenhouse"
+    default_api_base = "https://boards-api.greenhouse.io"
+    supports_board = True
+    HOST = re.compile(r"^(job-)?boards(\.eu)?\.greenhouse\.io$")
+    PATH = re.compile(r"^/([^/]+)/jobs/(\d+)")
+
+    def match(self, url: str) -> Optional[Dict]:
+        parsed = urlparse(url)
+        if not self.HOST.match(parsed.hostname or ""):
+            return None
+        m = self.PATH.match(parsed.path)
+        if m:
+            return {'board': m.group(1), 'id': m.group(2)}
+        # Embedded form: /embed/job_app?for=acme&token=123
+        query = parse_qs(parsed.query)
+        if query.get('for') and query.get('token'):
+            return {'board': query['for'][0], 'id': query['token'][0]}
+        return None
+
+    def _to_listing(self, board: str, job: Dict) -> Dict:
+        return {
+            'company': job.get('company_name') or board.replace('-', ' ').title(),
+            'role': job.get('title'),
+            'location': (job.get('location') or {}).get('name'),
+            'job_type': None,
+            'description': html_to_text(job.get('content', '')),
+            'date_posted': (job.get('first_published') or job.get('updated_at') or '')[:10] or None,
+            'url': job.get('absolute_url'),
+        }
+
+    def api_url(self, parts: Dict) -> str:
+        return f"{self.api_base}/v1/boards/{parts['board']}/jobs/{parts['id']}"
+
+    def extract(self, url: str) -> Optional[Dict]:
+        parts = self.match(url)
+        job = self._get_json(self.api_url(parts))
+        return self._to_listing(parts['board'], job)
+
+    def fetch_board(self, board: str) -> Dict[str, Dict]:
+        data = self._get_json(f"{self.api_base}/v1/boards/{board}/jobs", params={'content': 'true'})
+        return {str(job['id']): self._to_listing(board, job) for job in data.get('jobs', [])}
+
+class LeverExtractor(ATSExtractor):
+    """jobs.lever.co/{company}/{id} -> api.lever.co/v0/postings/{company}/{id}"""
+
+    name = "lever"
+    default_api_base = "https://api.lever.co"
+    supports_board = True
+    HOST = re.compile(r"^jobs(\.eu)?\.lever\.co$")
+    PATH = re.compile(r"^/([^/]+)/([0-9a-f-]{36})")
+
+    def match(self, url: str) -> Optional[Dict]:
+        parsed = urlparse(url)
+        if not self.HOST.match(parsed.hostname or ""):
+            return None
+        m = self.PATH.match(parsed.path)
+        return {'board': m.group(1), 'id': m.group(2)} if m else None
+
+    def _to_listing(self, board: str, posting: Dict) -> Dict:
+        categories = posting.get('categories') or {}
+        sections = [posting.get('descriptionPlain', '')]
+        for section in posting.get('lists', []):
+            sections.append(section.get('text', ''))
+            sections.append(html_to_text(section.get('content', '')))
+        sections.append(posting.get('additionalPlain', ''))
+
+        created = posting.get('createdAt')
+        date_posted = datetime.fromtimestamp(created / 1000, tz=timezone.utc).strftime("%Y-%m-%d") if created else None
+
+        return {
+            'company': board.replace('-', ' ').title(),
+            'role': posting.get('text'),
+            'location': categories.get('location'),
+            'job_type': categories.get('commitment'),
+            'description': "\n".join(s for s in sections if s).strip(),
+            'date_posted': date_posted,
+            'url': posting.get('hostedUrl'),
+        }
+
+    def api_url(self, parts: Dict) -> str:
+        return f"{self.api_base}/v0/postings/{parts['board']}/{parts['id']}"
+
+    def extract(self, url: str) -> Optional[Dict]:
+        parts = self.match(url)
+        posting = self._get_json(self.api_url(parts))
+        return self._to_listing(parts['board'], posting)
+
+    def fetch_board(self, board: str) -> Dict[str, Dict]:
+        postings = self._get_json(f"{self.api_base}/v0/postings/{board}", params={'mode': 'json'})
+        return {posting['id']: self._to_listing(board, posting) for posting in postings}
+
+class WorkdayExtractor(ATSExtractor):
+    """
+    {tenant}.wd5.myworkdayjobs.com/{site}/job/{...} -> same host /wday/cxs/{tenant}/{site}/job/{...}
+
+    Workday's board listing omits descriptions, so there is no bulk mode here.
+    """
+
+    name = "workday"
+    HOST = re.compile(r"^([a-z0-9-]+)\.wd\d+\.myworkdayjobs\.com$")
+    PATH = re.compile(r"^/(?:[a-z]{2}-[A-Z]{2}/)?([^/]+)/job/(.+)$")
+
+    def match(self, url: str) -> Optional[Dict]:
+        parsed = urlparse(url)
+        host = parsed.hostname or ""
+        host_match = self.HOST.match(host)
+        if not host_match:
+            return None
+        m = self.PATH.match(parsed.path)
+        if not m:
+            return None
+        return {'host': host, 'tenant': host_match.group(1), 'board': m.group(1), 'id': m.group(2)}
+
+    def api_url(self, parts: Dict) -> str:
+        api_base = self.api_base or f"https://{parts['host']}"
+        return f"{api_base}/wday/cxs/{parts['tenant']}/{parts['board']}/job/{parts['id']}"
+
+    def extract(self, url: str) -> Optional[Dict]:
+        parts = self.match(url)
+        data = self._get_json(self.api_url(parts))
+        info = data.get('jobPostingInfo', {})
+        return {
+            'company': (data.get('hiringOrganization') or {}).get('name') or parts['tenant'].title(),
+            'role': info.get('title'),
+            'location': info.get('location'),
+            'job_type': info.get('timeType'),
+            'description': html_to_text(info.get('jobDescription', '')),
+            'date_posted': info.get('startDate'),
+            'url': info.get('externalUrl'),
+        }
+
+DEFAULT_EXTRACTORS: List[Type[ATSExtractor]] = [GreenhouseExtractor, LeverExtractor, WorkdayExtractor]
+
+class ATSRegistry:
+    """
+    Routes job URLs to the matching ATS extractor.
+
+    Boards are fetched in bulk (one request per company) when a batch contains
+    at least `bulk_min_leads` postings from the same board; lookups for those
+    postings are then served from memory.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, extractors: Optional[List[Type[ATSExtractor]]] = None):
+        ats_config = (config or {}).get('scout', {}).get('ats', {}) or {}
+        self.enabled = ats_config.get('enabled', True)
+        self.bulk_min_leads = ats_config.get('bulk_min_leads', 2)
+        api_bases = ats_config.get('api_bases', {}) or {}
+
+        self.session = requests.Session()
+        self.session.headers.update({'Accept': 'application/json'})
+        self.extractors = [
+            cls(self.session, api_base=api_bases.get(cls.name), timeout=ats_config.get('timeout_seconds', 10))
+            for cls in (extractors or DEFAULT_EXTRACTORS)
+        ]
+        self._boards: Dict[Tuple[str, str], Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def match(self, url: str) -> Optional[Tuple[ATSExtractor, Dict]]:
+        if not self.enabled:
+            return None
+        for extractor in self.extractors:
+            parts = extractor.match(url)
+            if parts:
+                return extractor, parts
+        return None
+
+    def prefetch_boards(self, urls: List[str]) -> int:
+        """Bulk-fetch every board that appears at least `bulk_min_leads` times. Returns boards fetched."""
+        counts: Dict[Tuple[str, str], int] = {}
+        owners: Dict[str, ATSExtractor] = {}
+        for url in urls:
+            matched = self.match(url)
+            if not matched:
+                continue
+            extractor, parts = matched
+            board = extractor.board_key(parts)
+            if board:
+                key = (extractor.name, board)
+                counts[key] = counts.get(key, 0) + 1
+                owners[extractor.name] = extractor
+
+        fetched = 0
+        for (name, board), count in counts.items():
+            if count < self.bulk_min_leads or (name, board) in self._boards:
+                continue
+            try:
+                postings = owners[name].fetch_board(board)
+                with self._lock:
+                    self._boards[(name, board)] = postings
+                fetched += 1
+                logger.info(f"Fetched {len(postings)} postings from {name} board '{board}' in one request")
+            except Exception as e:
+                logger.warning(f"Bulk fetch of {name} board '{board}' failed: {e}")
+        return fetched
+
+    def extract(self, url: str, rate_limiter: Optional[DomainRateLimiter] = None) -> Optional[Dict]:
+        """
+        Structured listing for an ATS URL, or None if no extractor applies or the API call fails.
+        `rate_limiter` is only waited on when the posting is not already in a
+        prefetched board, and is keyed on the API host actually called, not the job page.
+        """
+        matched = self.match(url)
+        if not matched:
+            return None
+        extractor, parts = matched
+
+        board = extractor.board_key(parts)
+        with self._lock:
+            postings = self._boards.get((extractor.name, board)) if board else None
+        if postings and parts['id'] in postings:
+            return postings[parts['id']]
+
+        if rate_limiter is not None:
+            rate_limiter.acquire(extractor.api_url(parts))
+        try:
+            return extractor.extract(url)
+        except Exception as e:
+            logger.warning(f"{extractor.name} API extraction failed for {url}: {e}")
+            return None
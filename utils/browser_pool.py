@@ -0,0 +1,221 @@
+import asyncio
+import logging
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, Optional
+from playwright.sync_api import sync_playwright, Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+def _pool_settings(config: Optional[Dict]) -> Dict:
+    return (config or {}).get('scout', {}).get('browser_pool', {}) or {}
+
+class BrowserPool:
+    """
+    A long-lived headless Chromium shared by the Scout and the CareerPageValidator.
+
+    The browser is launched lazily on first use and every caller gets its own
+    isolated context/page. The browser is recycled after `max_uses` pages or
+    as soon as a page or the browser itself crashes.
+
+    Note: Playwright's sync API is bound to the thread that started it, so a
+    pool must only be used from one thread.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        pool_config = _pool_settings(config)
+        self.max_uses = pool_config.get('max_uses', 50)
+        self.headless = pool_config.get('headless', True)
+        self.user_agent = pool_config.get('user_agent', DEFAULT_USER_AGENT)
+
+        self._playwright = None
+        self._browser = None
+        self._uses = 0
+        self.stats = {'launches': 0, 'pages': 0, 'recycles': 0, 'crashes': 0}
+
+    def _ensure_browser(self):
+        """Return a connected browser, launching or recycling it as needed."""
+        if self._browser is not None:
+            if not self._browser.is_connected():
+                logger.warning("Browser disconnected, relaunching.")
+                self.stats['crashes'] += 1
+                self._recycle()
+            elif self._uses >= self.max_uses:
+                logger.info(f"Browser served {self._uses} pages, recycling.")
+                self._recycle()
+
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+
+        if self._browser is None:
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+            self._uses = 0
+            self.stats['launches'] += 1
+
+        return self._browser
+
+    def _recycle(self):
+        """Close the current browser; the next page() call launches a fresh one."""
+        if self._browser is None:
+            return
+        try:
+            self._browser.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing browser: {e}")
+        self._browser = None
+        self._uses = 0
+        self.stats['recycles'] += 1
+
+    @contextmanager
+    def page(self):
+        """
+        Yield a fresh page in its own browser context.
+        The context is always closed on exit, so cookies and storage never leak between leads.
+        """
+        browser = self._ensure_browser()
+        context = browser.new_context(user_agent=self.user_agent)
+        page = context.new_page()
+        crashed = []
+        page.on("crash", lambda _: crashed.append(True))
+        self._uses += 1
+        self.stats['pages'] += 1
+
+        try:
+            yield page
+        except PlaywrightError:
+            if crashed or not browser.is_connected():
+                self.stats['crashes'] += 1
+                self._recycle()
+            raise
+        finally:
+            try:
+                context.close()
+            except Exception:
+                pass # Context dies with a crashed browser
+
+    def close(self):
+        """Shut down the browser and the Playwright driver."""
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception as e:
+                logger.debug(f"Ignoring error while closing browser: {e}")
+            self._browser = None
+
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Ignoring error while stopping Playwright: {e}")
+            self._playwright = None
+
+        if self.stats['pages']:
+            logger.info(f"Browser pool closed: {self.stats}")
+
+class AsyncBrowserPool:
+    """
+    asyncio counterpart of BrowserPool used by the concurrent Scout mission.
+
+    Many pages may be open at once. When the browser is recycled, pages still
+    in flight keep the old browser alive until they finish.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        pool_config = _pool_settings(config)
+        self.max_uses = pool_config.get('max_uses', 50)
+        self.headless = pool_config.get('headless', True)
+        self.user_agent = pool_config.get('user_agent', DEFAULT_USER_AGENT)
+
+        self._playwright = None
+        self._browser = None
+        self._uses = 0
+        self._active: Dict = {}  # browser -> pages currently open on it
+        self._lock = asyncio.Lock()
+        self.stats = {'launches': 0, 'pages': 0, 'recycles': 0, 'crashes': 0}
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._browser is not None:
+                if not self._browser.is_connected():
+                    logger.warning("Browser disconnected, relaunching.")
+                    self.stats['crashes'] += 1
+                    await self._retire()
+                elif self._uses >= self.max_uses:
+                    logger.info(f"Browser served {self._uses} pages, recycling.")
+                    await self._retire()
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            if self._browser is None:
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self._active[self._browser] = 0
+                self._uses = 0
+                self.stats['launches'] += 1
+
+            self._uses += 1
+            self._active[self._browser] += 1
+            return self._browser
+
+    async def _retire(self):
+        """Detach the current browser, closing it now if no pages are using it."""
+        browser = self._browser
+        self._browser = None
+        self._uses = 0
+        self.stats['recycles'] += 1
+        if browser is not None and self._active.get(browser, 0) == 0:
+            await self._close_browser(browser)
+
+    async def _close_browser(self, browser):
+        self._active.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing browser: {e}")
+
+    @asynccontextmanager
+    async def page(self):
+        """Yield a fresh page in its own browser context."""
+        browser = await self._ensure_browser()
+        context = None
+        crashed = []
+        self.stats['pages'] += 1
+
+        try:
+            context = await browser.new_context(user_agent=self.user_agent)
+            page = await context.new_page()
+            page.on("crash", lambda _: crashed.append(True))
+            yield page
+        except PlaywrightError:
+            if (crashed or not browser.is_connected()) and browser is self._browser:
+                self.stats['crashes'] += 1
+                async with self._lock:
+                    await self._retire()
+            raise
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass # Context dies with a crashed browser
+            self._active[browser] = self._active.get(browser, 1) - 1
+            if browser is not self._browser and self._active[browser] <= 0:
+                await self._close_browser(browser)
+
+    async def close(self):
+        """Shut down every browser and the Playwright driver."""
+        for browser in list(self._active):
+            await self._close_browser(browser)
+        self._browser = None
+
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Ignoring error while stopping Playwright: {e}")
+            self._playwright = None
+
+        if self.stats['pages']:
+            logger.info(f"Async browser pool closed: {self.stats}")
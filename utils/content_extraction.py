@@ -0,0 +1,122 @@
+import re
+from typing import Dict, Optional
+from bs4 import BeautifulSoup, Tag
+
+# Character budgets each downstream prompt slices the description to
+PROMPT_SLICES = {
+    'scout_parse': 15000,
+    'barometer': 10000,
+    'mirror_resume': 10000,
+    'mirror_cover_letter': 5000,
+    'tribunal': 5000,
+}
+
+CHARS_PER_TOKEN = 4
+
+_STRIP_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'iframe', 'form', 'button',
+               'nav', 'header', 'footer', 'aside']
+_NEGATIVE = re.compile(
+    r"cookie|consent|banner|footer|header|nav|menu|breadcrumb|sidebar|related|similar|recommend|"
+    r"share|social|newsletter|subscribe|modal|popup|promo|sponsor|comment|widget|login|signup", re.I
+)
+_POSITIVE = re.compile(r"job|posting|description|content|article|main|body|details|requirement|responsibilit", re.I)
+_BLOCKS = ['p', 'li', 'td', 'pre', 'h1', 'h2', 'h3', 'h4', 'dd', 'section', 'article', 'div']
+
+def _class_weight(element: Tag) -> int:
+    names = " ".join(element.get('class', [])) + " " + (element.get('id') or "")
+    weight = 0
+    if _NEGATIVE.search(names):
+        weight -= 25
+    if _POSITIVE.search(names):
+        weight += 25
+    return weight
+
+def _link_density(element: Tag, text_length: int) -> float:
+    link_length = sum(len(a.get_text(" ", strip=True)) for a in element.find_all('a'))
+    return link_length / text_length if text_length else 1.0
+
+def _is_boilerplate(element: Tag) -> bool:
+    if element.attrs is None:
+        return False
+    names = " ".join(element.get('class', [])) + " " + (element.get('id') or "")
+    role = element.get('role') or ""
+    return bool(_NEGATIVE.search(names) and not _POSITIVE.search(names)) or role in ('navigation', 'banner', 'contentinfo', 'dialog')
+
+def extract_main_content(html: str, min_length: int = 200) -> Optional[str]:
+    """
+    Readability-style main-content extraction.
+
+    Page chrome (nav, header, footer, forms, cookie banners, "similar jobs"
+    rails) is dropped outright. Every remaining paragraph-level block is scored
+    on text length and comma count, and the score flows up to its parent and,
+    halved, to its grandparent. The best-scoring container, discounted by its
+    link density, wins. Returns None when nothing of at least `min_length`
+    characters stands out, so the caller can keep the full page text.
+    """
+    if not html:
+        return None
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(_STRIP_TAGS):
+        tag.decompose()
+    for element in soup.find_all(_is_boilerplate):
+        element.decompose()
+
+    scores: Dict[int, float] = {}
+    nodes: Dict[int, Tag] = {}
+    for block in soup.find_all(['p', 'li', 'td', 'pre', 'dd']):
+        text = block.get_text(" ", strip=True)
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = block.parent
+        for ancestor, share in ((parent, 1.0), (parent.parent if parent else None, 0.5)):
+            if not isinstance(ancestor, Tag) or ancestor.name in ('html', '[document]'):
+                continue
+            key = id(ancestor)
+            if key not in scores:
+                nodes[key] = ancestor
+                scores[key] = _class_weight(ancestor)
+            scores[key] += score * share
+
+    best, best_score = None, 0.0
+    for key, score in scores.items():
+        node = nodes[key]
+        text_length = len(node.get_text(" ", strip=True))
+        adjusted = score * (1 - _link_density(node, text_length))
+        if adjusted > best_score:
+            best, best_score = node, adjusted
+
+    if best is None:
+        return None
+
+    # Headings and strong sibling sections of the winner (e.g. "Requirements" next to "About the role") come along
+    threshold = max(10.0, best_score * 0.2)
+    parts = []
+    container = best.parent if isinstance(best.parent, Tag) else None
+    siblings = [child for child in container.children if isinstance(child, Tag)] if container else [best]
+    for sibling in siblings:
+        key = id(sibling)
+        strong = key in scores and scores[key] * (1 - _link_density(sibling, len(sibling.get_text(" ", strip=True)))) >= threshold
+        if sibling is best or strong or sibling.name in ('h1', 'h2', 'h3'):
+            parts.append(_block_text(sibling))
+
+    text = "\n".join(p for p in parts if p).strip()
+    return text if len(text) >= min_length else None
+
+def _block_text(element: Tag) -> str:
+    """Text of a container with one line per block element and collapsed whitespace."""
+    for br in element.find_all('br'):
+        br.replace_with("\n")
+    for block in element.find_all(_BLOCKS):
+        block.insert_before("\n")
+        block.insert_after("\n")
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in element.get_text().splitlines())
+    return "\n".join(line for line in lines if line)
+
+def prompt_chars_saved(raw_text: str, clean_text: str) -> int:
+    """Characters removed from all downstream prompts combined, honoring each prompt's slice."""
+    return sum(
+        min(len(raw_text or ""), limit) - min(len(clean_text or ""), limit)
+        for limit in PROMPT_SLICES.values()
+    )
@@ -0,0 +1,54 @@
+import hashlib
+import random
+import re
+from typing import List, Set
+
+# MinHash parameters: 64 permutations split into 8 LSH bands of 8 rows.
+# Pairs with Jaccard similarity above ~0.77 almost always share a band.
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729) # Fixed seed: signatures must be stable across processes
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed word n-grams of the normalized text."""
+    words = normalize_text(text).split()
+    if len(words) < size:
+        return set()
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + size]).encode(), digest_size=8).digest(), 'big')
+        for i in range(len(words) - size + 1)
+    }
+
+def minhash(text: str) -> List[int]:
+    """MinHash signature of a description; empty if the text is too short to fingerprint."""
+    hashed = shingles(text)
+    if not hashed:
+        return []
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashed) for a, b in _PERMUTATIONS]
+
+def lsh_buckets(signature: List[int]) -> List[str]:
+    """One bucket key per band; near-duplicates share at least one key with high probability."""
+    return [
+        f"{band}:{hashlib.md5(','.join(map(str, signature[band * ROWS:(band + 1) * ROWS])).encode()).hexdigest()[:16]}"
+        for band in range(BANDS)
+    ]
+
+def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+def encode_signature(signature: List[int]) -> str:
+    return ",".join(format(v, 'x') for v in signature)
+
+def decode_signature(encoded: str) -> List[int]:
+    return [int(v, 16) for v in encoded.split(",")] if encoded else []
@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+class HttpCache:
+    """
+    Content-addressed on-disk cache of fetched pages, shared by Scout and CareerPageValidator.
+
+    Bodies are stored gzip-compressed once per SHA-256 of their content under
+    `blobs/`; a SQLite index maps each URL to its current content hash along with
+    the ETag/Last-Modified validators and fetch time, so later runs can revalidate
+    with a conditional request instead of downloading or rendering again.
+    Parse results are remembered per content hash: a page whose content has not
+    changed never needs to go back through the LLM.
+    Total blob size is bounded by `max_bytes`; the least recently used blobs
+    (and the URLs pointing at them) are evicted first.
+    """
+
+    def __init__(self, cache_dir: str = "storage/cache/http", max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(cache_dir, "blobs"), exist_ok=True)
+
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS blobs (
+                    content_hash TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    parsed TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(content_hash);
+                CREATE INDEX IF NOT EXISTS idx_blobs_access ON blobs(last_access);
+            """)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["HttpCache"]:
+        """Build the cache from `scout.http_cache`, or None when it is disabled."""
+        cache_config = (config or {}).get('scout', {}).get('http_cache', {}) or {}
+        if not cache_config.get('enabled', True):
+            return None
+        return cls(
+            cache_dir=cache_config.get('dir', "storage/cache/http"),
+            max_bytes=int(cache_config.get('max_mb', 256) * 1024 * 1024)
+        )
+
+    @staticmethod
+    def content_hash(body: Union[str, bytes]) -> str:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return hashlib.sha256(body).hexdigest()
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, "blobs", content_hash[:2], f"{content_hash}.gz")
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Metadata for a URL (content_hash, etag, last_modified, fetched_at), or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM pages WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        entry = self.lookup(url)
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read(self, url: str) -> Optional[str]:
+        """Cached body for a URL, or None if it was never stored or has been evicted."""
+        entry = self.lookup(url)
+        if entry is None:
+            return None
+        try:
+            with gzip.open(self._blob_path(entry['content_hash']), "rt", encoding="utf-8") as f:
+                body = f.read()
+        except (OSError, EOFError):
+            return None
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE blobs SET last_access = ? WHERE content_hash = ?", (time.time(), entry['content_hash']))
+        return body
+
+    def revalidated(self, url: str):
+        """Record a 304 Not Modified: the stored body is current as of now."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self.stats['http_cache_revalidated'] += 1
+
+    def store(self, url: str, body: str, headers: Optional[Dict] = None) -> Dict:
+        """
+        Store a freshly fetched body. Returns the page entry with `unchanged` set
+        when the content hash matches what this URL held before.
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        digest = self.content_hash(body)
+        previous = self.lookup(url)
+        now = time.time()
+
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO blobs (content_hash, size, last_access) VALUES (?, ?, ?) "
+                "ON CONFLICT(content_hash) DO UPDATE SET last_access = excluded.last_access",
+                (digest, os.path.getsize(path), now)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, content_hash, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, digest, headers.get('etag'), headers.get('last-modified'), now)
+            )
+            self.stats['http_cache_stored'] += 1
+        self._evict()
+
+        unchanged = previous is not None and previous['content_hash'] == digest
+        if unchanged:
+            self.stats['http_cache_unchanged'] += 1
+        return {'url': url, 'content_hash': digest, 'unchanged': unchanged}
+
+    def get_parsed(self, content_hash: Optional[str]) -> Optional[Dict]:
+        """Fields previously parsed from this exact content, if any."""
+        if not content_hash:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT parsed FROM blobs WHERE content_hash = ?", (content_hash,)).fetchone()
+        return json.loads(row['parsed']) if row and row['parsed'] else None
+
+    def put_parsed(self, content_hash: Optional[str], parsed: Dict):
+        if not content_hash:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE blobs SET parsed = ? WHERE content_hash = ?", (json.dumps(parsed), content_hash))
+
+    def _evict(self):
+        """Drop least recently used blobs until the total size fits `max_bytes`."""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for row in self._conn.execute("SELECT content_hash, size FROM blobs ORDER BY last_access"):
+                if total <= self.max_bytes:
+                    break
+                victims.append(row['content_hash'])
+                total -= row['size']
+            with self._conn:
+                for digest in victims:
+                    self._conn.execute("DELETE FROM blobs WHERE content_hash = ?", (digest,))
+                    self._conn.execute("DELETE FROM pages WHERE content_hash = ?", (digest,))
+            self.stats['http_cache_evicted'] += len(victims)
+
+        for digest in victims:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
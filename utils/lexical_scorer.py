@@ -0,0 +1,124 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "can", "do", "for", "from", "has", "have", "i", "i'm",
+    "if", "in", "into", "is", "it", "its", "just", "like", "more", "most", "my", "not", "of", "on", "or", "our",
+    "over", "past", "so", "than", "that", "the", "their", "them", "they", "this", "to", "up", "was", "we", "were",
+    "what", "whether", "which", "who", "will", "with", "you", "your", "don't", "i've", "s", "t", "vs", "end",
+}
+
+# Built-in cues; the narrative adds its own words to every dimension except seniority
+SENIORITY_TERMS = [
+    "senior", "staff", "principal", "lead", "leadership", "head", "director", "vp", "strategy", "strategic",
+    "ownership", "own", "roadmap", "vision", "executive", "stakeholders", "mentor", "cross-functional", "years",
+]
+GROWTH_TERMS = [
+    "greenfield", "0-to-1", "zero-to-one", "founding", "launch", "new", "build", "scale", "scaling", "growth",
+    "emerging", "ai", "ml", "llm", "genai", "agents", "agentic", "platform", "innovation",
+]
+
+DIMENSIONS = ('seniority', 'tech_stack', 'domain_match', 'growth_opportunity')
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9][a-z0-9+#.'-]*[a-z0-9+#]|[a-z0-9]", (text or "").lower()) if t not in STOPWORDS]
+
+def _strings(node) -> Iterable[str]:
+    """Every string inside a nested YAML structure."""
+    if isinstance(node, str):
+        yield node
+    elif isinstance(node, dict):
+        for value in node.values():
+            yield from _strings(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _strings(item)
+
+def narrative_vocabularies(narrative: Dict) -> Dict[str, Dict[str, float]]:
+    """
+    Term weights per dimension drawn from strategic_narrative.yaml:
+    technical competencies feed tech_stack (high confidence counts fully,
+    anything else at 0.6), narrative names/messages/themes feed domain_match,
+    and differentiation lines feed growth_opportunity alongside built-in terms.
+    """
+    vocab = {dim: {} for dim in DIMENSIONS}
+
+    def add(dim: str, texts: Iterable[str], weight: float):
+        for term in tokenize(" ".join(texts)):
+            vocab[dim][term] = max(vocab[dim].get(term, 0.0), weight)
+
+    add('seniority', SENIORITY_TERMS, 1.0)
+    add('growth_opportunity', GROWTH_TERMS, 1.0)
+
+    competencies = (narrative or {}).get('technical_competencies', {}) or {}
+    for level, items in competencies.items():
+        add('tech_stack', _strings(items), 1.0 if level == 'high_confidence' else 0.6)
+
+    for story in (narrative or {}).get('narratives', []) or []:
+        add('domain_match', [story.get('name', ''), story.get('core_message', '')], 1.0)
+        add('domain_match', _strings(story.get('themes', [])), 0.8)
+        add('growth_opportunity', _strings(story.get('differentiation', [])), 0.6)
+    return vocab
+
+class LexicalScorer:
+    """
+    Deterministic 0-100 fit estimate from BM25 term matches, no LLM involved.
+
+    Each dimension's vocabulary is matched against the description with BM25
+    term-frequency saturation and document-length normalization. When fitted on
+    a batch, IDF (rescaled to average 1 over the vocabulary) downweights words
+    every listing shares. A dimension's summed evidence is squashed to 0-1 with
+    1 - exp(-x / saturation), and the dimensions are blended with the
+    `weight_*` values from the barometer config.
+    """
+
+    def __init__(self, narrative: Dict, weights: Dict, k1: float = 1.2, b: float = 0.75,
+                 saturation: float = 3.0, avg_doc_length: float = 600, min_fit_docs: int = 10):
+        self.vocab = narrative_vocabularies(narrative)
+        self.weights = {dim: float(weights.get(f'weight_{dim}', 0.25)) for dim in DIMENSIONS}
+        self.k1 = k1
+        self.b = b
+        self.saturation = saturation
+        self.avg_doc_length = avg_doc_length
+        self.min_fit_docs = min_fit_docs
+        self.idf: Dict[str, float] = {}
+
+    @property
+    def has_vocabulary(self) -> bool:
+        """False when the narrative was missing, leaving only the built-in cues."""
+        return bool(self.vocab['tech_stack'] or self.vocab['domain_match'])
+
+    def fit(self, descriptions: List[str]):
+        """Learn IDF and average length from a batch; small batches keep neutral weights."""
+        self.idf = {}
+        if len(descriptions) < self.min_fit_docs:
+            return
+        docs = [set(tokenize(d)) for d in descriptions]
+        self.avg_doc_length = sum(len(tokenize(d)) for d in descriptions) / len(descriptions) or self.avg_doc_length
+        terms = set().union(*(set(v) for v in self.vocab.values()))
+        n = len(docs)
+        raw = {t: math.log(1 + (n - df + 0.5) / (df + 0.5)) for t in terms for df in [sum(t in d for d in docs)]}
+        mean = sum(raw.values()) / len(raw) if raw else 1.0
+        self.idf = {t: value / mean for t, value in raw.items()}
+
+    def score(self, description: str) -> Dict[str, float]:
+        """Per-dimension scores (0-1) plus the weighted `total` on a 0-100 scale."""
+        tokens = tokenize(description)
+        tf = Counter(tokens)
+        length_norm = 1 - self.b + self.b * (len(tokens) / self.avg_doc_length if self.avg_doc_length else 1)
+
+        result = {}
+        for dim in DIMENSIONS:
+            evidence = 0.0
+            for term, weight in self.vocab[dim].items():
+                freq = tf.get(term)
+                if freq:
+                    saturated = freq * (self.k1 + 1) / (freq + self.k1 * length_norm) / (self.k1 + 1)
+                    evidence += weight * self.idf.get(term, 1.0) * saturated
+            result[dim] = 1 - math.exp(-evidence / self.saturation)
+
+        total_weight = sum(self.weights.values()) or 1
+        result['total'] = 100 * sum(self.weights[dim] * result[dim] for dim in DIMENSIONS) / total_weight
+        return result
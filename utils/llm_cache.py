@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """
+    Persistent content-addressed cache of LLM responses.
+
+    A response is keyed on the SHA-256 of everything that determines it
+    (provider, model, temperature, system and user prompt), so a byte-identical
+    request -- a reposted job, a re-run of a crashed cycle, a page whose text
+    did not change -- is answered from SQLite instead of the provider.
+    Entries expire per call site (`ttl_hours` under `call_sites`, falling back
+    to the cache-wide default); call sites marked `bypass` never read or write
+    the cache. Total response size is bounded by `max_bytes`, evicting the least
+    recently used entries first. Hits, misses and tokens saved are counted per
+    call site.
+    """
+
+    def __init__(self, cache_dir: str = "storage/cache/llm", max_bytes: int = 64 * 1024 * 1024,
+                 ttl_hours: Optional[float] = 168, call_sites: Optional[Dict] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_hours = ttl_hours
+        self.call_sites = call_sites or {}
+        self.stats: Dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "responses.db"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    call_site TEXT,
+                    response TEXT NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access);
+            """)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["ResponseCache"]:
+        """Build the cache from `llm.cache`, or None unless it is enabled (opt-in)."""
+        cache_config = (config or {}).get('llm', {}).get('cache', {}) or {}
+        if not cache_config.get('enabled', False):
+            return None
+        return cls(
+            cache_dir=cache_config.get('dir', "storage/cache/llm"),
+            max_bytes=int(cache_config.get('max_mb', 64) * 1024 * 1024),
+            ttl_hours=cache_config.get('ttl_hours', 168),
+            call_sites=cache_config.get('call_sites', {})
+        )
+
+    @staticmethod
+    def key(provider: str, model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+        payload = json.dumps([provider, model, temperature, system_prompt, user_prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def bypassed(self, call_site: Optional[str]) -> bool:
+        return bool((self.call_sites.get(call_site) or {}).get('bypass', False))
+
+    def _ttl_seconds(self, call_site: Optional[str]) -> Optional[float]:
+        ttl_hours = (self.call_sites.get(call_site) or {}).get('ttl_hours', self.ttl_hours)
+        return None if ttl_hours is None else ttl_hours * 3600
+
+    def get(self, key: str, call_site: Optional[str] = None) -> Optional[str]:
+        """Cached response for `key`, or None when missing or older than the call site's TTL."""
+        site = call_site or "default"
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, tokens, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            ttl = self._ttl_seconds(call_site)
+            if row is None or (ttl is not None and now - row['created_at'] > ttl):
+                self.stats[site]['misses'] += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.stats[site]['hits'] += 1
+            self.stats[site]['tokens_saved'] += row['tokens']
+        return row['response']
+
+    def put(self, key: str, response: str, tokens: int, call_site: Optional[str] = None):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, call_site, response, tokens, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, call_site, response, tokens, len(response.encode("utf-8")), now, now)
+            )
+        self._evict()
+
+    def discard(self, key: str):
+        """Forget a response, e.g. one that turned out to be unparseable."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _evict(self):
+        """Drop least recently used responses until the total size fits `max_bytes`."""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for row in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+                if total <= self.max_bytes:
+                    break
+                victims.append(row['key'])
+                total -= row['size']
+            with self._conn:
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in victims])
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per call site: hits, misses, hit_rate and tokens_saved."""
+        with self._lock:
+            report = {}
+            for site, counts in self.stats.items():
+                lookups = counts['hits'] + counts['misses']
+                report[site] = {
+                    'hits': counts['hits'],
+                    'misses': counts['misses'],
+                    'hit_rate': counts['hits'] / lookups if lookups else 0.0,
+                    'tokens_saved': counts['tokens_saved'],
+                }
+            return report
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
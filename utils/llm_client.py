@@ -1,14 +1,82 @@
 import os
+import asyncio
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import re
+import time
+from typing import Optional, Dict, Any, List, NamedTuple, Sequence, Tuple, Union
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 import yaml
+from utils.llm_cache import ResponseCache
+from utils.llm_limiter import AdaptiveLimiter, throttle_status, retry_after_seconds
+from utils.llm_metrics import LLMMetrics
 
 logger = logging.getLogger(__name__)
 
+class PromptSegment(NamedTuple):
+    """
+    One piece of a user prompt. Static blocks that repeat across calls (the
+    strategic narrative, the master resume) are marked `cacheable` and go
+    first, so the provider can serve that prefix from its prompt cache.
+    """
+    text: str
+    cacheable: bool = False
+
+Prompt = Union[str, Sequence[PromptSegment]]
+
+def prompt_text(prompt: Prompt) -> str:
+    """The exact text a prompt sends: segments are concatenated in order."""
+    if isinstance(prompt, str):
+        return prompt
+    return "".join(segment.text for segment in prompt)
+
+def _append(prompt: Prompt, suffix: str) -> Prompt:
+    if isinstance(prompt, str):
+        return prompt + suffix
+    return [*prompt, PromptSegment(suffix)]
+
+def _json_instruction(output_schema: Dict[str, Any]) -> str:
+    return f"\n\nPlease output the result as a valid JSON object matching this schema: {output_schema}"
+
+def _extract_json(response_text: str) -> Any:
+    """The first {...} block of a reply (or the whole reply) as JSON; raises json.JSONDecodeError."""
+    match = re.search(r"\{.*\}", response_text, re.DOTALL)
+    return json.loads(match.group(0) if match else response_text)
+
+class BatchRequest(NamedTuple):
+    """
+    One request in a provider batch. `custom_id` ties the result back to the
+    caller's work item (letters, digits, '-' and '_', at most 64 characters);
+    with an `output_schema` the JSON instruction of `generate_structured` is
+    appended to the prompt.
+    """
+    custom_id: str
+    system_prompt: str
+    user_prompt: Prompt
+    call_site: Optional[str] = None
+    output_schema: Optional[Dict[str, Any]] = None
+    tier: Optional[str] = None
+    max_tokens: Optional[int] = None
+
+def normalize_usage(raw: Any) -> Dict[str, int]:
+    """
+    Token usage from an Anthropic or OpenAI response as uncached_input,
+    cache_read, cache_write and output counts (zero when not reported).
+    """
+    if hasattr(raw, "model_dump"):
+        raw = raw.model_dump()
+    raw = raw or {}
+    if "prompt_tokens" in raw:
+        # OpenAI caches long prefixes automatically and reports the hits here
+        cached = (raw.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        return {"uncached_input": raw["prompt_tokens"] - cached, "cache_read": cached,
+                "cache_write": 0, "output": raw.get("completion_tokens") or 0}
+    return {"uncached_input": raw.get("input_tokens") or 0, "cache_read": raw.get("cache_read_input_tokens") or 0,
+            "cache_write": raw.get("cache_creation_input_tokens") or 0, "output": raw.get("output_tokens") or 0}
+
 class LLMClient:
     """Wrapper for LLM interactions (Anthropic/OpenAI)."""
     
@@ -17,7 +85,19 @@ class LLMClient:
         self.provider = self.config.get("llm", {}).get("provider", "anthropic")
         self.model_name = self.config.get("llm", {}).get("model", "claude-3-5-sonnet-20240620")
         self.temperature = self.config.get("llm", {}).get("temperature", 0.7)
+        self.base_url = self.config.get("llm", {}).get("base_url")
+        self.prompt_caching = self.config.get("llm", {}).get("prompt_caching", True)
+        # Model tiers (e.g. small/large) and the tier each call site uses; unrouted sites use `model`
+        self.tiers = self.config.get("llm", {}).get("models", {}) or {}
+        self.routing = self.config.get("llm", {}).get("routing", {}) or {}
+        self._check_offline_batch_support()
         self.llm = self._initialize_llm()
+        # The async path retries through the shared limiter, so the SDK must not retry on its own
+        self.async_llm = self._initialize_llm(max_retries=0)
+        self._tier_llms: Dict[Tuple[str, bool], Any] = {}
+        self.limiter = AdaptiveLimiter.from_config(self.config)
+        self.cache = ResponseCache.from_config(self.config)
+        self.metrics = LLMMetrics()
 
     def _load_config(self, path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -28,9 +108,20 @@ class LLMClient:
             logger.warning(f"Config file not found at {path}, using defaults.")
             return {}
 
-    def _initialize_llm(self):
+    def _check_offline_batch_support(self):
+        """Fail at startup, not mid-cycle, when an agent's offline_batch mode needs a batch API we lack."""
+        for agent in ("barometer", "tribunal"):
+            offline = ((self.config or {}).get(agent, {}) or {}).get("offline_batch", {}) or {}
+            if offline.get("enabled") and self.provider != "anthropic":
+                raise ValueError(f"{agent}.offline_batch requires the anthropic provider; unsupported LLM provider: {self.provider}")
+
+    def _initialize_llm(self, max_retries: Optional[int] = None, model: Optional[str] = None):
         """Initialize the LangChain LLM object based on provider."""
         api_key = None
+        model = model or self.model_name
+        options = {}
+        if max_retries is not None:
+            options["max_retries"] = max_retries
         
         if self.provider == "anthropic":
             api_key = os.getenv("ANTHROPIC_API_KEY")
@@ -39,9 +130,11 @@ class LLMClient:
                 raise ValueError("ANTHROPIC_API_KEY is required for Anthropic provider.")
             
             return ChatAnthropic(
-                model=self.model_name,
+                model=model,
                 temperature=self.temperature,
-                anthropic_api_key=api_key
+                anthropic_api_key=api_key,
+                anthropic_api_url=self.base_url,
+                **options
             )
             
         elif self.provider == "openai":
@@ -51,52 +144,292 @@ class LLMClient:
                 raise ValueError("OPENAI_API_KEY is required for OpenAI provider.")
                 
             return ChatOpenAI(
-                model=self.model_name,
+                model=model,
                 temperature=self.temperature,
-                openai_api_key=api_key
+                openai_api_key=api_key,
+                openai_api_base=self.base_url,
+                **options
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
-    def generate(self, system_prompt: str, user_prompt: str) -> str:
-        """Generate a response from the LLM."""
+    def model_for(self, call_site: Optional[str] = None, tier: Optional[str] = None) -> str:
+        """Model for an explicit tier, else the call site's routed tier, else the default model."""
+        tier = tier or self.routing.get(call_site)
+        if tier is None:
+            return self.model_name
+        if tier not in self.tiers:
+            logger.warning(f"Unknown model tier '{tier}' for {call_site}; using {self.model_name}")
+            return self.model_name
+        return self.tiers[tier]
+
+    def _llm_for(self, model: str, use_async: bool = False):
+        if model == self.model_name:
+            return self.async_llm if use_async else self.llm
+        key = (model, use_async)
+        if key not in self._tier_llms:
+            self._tier_llms[key] = self._initialize_llm(max_retries=0 if use_async else None, model=model)
+        return self._tier_llms[key]
+
+    def _cache_key(self, model: str, system_prompt: str, user_prompt: Prompt) -> str:
+        return ResponseCache.key(self.provider, model, self.temperature, system_prompt, prompt_text(user_prompt))
+
+    def _uses_prompt_caching(self, user_prompt: Prompt) -> bool:
+        return (self.prompt_caching and self.provider == "anthropic" and not isinstance(user_prompt, str)
+                and any(segment.cacheable for segment in user_prompt))
+
+    def _anthropic_request(self, model: str, system_prompt: str, user_prompt: Prompt, llm,
+                           max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Messages API parameters with a cache breakpoint after the last cacheable segment."""
+        if isinstance(user_prompt, str):
+            user_prompt = [PromptSegment(user_prompt)]
+        segments = [segment for segment in user_prompt if segment.text.strip()]
+        last_cacheable = -1
+        if self.prompt_caching:
+            last_cacheable = max((i for i, segment in enumerate(segments) if segment.cacheable), default=-1)
+        blocks = []
+        for i, segment in enumerate(segments):
+            block = {"type": "text", "text": segment.text}
+            if i == last_cacheable:
+                # Caches everything up to here, system prompt included
+                block["cache_control"] = {"type": "ephemeral"}
+            blocks.append(block)
+        return {"model": model, "max_tokens": max_tokens or llm.max_tokens, "temperature": self.temperature,
+                "system": system_prompt, "messages": [{"role": "user", "content": blocks}]}
+
+    @staticmethod
+    def _messages(system_prompt: str, user_prompt: Prompt) -> List:
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=prompt_text(user_prompt))
+        ]
+
+    @staticmethod
+    def _response_usage(response) -> Dict[str, int]:
+        metadata = getattr(response, "response_metadata", None) or {}
+        return normalize_usage(metadata.get("usage") or metadata.get("token_usage") or getattr(response, "usage_metadata", None))
+
+    def _invoke(self, model: str, system_prompt: str, user_prompt: Prompt,
+                max_tokens: Optional[int] = None) -> Tuple[str, Dict[str, int]]:
+        llm = self._llm_for(model)
+        if self._uses_prompt_caching(user_prompt):
+            # langchain-anthropic drops cache_control from content blocks, so segmented prompts use the SDK client
+            response = llm._client.messages.create(**self._anthropic_request(model, system_prompt, user_prompt, llm, max_tokens))
+            return "".join(b.text for b in response.content if b.type == "text"), normalize_usage(response.usage)
+        options = {"max_tokens": max_tokens} if max_tokens else {}
+        response = llm.invoke(self._messages(system_prompt, user_prompt), **options)
+        return response.content, self._response_usage(response)
+
+    async def _ainvoke(self, model: str, system_prompt: str, user_prompt: Prompt,
+                       max_tokens: Optional[int] = None) -> Tuple[str, Dict[str, int]]:
+        llm = self._llm_for(model, use_async=True)
+        if self._uses_prompt_caching(user_prompt):
+            response = await llm._async_client.messages.create(**self._anthropic_request(model, system_prompt, user_prompt, llm, max_tokens))
+            return "".join(b.text for b in response.content if b.type == "text"), normalize_usage(response.usage)
+        options = {"max_tokens": max_tokens} if max_tokens else {}
+        response = await llm.ainvoke(self._messages(system_prompt, user_prompt), **options)
+        return response.content, self._response_usage(response)
+
+    def _log_usage(self, call_site: Optional[str], model: str, usage: Dict[str, int]):
+        if not any(usage.values()):
+            return
+        logger.info(
+            f"LLM [{call_site or 'default'}, {model}] input tokens: {usage['cache_read']:,} cached, "
+            f"{usage['uncached_input'] + usage['cache_write']:,} uncached ({usage['cache_write']:,} written to cache); "
+            f"{usage['output']:,} output"
+        )
+
+    def _store(self, key: str, call_site: Optional[str], system_prompt: str, user_prompt: Prompt,
+               response_text: str, usage: Dict[str, int]):
+        tokens = sum(usage.values()) or (len(system_prompt) + len(prompt_text(user_prompt)) + len(response_text)) // 4
+        self.cache.put(key, response_text, tokens, call_site)
+
+    def _use_cache(self, call_site: Optional[str], cache: bool) -> bool:
+        return self.cache is not None and cache and not self.cache.bypassed(call_site)
+
+    def generate(self, system_prompt: str, user_prompt: Prompt, call_site: Optional[str] = None, cache: bool = True,
+                 tier: Optional[str] = None) -> str:
+        """
+        Generate a response from the LLM. `user_prompt` is a string or a list of PromptSegments.
+        `call_site` names the caller for model routing, cache TTLs and stats; `tier` overrides the
+        routed model tier; `cache=False` always asks the provider.
+        """
+        model = self.model_for(call_site, tier)
+        response_text, call = self._generate(model, system_prompt, user_prompt, call_site, cache)
+        self.metrics.record(call_site, model, **call)
+        return response_text
+
+    def _cached(self, model: str, system_prompt: str, user_prompt: Prompt, call_site: Optional[str], cache: bool) -> Optional[str]:
+        if not self._use_cache(call_site, cache):
+            return None
+        return self.cache.get(self._cache_key(model, system_prompt, user_prompt), call_site)
+
+    def _generate(self, model: str, system_prompt: str, user_prompt: Prompt, call_site: Optional[str], cache: bool,
+                  max_tokens: Optional[int] = None) -> Tuple[str, Dict]:
+        """One sync call; returns the text and its metrics record (usage, latency, retries)."""
+        clock = time.monotonic()
+        cached = self._cached(model, system_prompt, user_prompt, call_site, cache)
+        if cached is not None:
+            return cached, {"usage": {}, "latency": time.monotonic() - clock, "response_cached": True}
         try:
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt)
-            ]
-            response = self.llm.invoke(messages)
-            return response.content
+            response_text, usage = self._invoke(model, system_prompt, user_prompt, max_tokens)
         except Exception as e:
             logger.error(f"LLM generation failed: {e}")
             raise
+        self._log_usage(call_site, model, usage)
+        if self._use_cache(call_site, cache):
+            self._store(self._cache_key(model, system_prompt, user_prompt), call_site, system_prompt, user_prompt, response_text, usage)
+        return response_text, {"usage": usage, "latency": time.monotonic() - clock}
 
-    def generate_structured(self, system_prompt: str, user_prompt: str, output_schema: Dict[str, Any]) -> Dict[str, Any]:
+    def cache_summary(self) -> Dict[str, Dict]:
+        """Response-cache hits, misses, hit rate and tokens saved per call site (empty when caching is off)."""
+        return self.cache.summary() if self.cache is not None else {}
+
+    def generate_structured(self, system_prompt: str, user_prompt: Prompt, output_schema: Dict[str, Any],
+                            call_site: Optional[str] = None, cache: bool = True, tier: Optional[str] = None,
+                            max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """
         Generate a structured JSON response.
         Note: This is a simplified implementation. For production, use LangChain's structured output parsers.
+        `max_tokens` raises the reply budget above the model client's default for long outputs.
         """
         # Append instruction to output JSON
-        json_instruction = f"\n\nPlease output the result as a valid JSON object matching this schema: {output_schema}"
-        full_user_prompt = user_prompt + json_instruction
-        
-        response_text = self.generate(system_prompt, full_user_prompt)
+        full_user_prompt = _append(user_prompt, _json_instruction(output_schema))
         
+        model = self.model_for(call_site, tier)
+        response_text, call = self._generate(model, system_prompt, full_user_prompt, call_site, cache, max_tokens)
+        parsed = self._parse_structured(model, system_prompt, full_user_prompt, response_text, call_site, cache)
+        self.metrics.record(call_site, model, parse_ok=bool(parsed), **call)
+        return parsed
+
+    def _parse_structured(self, model: str, system_prompt: str, full_user_prompt: Prompt, response_text: str,
+                          call_site: Optional[str], cache: bool) -> Dict[str, Any]:
         # Basic JSON parsing (robust parsing would use a parser)
-        import json
-        import re
-        
         try:
-            # Try to find JSON block
-            match = re.search(r"\{.*\}", response_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                return json.loads(json_str)
-            else:
-                # Try parsing the whole text
-                return json.loads(response_text)
+            return _extract_json(response_text)
         except json.JSONDecodeError:
             logger.error(f"Failed to parse JSON response: {response_text}")
+            if self._use_cache(call_site, cache):
+                # Don't replay a malformed answer on the next identical request
+                self.cache.discard(self._cache_key(model, system_prompt, full_user_prompt))
             # Fallback: return empty dict or raise
             # For robustness, let's try to fix common JSON errors or just return empty
             return {}
+
+    async def agenerate(self, system_prompt: str, user_prompt: Prompt, call_site: Optional[str] = None, cache: bool = True,
+                        tier: Optional[str] = None) -> str:
+        """
+        Async `generate`. Requests wait for a slot in the shared AdaptiveLimiter
+        (concurrency plus the `llm.rate_limits` RPM/TPM budgets); throttling
+        responses shrink the limit and are retried after the provider's
+        retry-after, up to `max_retries` times.
+        """
+        model = self.model_for(call_site, tier)
+        response_text, call = await self._agenerate(model, system_prompt, user_prompt, call_site, cache)
+        self.metrics.record(call_site, model, **call)
+        return response_text
+
+    async def _agenerate(self, model: str, system_prompt: str, user_prompt: Prompt, call_site: Optional[str], cache: bool,
+                         max_tokens: Optional[int] = None) -> Tuple[str, Dict]:
+        clock = time.monotonic()
+        cached = self._cached(model, system_prompt, user_prompt, call_site, cache)
+        if cached is not None:
+            return cached, {"usage": {}, "latency": time.monotonic() - clock, "response_cached": True}
+
+        estimated_tokens = (len(system_prompt) + len(prompt_text(user_prompt))) // 4
+        attempt = 0
+        while True:
+            started = await self.limiter.acquire(estimated_tokens)
+            try:
+                response_text, usage = await self._ainvoke(model, system_prompt, user_prompt, max_tokens)
+            except Exception as e:
+                if throttle_status(e) is None or attempt >= self.limiter.max_retries:
+                    self.limiter.release(started)
+                    logger.error(f"LLM generation failed: {e}")
+                    raise
+                delay = self.limiter.throttled(started, retry_after_seconds(e), attempt)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self.limiter.release(started)
+                raise
+            self.limiter.succeeded(started)
+            break
+
+        self._log_usage(call_site, model, usage)
+        if self._use_cache(call_site, cache):
+            self._store(self._cache_key(model, system_prompt, user_prompt), call_site, system_prompt, user_prompt, response_text, usage)
+        return response_text, {"usage": usage, "latency": time.monotonic() - clock, "retries": attempt}
+
+    async def agenerate_structured(self, system_prompt: str, user_prompt: Prompt, output_schema: Dict[str, Any],
+                                   call_site: Optional[str] = None, cache: bool = True, tier: Optional[str] = None,
+                                   max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Async `generate_structured`."""
+        full_user_prompt = _append(user_prompt, _json_instruction(output_schema))
+        model = self.model_for(call_site, tier)
+        response_text, call = await self._agenerate(model, system_prompt, full_user_prompt, call_site, cache, max_tokens)
+        parsed = self._parse_structured(model, system_prompt, full_user_prompt, response_text, call_site, cache)
+        self.metrics.record(call_site, model, parse_ok=bool(parsed), **call)
+        return parsed
+
+    def submit_batch(self, requests: Sequence[BatchRequest]) -> str:
+        """
+        Submit requests as one provider message batch and return its id.
+        Batches are processed offline (typically within an hour, at most 24h)
+        at a discount and outside the interactive rate limits; collect the
+        answers with `poll_batch`. Only the Anthropic Message Batches API is
+        supported; other providers raise ValueError.
+        """
+        if self.provider != "anthropic":
+            raise ValueError(f"Unsupported LLM provider for message batches: {self.provider}")
+        params = []
+        for request in requests:
+            prompt = request.user_prompt
+            if request.output_schema is not None:
+                prompt = _append(prompt, _json_instruction(request.output_schema))
+            model = self.model_for(request.call_site, request.tier)
+            params.append({"custom_id": request.custom_id,
+                           "params": self._anthropic_request(model, request.system_prompt, prompt, self._llm_for(model),
+                                                             request.max_tokens)})
+        batch = self.llm._client.messages.batches.create(requests=params)
+        logger.info(f"Submitted LLM batch {batch.id} with {len(params)} requests")
+        return batch.id
+
+    def poll_batch(self, batch_id: str, call_site: Optional[str] = None,
+                   structured: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        None while the batch is still processing; once it has ended, the answer
+        for every custom_id -- the reply text, or with `structured` the parsed
+        JSON object ({} when unparseable) -- and None for requests that
+        errored, expired or were canceled. Each answer is recorded in the
+        metrics with the batch's turnaround as its latency.
+        """
+        batches = self.llm._client.messages.batches
+        batch = batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+        latency = (batch.ended_at - batch.created_at).total_seconds() if batch.ended_at else 0.0
+        answers: Dict[str, Any] = {}
+        failed = 0
+        for entry in batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                logger.warning(f"LLM batch {batch_id}: request {entry.custom_id} {entry.result.type}")
+                answers[entry.custom_id] = None
+                failed += 1
+                continue
+            message = entry.result.message
+            response_text = "".join(b.text for b in message.content if b.type == "text")
+            parse_ok = None
+            if structured:
+                try:
+                    answers[entry.custom_id] = _extract_json(response_text)
+                except json.JSONDecodeError:
+                    logger.error(f"Failed to parse JSON response: {response_text}")
+                    answers[entry.custom_id] = {}
+                parse_ok = bool(answers[entry.custom_id])
+            else:
+                answers[entry.custom_id] = response_text
+            self.metrics.record(call_site, message.model, normalize_usage(message.usage), latency, parse_ok=parse_ok)
+        logger.info(f"Collected LLM batch {batch_id}: {len(answers) - failed} answers, {failed} failed")
+        return answers
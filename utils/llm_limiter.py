@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter, deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# 429 Too Many Requests, 503 Service Unavailable, 529 Overloaded (Anthropic)
+THROTTLE_STATUSES = {429, 503, 529}
+
+def throttle_status(error: Exception) -> Optional[int]:
+    """HTTP status of a provider error if it means "slow down", else None."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if status in THROTTLE_STATUSES else None
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-requested delay from `retry-after-ms` / `retry-after` (seconds or HTTP date), if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+    except ValueError:
+        pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for LLM requests shared by every coroutine using one LLMClient.
+
+    The number of requests allowed in flight adapts AIMD-style: each success
+    adds 1/limit (so a full window of successes raises the limit by one), and a
+    throttling response (429/503/529) multiplies it by `decrease_factor`, at
+    most once per window -- throttles from requests that started before the
+    last cut do not cut again. A `retry-after` from the provider pauses all new
+    requests until it has passed. Optional requests-per-minute and
+    tokens-per-minute budgets are enforced with token buckets on top.
+
+    Waiters are woken across event loops and threads, so one limiter can be
+    shared by agents that each run their own `asyncio.run`.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 initial_concurrency: float = 4, min_concurrency: float = 1, max_concurrency: float = 32,
+                 decrease_factor: float = 0.5, max_retries: int = 5, backoff_seconds: float = 1.0):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.decrease_factor = decrease_factor
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.requests = TokenBucket(requests_per_minute / 60 if requests_per_minute else None,
+                                    capacity=max(1.0, min(requests_per_minute or 1, max_concurrency)))
+        self.tokens = TokenBucket(tokens_per_minute / 60 if tokens_per_minute else None,
+                                  capacity=float(tokens_per_minute or 1))
+        self.stats = Counter()
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "AdaptiveLimiter":
+        limits = (config or {}).get('llm', {}).get('rate_limits', {}) or {}
+        return cls(
+            requests_per_minute=limits.get('requests_per_minute'),
+            tokens_per_minute=limits.get('tokens_per_minute'),
+            initial_concurrency=limits.get('initial_concurrency', 4),
+            min_concurrency=limits.get('min_concurrency', 1),
+            max_concurrency=limits.get('max_concurrency', 32),
+            decrease_factor=limits.get('decrease_factor', 0.5),
+            max_retries=limits.get('max_retries', 5),
+            backoff_seconds=limits.get('backoff_seconds', 1.0),
+        )
+
+    def _try_enter(self) -> bool:
+        if self.in_flight < max(1, int(self.limit)) and time.monotonic() >= self._paused_until:
+            self.in_flight += 1
+            return True
+        return False
+
+    def _wake(self):
+        """Hand free slots to waiters in arrival order (caller holds the lock)."""
+        while self._waiters and self._try_enter():
+            loop, future = self._waiters.popleft()
+            loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(True))
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait for a concurrency slot and the RPM/TPM budgets. Returns the start
+        time to hand back to `succeeded`/`throttled`/`release`.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = None
+        try:
+            while True:
+                with self._lock:
+                    if waiter is None:
+                        if not self._waiters and self._try_enter():
+                            break
+                        waiter = (loop, loop.create_future())
+                        self._waiters.append(waiter)
+                    elif waiter not in self._waiters:
+                        break  # a releasing request handed us its slot
+                    else:
+                        self._wake()  # nobody releases when a retry-after pause simply runs out
+                        if waiter not in self._waiters:
+                            break
+                    # Re-check at the end of a pause; otherwise a release wakes us
+                    pause = self._paused_until - time.monotonic()
+                    timeout = min(1.0, max(0.01, pause)) if pause > 0 else 1.0
+                await asyncio.wait({waiter[1]}, timeout=timeout)
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter is not None:
+                    self.in_flight -= 1
+                    self._wake()
+            raise
+        try:
+            await self.requests.acquire_async()
+            if tokens:
+                await self.tokens.acquire_async(tokens)
+        except BaseException:
+            self.release()
+            raise
+        return time.monotonic()
+
+    def release(self, started: Optional[float] = None):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def succeeded(self, started: Optional[float] = None):
+        with self._lock:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self.stats['succeeded'] += 1
+        self.release(started)
+
+    def throttled(self, started: float, retry_after: Optional[float] = None, attempt: int = 0) -> float:
+        """Record a throttling response; returns how long the caller should wait before retrying."""
+        delay = retry_after if retry_after is not None else self.backoff_seconds * (2 ** attempt)
+        with self._lock:
+            self.stats['throttled'] += 1
+            if started >= self._last_decrease:
+                self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+                self._last_decrease = time.monotonic()
+                self.stats['decreased'] += 1
+                logger.warning(f"LLM provider throttled; concurrency limit now {self.limit:.1f}")
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self.release(started)
+        return delay
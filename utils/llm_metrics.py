@@ -0,0 +1,104 @@
+import bisect
+import logging
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Latency bucket upper bounds in seconds: 50ms growing by 25% per bucket up to ~7.5 minutes
+LATENCY_BOUNDS = [0.05 * 1.25 ** i for i in range(42)]
+
+def stage_of(call_site: Optional[str]) -> str:
+    """Agent a call site belongs to, e.g. "barometer_batch" -> "barometer"."""
+    return (call_site or "default").split("_")[0]
+
+class LatencyHistogram:
+    """Fixed log-scale buckets; percentiles are reported as the matching bucket's upper bound."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.total = 0
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        self.total += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BOUNDS[min(i, len(LATENCY_BOUNDS) - 1)]
+        return LATENCY_BOUNDS[-1]
+
+class LLMMetrics:
+    """
+    In-memory registry of LLM call records.
+
+    Every call contributes to a per-stage latency histogram and token counters
+    and is queued for `drain()`, which hands the raw records to
+    DatabaseManager.save_llm_calls (the `llm_calls` table). `summary()` turns
+    the counters into p50/p95 latency and tokens per processed job per stage.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: List[Dict] = []
+        self.latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.totals: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, call_site: Optional[str], model: str, usage: Dict[str, int], latency: float,
+               retries: int = 0, parse_ok: Optional[bool] = None, response_cached: bool = False):
+        stage = stage_of(call_site)
+        entry = {
+            'stage': stage, 'call_site': call_site or "default", 'model': model,
+            'input_tokens': usage.get('uncached_input', 0), 'output_tokens': usage.get('output', 0),
+            'cache_read_tokens': usage.get('cache_read', 0), 'cache_write_tokens': usage.get('cache_write', 0),
+            'latency_ms': int(latency * 1000), 'retries': retries, 'parse_ok': parse_ok,
+            'response_cached': response_cached, 'created_at': datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._pending.append(entry)
+            self.latency[stage].add(latency)
+            totals = self.totals[stage]
+            totals['calls'] += 1
+            totals['retries'] += retries
+            totals['response_cached'] += response_cached
+            totals['parse_failures'] += parse_ok is False
+            for key in ('input_tokens', 'output_tokens', 'cache_read_tokens', 'cache_write_tokens'):
+                totals[key] += entry[key]
+
+    def drain(self) -> List[Dict]:
+        """Records collected since the last drain, for persisting."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def summary(self, jobs_by_stage: Optional[Dict[str, int]] = None) -> Dict[str, Dict]:
+        """Per stage: calls, p50/p95 latency (s), token totals and tokens per processed job."""
+        jobs_by_stage = jobs_by_stage or {}
+        with self._lock:
+            report = {}
+            for stage, totals in self.totals.items():
+                tokens = totals['input_tokens'] + totals['output_tokens'] + totals['cache_read_tokens'] + totals['cache_write_tokens']
+                jobs = jobs_by_stage.get(stage)
+                report[stage] = {
+                    **totals,
+                    'p50_latency': self.latency[stage].percentile(0.5),
+                    'p95_latency': self.latency[stage].percentile(0.95),
+                    'tokens': tokens,
+                    'jobs': jobs,
+                    'tokens_per_job': tokens / jobs if jobs else None,
+                }
+            return report
+
+    def reset(self):
+        with self._lock:
+            self._pending = []
+            self.latency.clear()
+            self.totals.clear()
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from utils.rate_limit import match_domain
+
+logger = logging.getLogger(__name__)
+
+# Scripts, XHR and fetch stay allowed: most careers pages are SPAs that build the DOM from them
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["image", "media", "font", "stylesheet", "texttrack", "manifest", "other"]
+
+DEFAULT_BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "hubspot.com",
+    "linkedin.com",
+]
+
+_BODY_TEXT_LENGTH = "() => document.body ? document.body.innerText.length : 0"
+
+class NavigationProfile:
+    """
+    How Playwright pages are loaded: which requests are aborted and when a page counts as ready.
+
+    Navigation waits for DOMContentLoaded only. Readiness then comes from a
+    per-domain `ready_selectors` entry when one is configured, otherwise from
+    the body text length holding steady for `stable_polls` consecutive polls.
+    Either wait is capped at `settle_timeout_ms` and never fails the page.
+    `domain_timeouts` and `ready_selectors` keys match the host or any parent
+    domain, most specific key first (like `scout.domain_rate_limits`).
+
+    Every navigation logs its time and the bytes transferred. Bytes come from
+    `content-length` headers, so chunked or compressed-on-the-fly responses
+    without one are not counted; they are reported as "unsized" instead.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        nav_config = (config or {}).get('scout', {}).get('navigation', {}) or {}
+        self.blocked_resource_types = set(nav_config.get('block_resource_types', DEFAULT_BLOCKED_RESOURCE_TYPES))
+        self.blocked_hosts: List[str] = nav_config.get('block_hosts', DEFAULT_BLOCKED_HOSTS)
+        self.wait_until = nav_config.get('wait_until', "domcontentloaded")
+        self.timeout_seconds = nav_config.get('timeout_seconds', 20)
+        self.domain_timeouts: Dict[str, float] = nav_config.get('domain_timeouts', {}) or {}
+        self.ready_selectors: Dict[str, str] = nav_config.get('ready_selectors', {}) or {}
+        self.settle_timeout_ms = nav_config.get('settle_timeout_ms', 5000)
+        self.stability_interval_ms = nav_config.get('stability_interval_ms', 250)
+        self.stable_polls = nav_config.get('stable_polls', 2)
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def timeout_ms(self, url: str) -> int:
+        timeout = match_domain(urlparse(url).hostname or "", self.domain_timeouts)
+        return int((self.timeout_seconds if timeout is None else timeout) * 1000)
+
+    def ready_selector(self, url: str) -> Optional[str]:
+        return match_domain(urlparse(url).hostname or "", self.ready_selectors)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type == "document":
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == blocked or host.endswith("." + blocked) for blocked in self.blocked_hosts)
+
+    def _on_response(self, metrics: Dict, response):
+        metrics['requests'] += 1
+        try:
+            metrics['bytes'] += int(response.headers['content-length'])
+        except (KeyError, TypeError, ValueError):
+            metrics['unsized'] += 1
+
+    def _record(self, url: str, metrics: Dict, started: float):
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        metrics['nav_ms'] = elapsed_ms
+        with self._lock:
+            self.stats['nav_pages'] += 1
+            self.stats['nav_bytes'] += metrics['bytes']
+            self.stats['nav_blocked'] += metrics['blocked']
+            self.stats['nav_ms'] += elapsed_ms
+        logger.info(
+            f"Navigated {url} in {elapsed_ms}ms: {metrics['bytes'] / 1024:.0f} KiB over "
+            f"{metrics['requests']} responses ({metrics['unsized']} unsized), {metrics['blocked']} requests blocked"
+        )
+
+    def navigate(self, page, url: str):
+        """Load `url` in a sync Playwright page under this profile. Returns the document response."""
+        metrics = Counter()
+
+        def route_handler(route):
+            request = route.request
+            if self.should_block(request.resource_type, request.url):
+                metrics['blocked'] += 1
+                route.abort()
+            else:
+                route.continue_()
+
+        started = time.monotonic()
+        page.route("**/*", route_handler)
+        page.on("response", lambda response: self._on_response(metrics, response))
+        response = page.goto(url, wait_until=self.wait_until, timeout=self.timeout_ms(url))
+        self._settle(page, url)
+        self._record(url, metrics, started)
+        return response
+
+    def _settle(self, page, url: str):
+        selector = self.ready_selector(url)
+        if selector:
+            try:
+                page.wait_for_selector(selector, timeout=self.settle_timeout_ms)
+            except Exception:
+                logger.debug(f"Ready selector '{selector}' never appeared on {url}")
+            return
+
+        deadline = time.monotonic() + self.settle_timeout_ms / 1000
+        last_length, stable = -1, 0
+        while time.monotonic() < deadline:
+            length = page.evaluate(_BODY_TEXT_LENGTH)
+            stable = stable + 1 if length == last_length and length > 0 else 0
+            if stable >= self.stable_polls:
+                return
+            last_length = length
+            page.wait_for_timeout(self.stability_interval_ms)
+
+    async def navigate_async(self, page, url: str):
+        """Async counterpart of `navigate` for pages from AsyncBrowserPool."""
+        metrics = Counter()
+
+        async def route_handler(route):
+            request = route.request
+            if self.should_block(request.resource_type, request.url):
+                metrics['blocked'] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        started = time.monotonic()
+        await page.route("**/*", route_handler)
+        page.on("response", lambda response: self._on_response(metrics, response))
+        response = await page.goto(url, wait_until=self.wait_until, timeout=self.timeout_ms(url))
+        await self._settle_async(page, url)
+        self._record(url, metrics, started)
+        return response
+
+    async def _settle_async(self, page, url: str):
+        selector = self.ready_selector(url)
+        if selector:
+            try:
+                await page.wait_for_selector(selector, timeout=self.settle_timeout_ms)
+            except Exception:
+                logger.debug(f"Ready selector '{selector}' never appeared on {url}")
+            return
+
+        deadline = time.monotonic() + self.settle_timeout_ms / 1000
+        last_length, stable = -1, 0
+        while time.monotonic() < deadline:
+            length = await page.evaluate(_BODY_TEXT_LENGTH)
+            stable = stable + 1 if length == last_length and length > 0 else 0
+            if stable >= self.stable_polls:
+                return
+            last_length = length
+            await asyncio.sleep(self.stability_interval_ms / 1000)
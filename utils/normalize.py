@@ -0,0 +1,56 @@
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'gh_src', 'lever-source', 'lever-origin', 'source', 'src', 'ref', 'referrer', 'refid',
+    'trk', 'trackingid', 'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid', '_hsenc', '_hsmi', 'iis', 'iisn',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+# Sub-pages that are the same posting (e.g. jobs.lever.co/acme/<id>/apply)
+POSTING_SUFFIXES = re.compile(r"/(apply|application)$", re.I)
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a job URL to a canonical form so trivially different links dedupe:
+    https scheme, lowercase host without "www." or default port, no trailing
+    slash or /apply suffix, tracking parameters dropped, remaining query sorted,
+    fragment removed.
+    """
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ('http', 'https', ''):
+        return url.strip()
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path)
+    path = POSTING_SUFFIXES.sub("", path).rstrip("/")
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlunsplit(('https', host, path, urlencode(sorted(query)), ''))
+
+# Legal-entity suffixes that don't distinguish one company from another
+COMPANY_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'bv', 'pty', 'lp',
+}
+
+def normalize_company_name(name: str) -> str:
+    """
+    Cache key for a company: lowercase, punctuation and legal suffixes removed.
+    "Acme, Inc." and "ACME" both become "acme".
+    """
+    words = re.sub(r"[^a-z0-9&]+", " ", (name or "").lower()).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
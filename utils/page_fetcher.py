@@ -0,0 +1,216 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from utils.browser_pool import BrowserPool, AsyncBrowserPool, DEFAULT_USER_AGENT
+from utils.navigation import NavigationProfile
+from utils.http_cache import HttpCache
+
+logger = logging.getLogger(__name__)
+
+TIER_STATIC = "static"
+TIER_BROWSER = "browser"
+
+# Markers of a client-side rendered shell whose real content needs JavaScript
+SPA_SHELL_SIGNATURES = [
+    re.compile(r'<div[^>]+id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</div>', re.I),
+    re.compile(r'(you need to|please) enable javascript', re.I),
+    re.compile(r'javascript is (required|disabled)', re.I),
+    re.compile(r'<body[^>]*>\s*<script', re.I),
+]
+
+def extract_text(html: str) -> Tuple[str, str]:
+    """Return (title, visible body text) from an HTML document."""
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    for tag in soup(['script', 'style', 'noscript', 'template', 'svg']):
+        tag.decompose()
+    body = soup.body or soup
+    return title, body.get_text("\n", strip=True)
+
+class TieredFetcher:
+    """
+    Fetches job pages with the cheapest tier that works.
+
+    Tier 1 is a plain pooled HTTP GET plus BeautifulSoup text extraction. The
+    fetcher escalates to a Playwright render only when the static body is empty,
+    too short, or looks like a JavaScript shell. A domain whose static fetches
+    miss `browser_after_misses` times in a row goes straight to the browser
+    for `browser_ttl_seconds`; after that static is probed again, and one more
+    miss sends it back to the browser tier.
+    With an HttpCache, static fetches are conditional and every page comes
+    back tagged with its content hash and whether it changed since last time.
+    """
+
+    def __init__(self, browser_pool: BrowserPool, config: Optional[Dict] = None, navigation: Optional[NavigationProfile] = None,
+                 http_cache: Optional[HttpCache] = None):
+        fetch_config = (config or {}).get('scout', {}).get('static_fetch', {}) or {}
+        self.browser_pool = browser_pool
+        self.navigation = navigation or NavigationProfile(config)
+        self.http_cache = http_cache
+        self.enabled = fetch_config.get('enabled', True)
+        self.min_text_length = fetch_config.get('min_text_length', 500)
+        self.timeout = fetch_config.get('timeout_seconds', 10)
+        self.browser_after_misses = max(1, fetch_config.get('browser_after_misses', 2))
+        self.browser_ttl = fetch_config.get('browser_ttl_seconds', 600)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+
+        self.domain_tiers: Dict[str, str] = {}
+        self.static_misses = Counter()
+        self._browser_until: Dict[str, float] = {}
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _should_try_static(self, url: str) -> bool:
+        if not self.enabled:
+            return False
+        domain = urlparse(url).netloc
+        with self._lock:
+            if self.domain_tiers.get(domain) != TIER_BROWSER:
+                return True
+            if time.monotonic() < self._browser_until[domain]:
+                return False
+            # The browser verdict has expired; probe static again
+            del self.domain_tiers[domain]
+            self.stats['static_reprobes'] += 1
+            return True
+
+    def _remember(self, url: str, tier: str, static_missed: bool = False):
+        """Record a successful fetch; `static_missed` when a static attempt escalated to get it."""
+        domain = urlparse(url).netloc
+        with self._lock:
+            if tier == TIER_STATIC:
+                self.static_misses.pop(domain, None)
+                self.domain_tiers[domain] = TIER_STATIC
+            elif static_missed:
+                self.static_misses[domain] += 1
+                if self.static_misses[domain] >= self.browser_after_misses:
+                    self.domain_tiers[domain] = TIER_BROWSER
+                    self._browser_until[domain] = time.monotonic() + self.browser_ttl
+            self.stats[f"fetch_{tier}"] += 1
+
+    def _accept_static(self, url: str, status_code: int, html: str) -> Optional[Dict]:
+        """Build the details dict from a static response, or None if it needs a real browser."""
+        if status_code != 200 or not html:
+            logger.debug(f"Static fetch of {url} returned {status_code}, escalating.")
+            return None
+
+        title, text = extract_text(html)
+        if len(text) < self.min_text_length:
+            logger.debug(f"Static body for {url} too short ({len(text)} chars), escalating.")
+            return None
+        if len(text) < self.min_text_length * 4 and any(sig.search(html) for sig in SPA_SHELL_SIGNATURES):
+            logger.debug(f"Static body for {url} looks like an SPA shell, escalating.")
+            return None
+
+        return {'title': title, 'description': text, 'raw_html': html, 'tier': TIER_STATIC}
+
+    def _static_body(self, url: str, status_code: int, body: str) -> Tuple[int, str]:
+        """Swap a 304 Not Modified for the cached body it refers to."""
+        if status_code == 304 and self.http_cache:
+            cached = self.http_cache.read(url)
+            if cached is not None:
+                self.http_cache.revalidated(url)
+                return 200, cached
+        return status_code, body
+
+    def _cache_details(self, url: str, details: Dict, headers=None, not_modified: bool = False) -> Dict:
+        """Record the page in the HTTP cache and tag details with its content hash."""
+        if not self.http_cache or not details:
+            return details
+        try:
+            if not_modified:
+                entry = self.http_cache.lookup(url) or {}
+                details.update(content_hash=entry.get('content_hash'), unchanged=True)
+            else:
+                entry = self.http_cache.store(url, details['raw_html'], dict(headers or {}))
+                details.update(content_hash=entry['content_hash'], unchanged=entry['unchanged'])
+        except Exception as e:
+            logger.warning(f"Failed to cache {url}: {e}")
+        return details
+
+    def fetch(self, url: str) -> Dict:
+        """Fetch a job page, escalating to the browser tier when needed."""
+        tried_static = self._should_try_static(url)
+        if tried_static:
+            try:
+                headers = self.http_cache.conditional_headers(url) if self.http_cache else {}
+                response = self.session.get(url, timeout=self.timeout, headers=headers)
+                status_code, body = self._static_body(url, response.status_code, response.text)
+                details = self._accept_static(url, status_code, body)
+                if details:
+                    self._remember(url, TIER_STATIC)
+                    return self._cache_details(url, details, response.headers, not_modified=response.status_code == 304)
+            except requests.RequestException as e:
+                logger.debug(f"Static fetch of {url} failed: {e}")
+
+        details = self.render(url)
+        if details:
+            self._remember(url, TIER_BROWSER, static_missed=tried_static)
+        return details
+
+    def render(self, url: str) -> Dict:
+        """Render a page with headless Chromium from the shared pool."""
+        try:
+            with self.browser_pool.page() as page:
+                response = self.navigation.navigate(page, url)
+                details = {
+                    'title': page.title(),
+                    'description': page.inner_text("body"),
+                    'raw_html': page.content(),
+                    'tier': TIER_BROWSER
+                }
+            return self._cache_details(url, details, response.headers if response else None)
+        except Exception as e:
+            logger.error(f"Failed to scrape {url}: {e}")
+            return {}
+
+    async def fetch_async(self, url: str, browser_pool: AsyncBrowserPool, client) -> Dict:
+        """Async variant of fetch; `client` is a pooled httpx.AsyncClient."""
+        tried_static = self._should_try_static(url)
+        if tried_static:
+            try:
+                headers = self.http_cache.conditional_headers(url) if self.http_cache else {}
+                response = await client.get(url, timeout=self.timeout, follow_redirects=True, headers=headers)
+                status_code, body = self._static_body(url, response.status_code, response.text)
+                details = self._accept_static(url, status_code, body)
+                if details:
+                    self._remember(url, TIER_STATIC)
+                    return self._cache_details(url, details, response.headers, not_modified=response.status_code == 304)
+            except Exception as e:
+                logger.debug(f"Static fetch of {url} failed: {e}")
+
+        details = await self.render_async(url, browser_pool)
+        if details:
+            self._remember(url, TIER_BROWSER, static_missed=tried_static)
+        return details
+
+    async def render_async(self, url: str, browser_pool: AsyncBrowserPool) -> Dict:
+        try:
+            async with browser_pool.page() as page:
+                response = await self.navigation.navigate_async(page, url)
+                details = {
+                    'title': await page.title(),
+                    'description': await page.inner_text("body"),
+                    'raw_html': await page.content(),
+                    'tier': TIER_BROWSER
+                }
+            return self._cache_details(url, details, response.headers if response else None)
+        except Exception as e:
+            logger.error(f"Failed to scrape {url}: {e}")
+            return {}
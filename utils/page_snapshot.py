@@ -0,0 +1,94 @@
+import html
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, FrozenSet, Optional
+
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Word set used for title lookups; titles and pages go through the same tokenizer."""
+    return frozenset(WORD_PATTERN.findall((text or "").lower()))
+
+def normalize_page(markup: str) -> str:
+    """
+    Lowercased text of a rendered page with tags stripped. Script bodies are kept
+    on purpose: SPA careers pages often only carry their job titles in embedded JSON.
+    """
+    text = html.unescape(_TAG_PATTERN.sub(" ", markup or ""))
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+class SnapshotCache:
+    """
+    In-memory LRU of rendered careers pages keyed by URL.
+
+    Each snapshot holds the normalized page text, its pre-tokenized word set and
+    the ETag/Last-Modified validators of the document response. Snapshots younger
+    than `ttl_seconds` are served as-is; older ones are returned by `stale()` so
+    the caller can revalidate with a conditional request before re-rendering.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = Counter()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Fresh snapshot for a URL, or None."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or time.time() - entry['fetched_at'] > self.ttl_seconds:
+                return None
+            self._entries.move_to_end(url)
+            self.stats['snapshot_hits'] += 1
+            return entry
+
+    def stale(self, url: str) -> Optional[Dict]:
+        """Expired snapshot that carries validators worth a conditional request."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry and (entry.get('etag') or entry.get('last_modified')):
+            return entry
+        return None
+
+    def put(self, url: str, markup: str, headers: Optional[Dict] = None) -> Dict:
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        text = normalize_page(markup)
+        entry = {
+            'url': url,
+            'text': text,
+            'words': tokenize(text),
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+            'fetched_at': time.time(),
+        }
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats['snapshot_renders'] += 1
+        return entry
+
+    def touch(self, url: str) -> Optional[Dict]:
+        """Mark a snapshot fresh again after a 304 Not Modified."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry['fetched_at'] = time.time()
+                self._entries.move_to_end(url)
+                self.stats['snapshot_revalidated'] += 1
+            return entry
+
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict[str, str]:
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so cosmetic differences share a cache entry."""
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+class QueryCache:
+    """
+    On-disk cache of search results keyed on the normalized query string.
+    One JSON file per query; entries older than `ttl_hours` are treated as misses
+    and deleted when read. Files left stale by queries that never come back are
+    pruned when the cache is opened.
+    """
+
+    def __init__(self, cache_dir: str = "storage/cache/search", ttl_hours: float = 6):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.prune()
+
+    def _path(self, query: str) -> str:
+        key = hashlib.sha1(normalize_query(query).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass # Already removed by a concurrent reader
+        except OSError as e:
+            logger.warning(f"Failed to remove stale cache file {path}: {e}")
+
+    def prune(self) -> int:
+        """Delete expired entries and abandoned temp files; returns how many files were removed."""
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith((".json", ".tmp")):
+                continue
+            try:
+                stale = entry.stat().st_mtime < cutoff
+            except FileNotFoundError:
+                continue
+            if stale:
+                self._remove(entry.path)
+                removed += 1
+        if removed:
+            logger.info(f"Pruned {removed} expired search cache files from {self.cache_dir}")
+        return removed
+
+    def get(self, query: str) -> Optional[List[Dict]]:
+        path = self._path(query)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._count(False)
+            return None
+        except json.JSONDecodeError:
+            self._remove(path)
+            self._count(False)
+            return None
+
+        if time.time() - entry.get('fetched_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            self._count(False)
+            return None
+
+        self._count(True)
+        return entry.get('results', [])
+
+    def put(self, query: str, results: List[Dict]):
+        path = self._path(query)
+        entry = {'query': normalize_query(query), 'fetched_at': time.time(), 'results': results}
+        try:
+            # Write-then-rename so a concurrent reader never sees a half-written file
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache search results for '{query}': {e}")
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional, TypeVar
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+def politeness_domain(url: str) -> str:
+    """
+    Collapse a URL to the domain its politeness budget is charged to.
+    e.g. "https://boards.greenhouse.io/acme/jobs/1" -> "greenhouse.io"
+    """
+    host = (urlparse(url).hostname or "").lower()
+    labels = host.split(".")
+    return ".".join(labels[-2:]) if len(labels) > 2 else host
+
+T = TypeVar("T")
+
+def match_domain(host: str, table: Dict[str, T]) -> Optional[T]:
+    """
+    Value of the most specific key in `table` that is `host` itself or one of
+    its parent domains, e.g. "myworkdayjobs.com" matches "acme.wd5.myworkdayjobs.com".
+    """
+    host = host.lower()
+    matches = [key for key in table if host == key or host.endswith("." + key)]
+    return table[max(matches, key=len)] if matches else None
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from both threads and coroutines.
+
+    Tokens are reserved up front (the balance may go negative), so concurrent
+    callers queue up behind each other instead of all waking at once.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: float = 1.0):
+        self.rate = rate  # tokens per second; None/0 disables limiting
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float = 1.0) -> float:
+        """Take `amount` tokens and return how long the caller must wait before using them."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, amount: float = 1.0):
+        wait = self._reserve(amount)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, amount: float = 1.0):
+        wait = self._reserve(amount)
+        if wait:
+            await asyncio.sleep(wait)
+
+class DomainRateLimiter:
+    """
+    One token bucket per politeness domain.
+
+    `default_interval` is the minimum number of seconds between requests to the
+    same domain (scout.rate_limit_seconds); `overrides` maps a domain suffix to
+    its own interval (scout.domain_rate_limits).
+    """
+
+    def __init__(self, default_interval: float, overrides: Optional[Dict[str, float]] = None, burst: float = 1.0):
+        self.default_interval = default_interval
+        self.overrides = overrides or {}
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "DomainRateLimiter":
+        scout_config = config.get('scout', {})
+        return cls(
+            default_interval=scout_config.get('rate_limit_seconds', 2),
+            overrides=scout_config.get('domain_rate_limits', {}),
+            burst=scout_config.get('rate_limit_burst', 1),
+        )
+
+    def _interval_for(self, domain: str) -> float:
+        interval = match_domain(domain, self.overrides)
+        return self.default_interval if interval is None else interval
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        domain = politeness_domain(url)
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                interval = self._interval_for(domain)
+                bucket = TokenBucket(1.0 / interval if interval else None, capacity=self.burst)
+                self._buckets[domain] = bucket
+            return bucket
+
+    def acquire(self, url: str):
+        self.bucket_for(url).acquire()
+
+    async def acquire_async(self, url: str):
+        await self.bucket_for(url).acquire_async()
@@ -0,0 +1,131 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from bs4 import BeautifulSoup
+from utils.ats_extractors import html_to_text
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ('company', 'role')
+
+def _as_list(value: Any) -> List:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _is_job_posting(node: Dict) -> bool:
+    types = [str(t).lower() for t in _as_list(node.get('@type'))]
+    return any(t.endswith('jobposting') for t in types)
+
+def _find_job_postings(node: Any) -> List[Dict]:
+    """Walk a JSON-LD document (objects, lists, @graph) collecting JobPosting nodes."""
+    found = []
+    if isinstance(node, list):
+        for item in node:
+            found.extend(_find_job_postings(item))
+    elif isinstance(node, dict):
+        if _is_job_posting(node):
+            found.append(node)
+        for key in ('@graph', 'mainEntity', 'itemListElement'):
+            if key in node:
+                found.extend(_find_job_postings(node[key]))
+    return found
+
+def _name(value: Any) -> Optional[str]:
+    value = _as_list(value)[0] if _as_list(value) else None
+    if isinstance(value, dict):
+        value = value.get('name')
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+def _location(posting: Dict) -> Optional[str]:
+    places = []
+    for place in _as_list(posting.get('jobLocation')):
+        address = place.get('address', place) if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            parts = [address.get(k) for k in ('addressLocality', 'addressRegion', 'addressCountry')]
+            parts = [_name(p) if isinstance(p, dict) else p for p in parts]
+            text = ", ".join(p for p in parts if isinstance(p, str) and p)
+        else:
+            text = str(address)
+        if text and text not in places:
+            places.append(text)
+
+    remote = any(str(t).upper() == 'TELECOMMUTE' for t in _as_list(posting.get('jobLocationType')))
+    if remote:
+        places.insert(0, "Remote")
+    return "; ".join(places) or None
+
+def _from_json_ld(posting: Dict) -> Dict:
+    employment = [str(e) for e in _as_list(posting.get('employmentType')) if e]
+    return {
+        'company': _name(posting.get('hiringOrganization')),
+        'role': _name(posting.get('title')),
+        'location': _location(posting),
+        'job_type': ", ".join(employment) or None,
+        'date_posted': str(posting['datePosted'])[:10] if posting.get('datePosted') else None,
+        'description': html_to_text(posting.get('description', '')) or None,
+    }
+
+def _itemprop(scope, prop: str) -> Optional[str]:
+    element = scope.find(attrs={'itemprop': prop})
+    if element is None:
+        return None
+    if element.has_attr('itemscope'):
+        nested = element.find(attrs={'itemprop': 'name'})
+        element = nested or element
+    value = element.get('content') or element.get('datetime') or element.get_text(" ", strip=True)
+    return value or None
+
+def _from_microdata(soup: BeautifulSoup) -> Dict:
+    scope = soup.find(attrs={'itemtype': lambda t: t and 'jobposting' in t.lower()})
+    if scope is None:
+        return {}
+    date_posted = _itemprop(scope, 'datePosted')
+    return {
+        'company': _itemprop(scope, 'hiringOrganization'),
+        'role': _itemprop(scope, 'title'),
+        'location': _itemprop(scope, 'jobLocation'),
+        'job_type': _itemprop(scope, 'employmentType'),
+        'date_posted': date_posted[:10] if date_posted else None,
+        'description': _itemprop(scope, 'description'),
+    }
+
+def extract_job_posting(raw_html: str) -> Dict:
+    """
+    Read schema.org JobPosting fields embedded in a page.
+
+    Sources are tried in order of reliability: JSON-LD, then microdata; a later
+    source only fills fields the earlier ones left empty. OpenGraph `og:site_name`
+    is used as a last resort for the company, but never for the role since
+    og:title is usually decorated ("Senior PM | Acme Careers").
+    """
+    if not raw_html:
+        return {}
+
+    soup = BeautifulSoup(raw_html, 'html.parser')
+    candidates = []
+
+    for script in soup.find_all('script', attrs={'type': 'application/ld+json'}):
+        try:
+            document = json.loads(script.string or script.get_text() or "")
+        except (json.JSONDecodeError, TypeError):
+            continue # Sites routinely ship broken JSON-LD
+        candidates.extend(_from_json_ld(p) for p in _find_job_postings(document))
+
+    candidates.append(_from_microdata(soup))
+
+    result: Dict = {}
+    for candidate in candidates:
+        for key, value in candidate.items():
+            if value and not result.get(key):
+                result[key] = value
+
+    if result.get('role') and not result.get('company'):
+        site_name = soup.find('meta', attrs={'property': 'og:site_name'})
+        if site_name and site_name.get('content'):
+            result['company'] = site_name['content'].strip()
+
+    return result
+
+def has_required_fields(fields: Dict) -> bool:
+    return all(fields.get(key) for key in REQUIRED_FIELDS)
@@ -0,0 +1,117 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_SENIORITY_TERMS = ["senior", "sr", "staff", "principal", "lead", "head", "director", "group"]
+DEFAULT_EXCLUDE_TERMS = ["intern", "internship", "junior", "jr", "entry level", "new grad", "associate product manager"]
+DEFAULT_EXPIRED_MARKERS = [
+    "no longer accepting", "no longer available", "position has been filled", "job has expired",
+    "job is closed", "posting has closed", "this job is no longer",
+]
+
+_STOPWORDS = {"a", "an", "and", "the", "of", "for", "in", "to", "jobs", "job", "role"}
+_ABBREVIATIONS = [
+    (re.compile(r"\bproduct (manager|management|managers)\b"), "pm"),
+    (re.compile(r"\btechnical program (manager|management)\b"), "tpm"),
+    (re.compile(r"\bartificial intelligence\b"), "ai"),
+    (re.compile(r"\bmachine learning\b"), "ml"),
+]
+
+def _normalize(text: str) -> str:
+    text = (text or "").lower()
+    for pattern, abbreviation in _ABBREVIATIONS:
+        text = pattern.sub(lambda m: f"{m.group(0)} {abbreviation}", text)
+    return text
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9+#]+", _normalize(text)) if t not in _STOPWORDS]
+
+def _contains(text: str, term: str) -> bool:
+    return re.search(rf"\b{re.escape(term.lower())}\b", text) is not None
+
+class LeadTriage:
+    """
+    Scores search hits from their title and snippet alone, before any fetch, browser or LLM work.
+
+    The score (0-1) blends keyword coverage (best share of any `scout.keywords`
+    entry's words found in the hit), seniority terms in the title, and whether a
+    configured location is mentioned (unknown counts half). Hits whose title
+    carries an excluded term or whose snippet reads as expired are rejected
+    outright. Hits below `min_score` are rejected; those below
+    `deprioritize_below` are kept but sorted last, and are the first to go when
+    `max_leads` caps the batch.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        scout_config = (config or {}).get('scout', {})
+        triage_config = scout_config.get('triage', {}) or {}
+        self.enabled = triage_config.get('enabled', True)
+        self.min_score = triage_config.get('min_score', 0.3)
+        self.deprioritize_below = triage_config.get('deprioritize_below', 0.5)
+        self.max_leads = triage_config.get('max_leads')
+        weights = triage_config.get('weights', {}) or {}
+        self.keyword_weight = weights.get('keywords', 0.5)
+        self.seniority_weight = weights.get('seniority', 0.2)
+        self.location_weight = weights.get('location', 0.3)
+
+        self.keywords = [_tokens(k) for k in scout_config.get('keywords', [])]
+        self.locations = [loc.lower() for loc in scout_config.get('locations', [])]
+        self.seniority_terms = triage_config.get('seniority_terms', DEFAULT_SENIORITY_TERMS)
+        self.exclude_terms = triage_config.get('exclude_terms', DEFAULT_EXCLUDE_TERMS)
+        self.expired_markers = triage_config.get('expired_markers', DEFAULT_EXPIRED_MARKERS)
+
+    def _location_matches(self, text: str) -> Optional[bool]:
+        """True/False when a configured location is or isn't named; None if no location is configured."""
+        if not self.locations:
+            return None
+        for location in self.locations:
+            city = location.split(",")[0].strip()
+            if city and _contains(text, city):
+                return True
+        return False
+
+    def score(self, lead: Dict) -> Tuple[float, Optional[str]]:
+        """Return (score, rejection reason or None) for one search hit."""
+        title = _normalize(lead.get('title', ''))
+        text = f"{title} {_normalize(lead.get('snippet', ''))}"
+
+        for term in self.exclude_terms:
+            if _contains(title, term):
+                return 0.0, "excluded_term"
+        for marker in self.expired_markers:
+            if marker in text:
+                return 0.0, "expired"
+
+        words = set(_tokens(text))
+        coverage = max((sum(t in words for t in kw) / len(kw) for kw in self.keywords if kw), default=1.0)
+        seniority = 1.0 if any(_contains(title, term) for term in self.seniority_terms) else 0.0
+        location = {True: 1.0, False: 0.5, None: 1.0}[self._location_matches(text)]
+
+        total = self.keyword_weight * coverage + self.seniority_weight * seniority + self.location_weight * location
+        total /= (self.keyword_weight + self.seniority_weight + self.location_weight) or 1
+        if total < self.min_score:
+            return total, "low_score"
+        return total, None
+
+    def triage(self, leads: List[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, str]]]:
+        """
+        Split leads into (kept, rejected). Kept leads carry `triage_score` and are
+        ordered best first; rejected ones come with their reason.
+        """
+        if not self.enabled:
+            return leads, []
+
+        kept, rejected = [], []
+        for lead in leads:
+            value, reason = self.score(lead)
+            lead = {**lead, 'triage_score': round(value, 3)}
+            if reason:
+                rejected.append((lead, reason))
+            else:
+                kept.append(lead)
+
+        # Stable sort: full-priority leads keep their search order ahead of deprioritized ones
+        kept.sort(key=lambda lead: lead['triage_score'] < self.deprioritize_below)
+        if self.max_leads is not None and len(kept) > self.max_leads:
+            rejected.extend((lead, "over_cap") for lead in kept[self.max_leads:])
+            kept = kept[:self.max_leads]
+        return kept, rejected
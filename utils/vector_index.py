@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on", "or",
+              "our", "the", "to", "we", "will", "with", "you", "your", "this", "that", "i", "i'm"}
+
+class HashingVectorizer:
+    """
+    Stateless text -> vector mapping: unigrams and bigrams hashed into `dim`
+    signed buckets, log-scaled term frequency, L2-normalized. No vocabulary to
+    fit or persist, so vectors stay comparable across runs and processes.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def _features(self, text: str) -> Counter:
+        words = [w for w in _TOKEN.findall((text or "").lower()) if w not in _STOPWORDS]
+        return Counter(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+    def transform(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'little')
+                sign = 1.0 if digest >> 63 else -1.0
+                matrix[row, digest % self.dim] += sign * (1.0 + np.log(count))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+class VectorIndex:
+    """
+    Append-only on-disk store of listing vectors.
+
+    `ids.txt` holds one job_id per line and `vectors.f16` the matching rows as
+    raw float16, so adding a listing is two appends and never rewrites the
+    index. Readers map the vector file and pick up rows appended by other
+    instances (e.g. Scout saving while Barometer ranks) on their next query.
+    """
+
+    def __init__(self, index_dir: str = "storage/vector_index", dim: int = 1024):
+        self.index_dir = index_dir
+        self.vectorizer = HashingVectorizer(dim)
+        self.dim = dim
+        self._ids_path = os.path.join(index_dir, "ids.txt")
+        self._vectors_path = os.path.join(index_dir, "vectors.f16")
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._loaded_bytes = -1
+        self._ready = False
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "VectorIndex":
+        index_config = (config or {}).get('vector_index', {}) or {}
+        return cls(index_config.get('dir', "storage/vector_index"), index_config.get('dim', 1024))
+
+    def _check_meta(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        meta_path = os.path.join(self.index_dir, "meta.json")
+        meta = {'dim': self.dim, 'dtype': 'float16', 'vectorizer': 'hashing-v1'}
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            existing = None
+        if existing == meta:
+            return
+        if existing is not None:
+            # Vectors from another dimension/vectorizer are not comparable; start over
+            logger.warning(f"Vector index settings changed ({existing} -> {meta}); resetting {self.index_dir}")
+        for path in (self._ids_path, self._vectors_path):
+            if os.path.exists(path):
+                os.remove(path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def _row_bytes(self) -> int:
+        return self.dim * np.dtype(np.float16).itemsize
+
+    def _refresh(self):
+        """Reload ids if another writer appended since the last look."""
+        if not self._ready:
+            # Nothing touches the disk until the index is first used
+            self._check_meta()
+            self._ready = True
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        if size == self._loaded_bytes:
+            return
+        try:
+            with open(self._ids_path, "r", encoding="utf-8") as f:
+                ids = f.read().split()
+        except FileNotFoundError:
+            ids = []
+        # A crash between the two appends leaves one file a row ahead; ignore the extra
+        rows = min(len(ids), size // self._row_bytes())
+        self._ids = ids[:rows]
+        self._positions = {job_id: i for i, job_id in enumerate(self._ids)}
+        self._loaded_bytes = size
+
+    def _truncate_partial_append(self):
+        """Drop whichever file ran ahead of the other so the next append lines up."""
+        rows = len(self._ids)
+        if os.path.exists(self._vectors_path) and os.path.getsize(self._vectors_path) != rows * self._row_bytes():
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(rows * self._row_bytes())
+        with open(self._ids_path, "a+", encoding="utf-8") as f:
+            f.seek(0)
+            if len(f.read().split()) != rows:
+                f.seek(0)
+                f.truncate()
+                f.write("".join(f"{job_id}\n" for job_id in self._ids))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ids)
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return job_id in self._positions
+
+    def add_many(self, items: Iterable[Tuple[str, str]]) -> int:
+        """Vectorize and append (job_id, text) pairs not already indexed. Returns rows added."""
+        with self._lock:
+            self._refresh()
+            pending = {job_id: text for job_id, text in items if job_id not in self._positions}
+            if not pending:
+                return 0
+            self._truncate_partial_append()
+            vectors = self.vectorizer.transform(pending.values()).astype(np.float16)
+            # Vectors first: a half-finished append then leaves an id-less row, which _refresh ignores
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._ids_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{job_id}\n" for job_id in pending))
+            self._loaded_bytes = -1
+            self._refresh()
+            return len(pending)
+
+    def add(self, job_id: str, text: str) -> bool:
+        return self.add_many([(job_id, text)]) == 1
+
+    def similarities(self, job_ids: List[str], queries: np.ndarray) -> Dict[str, float]:
+        """
+        Best cosine similarity of each indexed job against any query vector,
+        computed as one (jobs x dim) @ (dim x queries) product. Unindexed jobs are omitted.
+        """
+        with self._lock:
+            self._refresh()
+            rows = [(job_id, self._positions[job_id]) for job_id in job_ids if job_id in self._positions]
+            if not rows or queries.size == 0:
+                return {}
+            matrix = np.memmap(self._vectors_path, dtype=np.float16, mode="r", shape=(len(self._ids), self.dim))
+            vectors = np.asarray(matrix[[position for _, position in rows]], dtype=np.float32)
+        scores = (vectors @ queries.T).max(axis=1)
+        return {job_id: float(score) for (job_id, _), score in zip(rows, scores)}